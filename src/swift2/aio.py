@@ -0,0 +1,134 @@
+"""Awaitable counterparts of long running native operations, for use in asyncio applications.
+
+Native calls are executed on a thread pool, so that they do not block the event loop. The number of
+native operations in flight is limited: further awaits wait for a slot, providing back-pressure.
+Operations on the same native object are serialised. If an awaiting task is cancelled, the native
+operation cannot be interrupted: it runs to completion, keeping the native objects it uses alive,
+and its slot is only released once it is done.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+import swift2.parameteriser as sp
+import swift2.simulation as ss
+import swift2.statistics as ssf
+
+if TYPE_CHECKING:
+    from swift2.classes import (
+        HypercubeParameteriser,
+        ObjectiveEvaluator,
+        Optimiser,
+        Simulation,
+        VectorObjectiveScores,
+    )
+
+
+class _AsyncConfig:
+    def __init__(self) -> None:
+        self.max_workers: int = os.cpu_count() or 1
+        self.max_in_flight: Optional[int] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+
+_config = _AsyncConfig()
+_handle_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = weakref.WeakKeyDictionary()
+_handle_locks_lock = threading.Lock()
+
+
+def configure_async(max_workers: Optional[int] = None, max_in_flight: Optional[int] = None) -> None:
+    """Configures the execution of awaitable native operations
+
+    Args:
+        max_workers (int, optional): number of threads executing native operations. Defaults to the number of CPU cores.
+        max_in_flight (int, optional): maximum number of native operations submitted and not yet completed, per event loop. Defaults to `max_workers`.
+    """
+    with _config.lock:
+        if _config.executor is not None:
+            _config.executor.shutdown(wait=False)
+            _config.executor = None
+        _config.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        _config.max_in_flight = max_in_flight
+        _config.semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    with _config.lock:
+        if _config.executor is None:
+            _config.executor = ThreadPoolExecutor(
+                max_workers=_config.max_workers, thread_name_prefix="swift2-aio"
+            )
+        return _config.executor
+
+
+def _get_semaphore(loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+    with _config.lock:
+        sem = _config.semaphores.get(loop)
+        if sem is None:
+            n = _config.max_in_flight if _config.max_in_flight is not None else _config.max_workers
+            sem = asyncio.Semaphore(n)
+            _config.semaphores[loop] = sem
+        return sem
+
+
+def _handle_lock(handle: Any) -> threading.Lock:
+    with _handle_locks_lock:
+        lock = _handle_locks.get(handle)
+        if lock is None:
+            lock = threading.Lock()
+            _handle_locks[handle] = lock
+        return lock
+
+
+async def run_native(owner: Any, func: Callable, *args) -> Any:
+    """Runs a blocking native operation on the thread pool, without blocking the event loop
+
+    Args:
+        owner (Any): native object the operation is performed on; operations on the same object are serialised
+        func (Callable): function to call
+        args: arguments to `func`
+
+    Returns:
+        Any: the result of `func(*args)`
+    """
+    loop = asyncio.get_running_loop()
+    sem = _get_semaphore(loop)
+    await sem.acquire()
+    lock = _handle_lock(owner)
+
+    def call():
+        with lock:
+            return func(*args)
+
+    try:
+        fut = loop.run_in_executor(_get_executor(), call)
+    except BaseException:
+        sem.release()
+        raise
+    # the slot is released when the native operation completes, even if the awaiting task is cancelled;
+    # `fut` references `owner` and `args`, keeping the native objects alive until then.
+    fut.add_done_callback(lambda _: sem.release())
+    return await asyncio.shield(fut)
+
+
+async def exec_simulation_async(simulation: "Simulation", reset_initial_states: bool = True) -> None:
+    """Awaitable execution of a simulation, see [swift2.simulation.exec_simulation][]"""
+    await run_native(simulation, ss.exec_simulation, simulation, reset_initial_states)
+
+
+async def execute_optimisation_async(optimiser: "Optimiser") -> "VectorObjectiveScores":
+    """Awaitable optimisation, see [swift2.parameteriser.execute_optimisation][]"""
+    return await run_native(optimiser, sp.execute_optimisation, optimiser)
+
+
+async def get_score_async(
+    objective: "ObjectiveEvaluator", p_set: "HypercubeParameteriser"
+) -> Dict[str, Any]:
+    """Awaitable evaluation of an objective for a parameter set, see [swift2.statistics.get_score][]"""
+    return await run_native(objective, ssf.get_score, objective, p_set)
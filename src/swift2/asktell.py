@@ -0,0 +1,198 @@
+"""An ask/tell bridge to drive the calibration of SWIFT models with external optimisers, e.g. CMA-ES or scipy.
+
+The external optimiser asks for a population of parameter sets; the population is evaluated in parallel
+over clones of the simulation and objective, and the scores told back to the optimiser. Each generation
+is logged with the same columns as the log of native optimisers, so that the log can be analysed with
+[swift2.parameteriser.MhData][] and plotted with [swift2.vis.OptimisationPlots][].
+
+Examples:
+    >>> import cma
+    >>> bridge = AskTellEvaluator(simulation, objective, parameteriser)
+    >>> es = cma.CMAEvolutionStrategy(bridge.values(), 0.3, {"bounds": [bridge.lower, bridge.upper]})
+    >>> while not es.stop():
+    ...     population = np.array(es.ask())
+    ...     scores = bridge.evaluate(population)
+    ...     es.tell(population, -scores[:, 0]) # minimising, NSE is maximised
+    >>> log = bridge.extract_optimisation_log("NSE")
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import swift2.parameteriser as sp
+from swift2.sensitivity import ObjectiveBatchEvaluator
+
+if TYPE_CHECKING:
+    from swift2.classes import HypercubeParameteriser, ObjectiveEvaluator, Simulation
+
+LOG_CATEGORY_COLNAME = "Category"
+LOG_MESSAGE_COLNAME = "Message"
+
+
+class AskTellEvaluator:
+    """Evaluates populations of parameter sets asked by an external optimiser, and logs the generations."""
+
+    def __init__(
+        self,
+        simulation: "Simulation",
+        objective: "ObjectiveEvaluator",
+        parameteriser: "HypercubeParameteriser",
+        param_names: Optional[Sequence[str]] = None,
+        n_workers: Optional[int] = None,
+    ) -> None:
+        """Evaluates populations of parameter sets
+
+        Args:
+            simulation (Simulation): the simulation the objective is evaluated on. It is cloned, not modified.
+            objective (ObjectiveEvaluator): the objective. It is cloned, not modified.
+            parameteriser (HypercubeParameteriser): parameteriser template, defining the parameters, their bounds and the values of those not optimised
+            param_names (Sequence[str], optional): names of the parameters optimised, in the order of the columns of populations. Defaults to all the parameters.
+            n_workers (int, optional): number of worker threads. Defaults to the number of CPU cores.
+        """
+        self._template = parameteriser
+        self._evaluator = ObjectiveBatchEvaluator(
+            simulation, objective, parameteriser, param_names=param_names, n_workers=n_workers
+        )
+        self.score_names: List[str] = []
+        self.generation = 0
+        self._log: List[pd.DataFrame] = []
+
+    @property
+    def param_names(self) -> List[str]:
+        """Names of the parameters, in the order of the columns of populations"""
+        return self._evaluator.param_names
+
+    @property
+    def lower(self) -> np.ndarray:
+        """Lower bounds of the parameters"""
+        return self._evaluator.lower
+
+    @property
+    def upper(self) -> np.ndarray:
+        """Upper bounds of the parameters"""
+        return self._evaluator.upper
+
+    def values(self) -> np.ndarray:
+        """Values of the parameters in the parameteriser template, e.g. as a starting point"""
+        df = sp.parameteriser_as_dataframe(self._template).set_index("Name")
+        return df.loc[self.param_names, "Value"].values.astype(np.float64)
+
+    def evaluate(self, population: np.ndarray, message: str = "Evaluated") -> np.ndarray:
+        """Evaluates a population of parameter sets, and logs it as a new generation
+
+        Args:
+            population (np.ndarray): array of shape (set, parameter), with columns in the order of `param_names`
+            message (str, optional): message logged for the points of this generation. Defaults to "Evaluated".
+
+        Returns:
+            np.ndarray: scores, of shape (set, score), with columns in the order of `score_names`. Empty for an empty population, which is not logged.
+        """
+        population = np.asarray(population, dtype=np.float64)
+        if len(population.shape) == 2 and population.shape[0] == 0:
+            # nothing to evaluate nor log, and no generation counted
+            return np.empty((0, len(self.score_names)))
+        scores, names = self._evaluator.evaluate_scores(population)
+        if len(names) > 0:
+            self.score_names = names
+        self.tell(population, scores, message)
+        return scores
+
+    def tell(
+        self,
+        population: np.ndarray,
+        scores: np.ndarray,
+        message: str = "Evaluated",
+        score_names: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Logs a generation of parameter sets and their scores, e.g. evaluated outside of this object
+
+        Args:
+            population (np.ndarray): array of shape (set, parameter), with columns in the order of `param_names`
+            scores (np.ndarray): array of shape (set, score), with columns in the order of `score_names`
+            message (str, optional): message logged for the points of this generation. Defaults to "Evaluated".
+            score_names (Sequence[str], optional): names of the scores, if not those previously evaluated.
+        """
+        population = np.asarray(population, dtype=np.float64)
+        if score_names is not None:
+            self.score_names = list(score_names)
+        if population.shape[0] == 0:
+            # nothing to log, and no generation counted
+            return
+        scores = np.asarray(scores, dtype=np.float64).reshape(population.shape[0], -1)
+        if scores.shape[1] != len(self.score_names):
+            raise ValueError(f"expected {len(self.score_names)} scores per parameter set, got {scores.shape[1]}")
+        n = population.shape[0]
+        d = {
+            LOG_CATEGORY_COLNAME: [f"Generation {self.generation}"] * n,
+            LOG_MESSAGE_COLNAME: [message] * n,
+        }
+        d.update({name: scores[:, i] for i, name in enumerate(self.score_names)})
+        d.update({name: population[:, i] for i, name in enumerate(self.param_names)})
+        self._log.append(pd.DataFrame(d))
+        self.generation += 1
+
+    def best(self, score_name: Optional[str] = None, maximise: bool = True) -> Tuple[np.ndarray, float]:
+        """Best parameter set logged so far
+
+        Args:
+            score_name (str, optional): score to rank parameter sets by. Defaults to the first score.
+            maximise (bool, optional): is the score maximised. Defaults to True.
+
+        Returns:
+            Tuple[np.ndarray, float]: parameter values, and score
+        """
+        log = self.get_log_content()
+        if len(log) == 0:
+            raise ValueError("no parameter set was evaluated yet")
+        score_name = score_name if score_name is not None else self.score_names[0]
+        i = log[score_name].values.argmax() if maximise else log[score_name].values.argmin()
+        return (log.loc[i, self.param_names].values.astype(np.float64), log.loc[i, score_name])
+
+    def best_parameteriser(self, score_name: Optional[str] = None, maximise: bool = True) -> "HypercubeParameteriser":
+        """Best parameter set logged so far, as a clone of the parameteriser template
+
+        Args:
+            score_name (str, optional): score to rank parameter sets by. Defaults to the first score.
+            maximise (bool, optional): is the score maximised. Defaults to True.
+
+        Returns:
+            HypercubeParameteriser: parameteriser with the best parameter values
+        """
+        values, _ = self.best(score_name, maximise)
+        p = self._template.clone()
+        sp.set_parameter_value(p, self.param_names, values)
+        return p
+
+    def get_log_content(self, add_numbering: bool = False) -> pd.DataFrame:
+        """Log of all the generations, with the columns of the log of native optimisers, see [swift2.parameteriser.get_logger_content][]
+
+        Args:
+            add_numbering (bool, optional): Add an explicit column for numbering the lines of the log. Defaults to False.
+
+        Returns:
+            pd.DataFrame: The data log
+        """
+        if len(self._log) == 0:
+            return pd.DataFrame()
+        log = pd.concat(self._log, ignore_index=True)
+        if add_numbering:
+            log["PointNumber"] = np.arange(1, len(log) + 1, dtype=int)
+        return log
+
+    def extract_optimisation_log(self, fitness_name: str = "log.likelihood") -> "sp.MhData":
+        """Log of all the generations, for analysis and plotting, see [swift2.parameteriser.extract_optimisation_log][]
+
+        Args:
+            fitness_name (str, optional): name of the fitness function to extract. Defaults to "log.likelihood".
+
+        Returns:
+            MhData: an object with methods to analyse the optimisation log
+        """
+        return sp.mk_optim_log(
+            self.get_log_content(add_numbering=True),
+            fitness=fitness_name,
+            messages=LOG_MESSAGE_COLNAME,
+            categories=LOG_CATEGORY_COLNAME,
+        )
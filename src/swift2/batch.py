@@ -0,0 +1,107 @@
+"""Batch execution of a simulation for many parameter sets, over a pool of cloned simulations."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import numpy as np
+
+import swift2.parameteriser as sp
+import swift2.simulation as ss
+import swift2.wrap.swift_wrap_custom as swc
+from swift2.pool import ClonePool
+
+if TYPE_CHECKING:
+    from swift2.classes import HypercubeParameteriser, Simulation
+    from swift2.const import VecStr
+
+
+class BatchRunner:
+    """Runs a simulation for many parameter sets, keeping one clone of the simulation and parameteriser per worker thread.
+
+    Native calls release the Python global interpreter lock, so simulations run concurrently
+    on the worker threads. Simulations and parameterisers are native objects that cannot be
+    pickled, hence a thread rather than a process pool.
+
+    Examples:
+        >>> runner = BatchRunner(simulation, parameteriser, ["Catchment.StreamflowRate"])
+        >>> values = np.random.uniform(lower, upper, size=(10000, runner.num_parameters))
+        >>> flows = runner.run(values) # shape (10000, time, 1)
+    """
+
+    def __init__(
+        self,
+        simulation: "Simulation",
+        parameteriser: "HypercubeParameteriser",
+        var_ids: "VecStr",
+        n_workers: Optional[int] = None,
+        param_names: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Runs a simulation for many parameter sets
+
+        Args:
+            simulation (Simulation): template simulation, with the variables of interest recorded. It is cloned, not modified.
+            parameteriser (HypercubeParameteriser): template parameteriser, whose values are set from each parameter set
+            var_ids (VecStr): recorded variables to retrieve
+            n_workers (int, optional): number of worker threads. Defaults to the number of CPU cores.
+            param_names (Sequence[str], optional): names of the parameters, in the order of the columns of parameter sets. Defaults to all the parameters of the parameteriser, in their order.
+        """
+        if isinstance(var_ids, str):
+            var_ids = [var_ids]
+        self.var_ids: List[str] = list(var_ids)
+        if param_names is None:
+            param_names = sp.parameteriser_as_dataframe(parameteriser)["Name"].values
+        self.param_names: List[str] = list(param_names)
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        if self.n_workers < 1:
+            raise ValueError("n_workers must be strictly positive")
+        self.n_time = len(ss.get_simulation_time_index(simulation))
+        self._simulation = simulation
+        self._parameteriser = parameteriser
+        # clones are created lazily, at most one per worker thread, and reused across runs
+        self._workers = ClonePool(self._new_worker, size=self.n_workers)
+        self._clone_lock = threading.Lock()
+
+    @property
+    def num_parameters(self) -> int:
+        """Number of parameters in each parameter set"""
+        return len(self.param_names)
+
+    def _new_worker(self):
+        with self._clone_lock:
+            return (self._simulation.clone(), self._parameteriser.clone())
+
+    def _run_one(self, values: np.ndarray, out: np.ndarray) -> None:
+        with self._workers.checkout() as (simulation, parameteriser):
+            sp.set_parameter_value(parameteriser, self.param_names, values)
+            parameteriser.apply_sys_config(simulation)
+            simulation.exec_simulation()
+            swc.get_recorded_data_into(simulation, self.var_ids, out)
+
+    def run(self, parameter_sets: np.ndarray) -> np.ndarray:
+        """Runs the simulation for each parameter set
+
+        Args:
+            parameter_sets (np.ndarray): array of shape (set, parameter), with columns in the order of `param_names`
+
+        Returns:
+            np.ndarray: recorded values, of shape (set, time, variable)
+        """
+        parameter_sets = np.asarray(parameter_sets, dtype=np.float64)
+        if len(parameter_sets.shape) != 2 or parameter_sets.shape[1] != self.num_parameters:
+            raise ValueError(
+                f"parameter sets must be of shape (set, {self.num_parameters}), not {parameter_sets.shape}"
+            )
+        n_sets = parameter_sets.shape[0]
+        # (set, variable, time) in memory, so that each recorded series is contiguous;
+        # out[i].T is then a column-major (time, variable) array the native library writes into.
+        result = np.empty((n_sets, len(self.var_ids), self.n_time), dtype=np.float64)
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            futures = [
+                executor.submit(self._run_one, parameter_sets[i], result[i].T)
+                for i in range(n_sets)
+            ]
+            for f in futures:
+                f.result()
+        return result.transpose((0, 2, 1))
@@ -0,0 +1,237 @@
+"""Checkpoints of model states at the end of a warm-up period, to skip re-simulating it.
+
+Calibrations typically re-simulate the same warm-up period for every parameter set evaluated,
+even though the model states at the end of it only depend on the simulation, its start, and the
+parameters affecting them. Checkpoints are keyed by all of these, so that a cache can be shared
+between simulations, e.g. clones, without restoring the states of one into another.
+
+Examples:
+    >>> cache = StateCheckpointCache(max_entries=64)
+    >>> sim_id = simulation_fingerprint(simulation, warmup_end)
+    >>> for p in parameter_sets:
+    ...     exec_simulation_with_checkpoint(simulation, p, cache, warmup_end, sim_id)
+"""
+
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+from cinterop.timeseries import ConvertibleToTimestamp, as_timestamp
+
+import swift2.simulation as ss
+import swift2.wrap.swift_wrap_custom as swc
+import swift2.wrap.swift_wrap_generated as swg
+from swift2.wrap.ffi_interop import marshal
+
+if TYPE_CHECKING:
+    from swift2.classes import HypercubeParameteriser, MemoryStates, Simulation
+
+
+def simulation_fingerprint(
+    simulation: "Simulation", end: Optional[ConvertibleToTimestamp] = None
+) -> str:
+    """A hash identifying a simulation by its structure and its played inputs, up to a date
+
+    Two simulations with the same fingerprint, e.g. clones of one another, reach the same model states
+    from the same start and parameter values. Computing it copies all the played inputs, so it is best
+    computed once, not for each parameter set evaluated.
+
+    Args:
+        simulation (Simulation): A swift simulation object
+        end (ConvertibleToTimestamp, optional): last time step of the inputs of interest. Defaults to None, the whole input series.
+
+    Returns:
+        str: hexadecimal digest
+    """
+    h = hashlib.sha1()
+    h.update(swg.GetTimeStepName_py(simulation).encode())
+    for names in (
+        swg.GetSubareaNames_py(simulation),
+        swg.GetLinkNames_py(simulation),
+        swg.GetNodeNames_py(simulation),
+    ):
+        h.update("\n".join(names).encode())
+        h.update(b"\0")
+    mtsg = marshal.new_native_tsgeom()
+    for var_id in swg.GetPlayedVariableNames_py(simulation):
+        values = swc.get_played_data(simulation, var_id, mtsg)
+        i_start, i_end = swc.window_indices(mtsg, None, end)
+        h.update(var_id.encode())
+        h.update(pd.Timestamp(mtsg.start).isoformat().encode())
+        h.update(struct.pack("<q", int(mtsg.time_step_seconds)))
+        h.update(values[i_start:i_end].astype("<f8").tobytes())
+    return h.hexdigest()
+
+
+def checkpoint_key(
+    parameteriser: "HypercubeParameteriser",
+    checkpoint_date: ConvertibleToTimestamp,
+    param_names: Optional[Sequence[str]] = None,
+    run_start: Optional[ConvertibleToTimestamp] = None,
+    simulation_id: Optional[str] = None,
+) -> str:
+    """A hash identifying the model states at a date, given the simulation, its start and the parameters affecting them
+
+    Args:
+        parameteriser (HypercubeParameteriser): parameteriser with the parameter values of interest
+        checkpoint_date (ConvertibleToTimestamp): date of the checkpoint
+        param_names (Sequence[str], optional): names of the parameters affecting model states up to the checkpoint. Defaults to all the parameters.
+        run_start (ConvertibleToTimestamp, optional): start of the simulation leading to the checkpoint. Defaults to None, but should be specified unless all the checkpoints of a cache share one start.
+        simulation_id (str, optional): identity of the simulation, e.g. from `simulation_fingerprint`. Defaults to None, but should be specified unless a cache is used for only one simulation.
+
+    Returns:
+        str: hexadecimal digest
+    """
+    if param_names is None:
+        n = swg.GetNumParameters_py(parameteriser)
+        param_names = [swg.GetParameterName_py(parameteriser, i) for i in range(n)]
+    h = hashlib.sha1()
+    h.update(("" if simulation_id is None else simulation_id).encode())
+    h.update(b"\0")
+    if run_start is not None:
+        h.update(pd.Timestamp(as_timestamp(run_start)).isoformat().encode())
+    h.update(b"\0")
+    h.update(pd.Timestamp(as_timestamp(checkpoint_date)).isoformat().encode())
+    for name in param_names:
+        h.update(name.encode())
+        h.update(struct.pack("<d", swg.GetParameterValue_py(parameteriser, name)))
+    return h.hexdigest()
+
+
+class StateCheckpointCache:
+    """A bounded cache of model states, with least recently used eviction.
+
+    The memory cap, if any, is enforced on the size of the states serialised to JSON,
+    an approximation of the native memory they use.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: Optional[int] = None) -> None:
+        """A bounded cache of model states
+
+        Args:
+            max_entries (int, optional): maximum number of states kept. Defaults to 32.
+            max_bytes (int, optional): maximum approximate size of all the states kept. Defaults to None, no limit.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be strictly positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._states: "OrderedDict[str, Tuple[MemoryStates, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional["MemoryStates"]:
+        """Gets the states for a key, if cached
+
+        Args:
+            key (str): key, see `checkpoint_key`
+
+        Returns:
+            Optional[MemoryStates]: states, or None if not cached
+        """
+        with self._lock:
+            entry = self._states.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._states.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, states: "MemoryStates") -> None:
+        """Adds states to the cache, evicting the least recently used ones if over capacity
+
+        Args:
+            key (str): key, see `checkpoint_key`
+            states (MemoryStates): model states
+        """
+        size = len(swg.GetMemoryStates_py(states)) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._states:
+                self.n_bytes -= self._states.pop(key)[1]
+            self._states[key] = (states, size)
+            self.n_bytes += size
+            while len(self._states) > self.max_entries or (
+                self.max_bytes is not None and self.n_bytes > self.max_bytes and len(self._states) > 1
+            ):
+                _, (_, evicted_size) = self._states.popitem(last=False)
+                self.n_bytes -= evicted_size
+
+    def info(self) -> Dict[str, int]:
+        """Usage statistics of this cache
+
+        Returns:
+            Dict[str, int]: numbers of hits, misses, entries, and approximate size in bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._states),
+                "bytes": self.n_bytes,
+            }
+
+    def clear(self) -> None:
+        """Removes all the states from the cache and resets the hit/miss counters"""
+        with self._lock:
+            self._states.clear()
+            self.n_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+def exec_simulation_with_checkpoint(
+    simulation: "Simulation",
+    parameteriser: "HypercubeParameteriser",
+    cache: StateCheckpointCache,
+    checkpoint_date: ConvertibleToTimestamp,
+    simulation_id: str,
+    param_names: Optional[Sequence[str]] = None,
+) -> bool:
+    """Applies a parameteriser and executes a simulation, starting from cached model states at the end of the warm-up if available
+
+    The simulation executed is for the time steps after `checkpoint_date`; if the states at `checkpoint_date`
+    are not cached, the warm-up period from the start of the simulation span up to `checkpoint_date` is
+    executed first, and the states at its end are cached. The simulation span is restored once done; the time
+    series recorded then cover the period after the warm-up only.
+
+    Args:
+        simulation (Simulation): A swift simulation object
+        parameteriser (HypercubeParameteriser): parameteriser to apply to the simulation
+        cache (StateCheckpointCache): cache of model states
+        checkpoint_date (ConvertibleToTimestamp): end of the warm-up period, a time step within the simulation span
+        simulation_id (str): identity of the simulation in the cache, e.g. `simulation_fingerprint(simulation, checkpoint_date)`, computed once rather than for each parameter set, and again only if the inputs played change.
+        param_names (Sequence[str], optional): names of the parameters affecting model states over the warm-up. Defaults to all the parameters.
+
+    Returns:
+        bool: True if the warm-up was skipped thanks to cached states
+    """
+    time_index = ss.get_simulation_time_index(simulation)
+    checkpoint_date = pd.Timestamp(as_timestamp(checkpoint_date))
+    i_checkpoint = time_index.get_loc(checkpoint_date)
+    if i_checkpoint >= len(time_index) - 1:
+        raise ValueError("the checkpoint date must be before the end of the simulation span")
+    key = checkpoint_key(parameteriser, checkpoint_date, param_names, time_index[0], simulation_id)
+    parameteriser.apply_sys_config(simulation)
+    states = cache.get(key)
+    hit = states is not None
+    try:
+        if not hit:
+            ss.set_simulation_span(simulation, time_index[0], checkpoint_date)
+            ss.exec_simulation(simulation, reset_initial_states=True)
+            states = ss.snapshot_state(simulation)
+            cache.put(key, states)
+        ss.set_simulation_span(simulation, time_index[i_checkpoint + 1], time_index[-1])
+        ss.set_states(simulation, states)
+        ss.exec_simulation(simulation, reset_initial_states=False)
+    finally:
+        ss.set_simulation_span(simulation, time_index[0], time_index[-1])
+    return hit
@@ -0,0 +1,179 @@
+"""Chunked execution of long simulations, spilling recorded time series to disk.
+
+Recorded series are otherwise held in native memory over the whole simulation span, then
+copied when retrieved. Running the span in blocks of time steps, and appending the values
+recorded over each block to a memory-mapped file, bounds the memory used by the block size.
+"""
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from cinterop.cffi.marshal import TimeSeriesGeometry
+
+import swift2.internal as si
+import swift2.simulation as ss
+import swift2.wrap.swift_wrap_custom as swc
+from swift2.play_record import get_recorded_varnames
+from swift2.wrap.ffi_interop import marshal
+
+if TYPE_CHECKING:
+    from swift2.classes import Simulation
+    from swift2.const import VecStr
+
+
+class NpyRecordedStore:
+    """Recorded time series stored on disk in a directory, as a memory-mapped `.npy` array of shape (time, variable)
+
+    The array is in column-major order, so that the values of each variable are contiguous on disk.
+    """
+
+    VALUES_FILENAME = "values.npy"
+    METADATA_FILENAME = "metadata.json"
+
+    def __init__(self, directory: str, mode: str = "r") -> None:
+        """Opens an existing store
+
+        Args:
+            directory (str): directory of the store
+            mode (str, optional): mode for the memory map of the values, as for `numpy.load`. Defaults to "r".
+        """
+        self.directory = directory
+        with open(os.path.join(directory, self.METADATA_FILENAME), "r") as f:
+            metadata = json.load(f)
+        self.var_ids = metadata["var_ids"]
+        self.tsgeom = TimeSeriesGeometry(
+            start=pd.Timestamp(metadata["start"]).to_pydatetime(),
+            time_step_seconds=metadata["time_step_seconds"],
+            length=metadata["length"],
+            time_step_code=metadata["time_step_code"],
+        )
+        self.values: np.memmap = np.load(
+            os.path.join(directory, self.VALUES_FILENAME), mmap_mode=mode
+        )
+
+    @classmethod
+    def create(
+        cls, directory: str, var_ids: "VecStr", tsgeom: TimeSeriesGeometry
+    ) -> "NpyRecordedStore":
+        """Creates a new store, with values not yet written
+
+        Args:
+            directory (str): directory of the store, created if it does not exist. Existing files of a store are overwritten.
+            var_ids (VecStr): identifiers of the recorded variables
+            tsgeom (TimeSeriesGeometry): geometry of the whole time series to store
+
+        Returns:
+            NpyRecordedStore: store open for writing
+        """
+        os.makedirs(directory, exist_ok=True)
+        metadata = {
+            "var_ids": list(var_ids),
+            "start": pd.Timestamp(tsgeom.start).isoformat(),
+            "time_step_seconds": int(tsgeom.time_step_seconds),
+            "time_step_code": int(tsgeom.time_step_code),
+            "length": int(tsgeom.length),
+        }
+        with open(os.path.join(directory, cls.METADATA_FILENAME), "w") as f:
+            json.dump(metadata, f, indent=2)
+        values = np.lib.format.open_memmap(
+            os.path.join(directory, cls.VALUES_FILENAME),
+            mode="w+",
+            dtype=np.float64,
+            shape=(tsgeom.length, len(var_ids)),
+            fortran_order=True,
+        )
+        del values
+        return cls(directory, mode="r+")
+
+    def write_block(self, i_start: int, block: np.ndarray) -> None:
+        """Writes values for consecutive time steps
+
+        Args:
+            i_start (int): index of the first time step of the block
+            block (np.ndarray): array of shape (time, variable)
+        """
+        self.values[i_start : i_start + block.shape[0], :] = block
+
+    def flush(self) -> None:
+        """Flushes values written to disk"""
+        self.values.flush()
+
+    def as_xarray(self) -> xr.DataArray:
+        """The stored time series, as returned by `get_recorded`, backed by the memory map rather than loaded in memory
+
+        Returns:
+            xr.DataArray: time series with dimensions (variable_identifiers, ensemble, time)
+        """
+        return si.block_to_xarray_time_series(
+            marshal.as_native_tsgeom(self.tsgeom), self.values, self.var_ids
+        )
+
+
+def exec_simulation_chunked(
+    simulation: "Simulation",
+    chunk_size: int,
+    directory: str,
+    var_ids: "VecStr" = None,
+    reset_initial_states: bool = True,
+) -> NpyRecordedStore:
+    """Execute a simulation in blocks of time steps, appending recorded values to a store on disk after each block
+
+    Model states are carried over from one block to the next with `snapshot_state` and `set_states`.
+    The simulation span is restored once done; the time series still recorded in the simulation
+    then only cover the last block.
+
+    Args:
+        simulation (Simulation): A swift simulation object
+        chunk_size (int): number of time steps per block
+        directory (str): directory of the on-disk store
+        var_ids (VecStr, optional): recorded variables to store. Defaults to all recorded variables.
+        reset_initial_states (bool, optional): should the states of the model be reinitialized before the first time step. Defaults to True.
+
+    Returns:
+        NpyRecordedStore: store with the recorded values over the whole simulation span
+    """
+    si.check_singular_simulation(simulation)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be strictly positive")
+    if var_ids is None:
+        var_ids = get_recorded_varnames(simulation)
+    if isinstance(var_ids, str):
+        var_ids = [var_ids]
+    if len(var_ids) == 0:
+        raise ValueError("there are no recorded variables to store")
+    time_index = ss.get_simulation_time_index(simulation)
+    n = len(time_index)
+    store = None
+    states = None
+    try:
+        for i_start in range(0, n, chunk_size):
+            i_end = min(i_start + chunk_size, n)
+            ss.set_simulation_span(simulation, time_index[i_start], time_index[i_end - 1])
+            if states is None:
+                ss.exec_simulation(simulation, reset_initial_states)
+            else:
+                ss.set_states(simulation, states)
+                ss.exec_simulation(simulation, reset_initial_states=False)
+            states = ss.snapshot_state(simulation)
+            mtsg = marshal.new_native_tsgeom()
+            block = swc.get_recorded_block(simulation, var_ids, mtsg)
+            if store is None:
+                tsgeom = TimeSeriesGeometry(
+                    start=time_index[0].to_pydatetime(),
+                    time_step_seconds=mtsg.time_step_seconds,
+                    length=n,
+                    time_step_code=mtsg.time_step_code,
+                )
+                store = NpyRecordedStore.create(directory, var_ids, tsgeom)
+            store.write_block(i_start, block)
+    finally:
+        if n > 0:
+            ss.set_simulation_span(simulation, time_index[0], time_index[-1])
+    if store is None:
+        raise ValueError("the simulation span has no time step")
+    store.flush()
+    return store
@@ -8,6 +8,7 @@ from typing import (
     Optional,
     OrderedDict,
     Sequence,
+    Tuple,
     Union,
 )
 
@@ -19,10 +20,16 @@ from cffi import FFI
 from cinterop.timeseries import ConvertibleToTimestamp, TimeSeriesLike
 from refcount.interop import CffiData, CffiWrapperFactory, DeletableCffiNativeHandle
 
+import swift2.aio as saio
+import swift2.asktell as sat
+import swift2.chunked as sch
+import swift2.incremental as sinc
+import swift2.logstream as slog
 import swift2.model_definitions as smd
 import swift2.parameteriser as sp
 import swift2.play_record as spr
 import swift2.simulation as ss
+import swift2.score_cache as sscache
 import swift2.statistics as ssf
 import swift2.wrap.swift_wrap_custom as swc
 import swift2.wrap.swift_wrap_generated as swg
@@ -30,9 +37,16 @@ from swift2.const import CATCHMENT_FLOWRATE_VARID
 from swift2.utils import parameter_df
 
 if TYPE_CHECKING:
+    from cinterop.cffi.marshal import TimeSeriesGeometry
     from uchronia.classes import TimeSeriesLibrary
 
     from swift2.const import RecordToSignature, VecNum, VecScalars, VecStr
+    from swift2.asktell import AskTellEvaluator
+    from swift2.chunked import NpyRecordedStore
+    from swift2.incremental import IncrementalSimulation
+    from swift2.internal import TimeSeriesBufferPool
+    from swift2.logstream import OptimisationLogStreamer
+    from swift2.score_cache import ObjectiveScoreCache
 
 
 class SimulationMixin:
@@ -80,15 +94,40 @@ class SimulationMixin:
         """
         return spr.get_played_varnames(self)
 
-    def exec_simulation(self, reset_initial_states: bool = True) -> None:
+    def exec_simulation(
+        self,
+        reset_initial_states: bool = True,
+        chunk_size: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> Optional["NpyRecordedStore"]:
         """
         Execute a simulation
 
         Args:
             reset_initial_states (bool): logical, should the states of the model be reinitialized before the first time step.
+            chunk_size (int, optional): if specified, the simulation span is run in blocks of this many time steps, and recorded values are appended to a store in `spill_dir` after each block, bounding memory use. Only for singular simulations.
+            spill_dir (str, optional): directory of the on-disk store of recorded values, required if `chunk_size` is specified.
+
+        Returns:
+            Optional[NpyRecordedStore]: the store of recorded values, if executed in blocks, otherwise None.
+        """
+        if chunk_size is None:
+            ss.exec_simulation(self, reset_initial_states)
+            return None
+        if spill_dir is None:
+            raise ValueError("spill_dir must be specified for a chunked execution")
+        return sch.exec_simulation_chunked(
+            self, chunk_size, spill_dir, reset_initial_states=reset_initial_states
+        )
 
+    async def exec_simulation_async(self, reset_initial_states: bool = True) -> None:
+        """
+        Execute a simulation on a worker thread, without blocking the asyncio event loop. See [swift2.aio][]
+
+        Args:
+            reset_initial_states (bool): logical, should the states of the model be reinitialized before the first time step.
         """
-        ss.exec_simulation(self, reset_initial_states)
+        await saio.exec_simulation_async(self, reset_initial_states)
 
 
 class Simulation(DeletableCffiNativeHandle, SimulationMixin):
@@ -133,6 +172,17 @@ class Simulation(DeletableCffiNativeHandle, SimulationMixin):
         """
         return swg.CloneModel_py(self)
 
+    def incremental(self, var_ids: Optional["VecStr"] = None) -> "IncrementalSimulation":
+        """Incremental execution of this simulation, each run continuing from the model states at the end of the previous one
+
+        Args:
+            var_ids (optional str or sequence of str): recorded variables to retrieve and append after each run. Defaults to all recorded variables.
+
+        Returns:
+            IncrementalSimulation: incremental execution of this simulation (not a copy)
+        """
+        return sinc.IncrementalSimulation(self, var_ids)
+
     def __str__(self):
         """string representation"""
         tid = self.type_id if self.type_id is not None else ""
@@ -524,6 +574,32 @@ class Simulation(DeletableCffiNativeHandle, SimulationMixin):
         """
         spr.play_singular_simulation(self, input_ts, var_ids)
 
+    def play_input_array(
+        self, values: np.ndarray, var_ids: "VecStr", ts_geom: "TimeSeriesGeometry"
+    ) -> None:
+        """
+        Sets one or more series as inputs to a simulation, from a numpy array such as a memory-mapped one, without copy
+
+        Args:
+            values (np.ndarray): float64 array of shape (time,), or (time, variable) in column-major order.
+            var_ids (str or sequence of str): model variable identifiers, one per column of `values`
+            ts_geom (TimeSeriesGeometry): time series geometry of the values
+        """
+        spr.play_input_array(self, values, var_ids, ts_geom)
+
+    def play_input_npy(
+        self, path: str, var_ids: "VecStr", ts_geom: "TimeSeriesGeometry"
+    ) -> None:
+        """
+        Sets one or more series as inputs to a simulation, from a memory-mapped `.npy` file
+
+        Args:
+            path (str): path to a `.npy` file with a float64 array of shape (time,), or (time, variable) in Fortran order
+            var_ids (str or sequence of str): model variable identifiers, one per column of the array
+            ts_geom (TimeSeriesGeometry): time series geometry of the values
+        """
+        spr.play_input_npy(self, path, var_ids, ts_geom)
+
     def get_played(
         self,
         var_ids: Optional["VecStr"] = None,
@@ -570,13 +646,50 @@ class Simulation(DeletableCffiNativeHandle, SimulationMixin):
         """
         return spr.get_recorded(self, var_ids, start_time, end_time)
 
-    def get_all_recorded(self) -> xr.DataArray:
-        """Gets all the time series of models variables recorded from"""
-        return spr.get_all_recorded(self)
+    def get_recorded_into(
+        self,
+        var_ids: Optional["VecStr"] = None,
+        out: Optional[np.ndarray] = None,
+        buffer_pool: Optional["TimeSeriesBufferPool"] = None,
+    ) -> np.ndarray:
+        """
+        Retrieves recorded time series into a preallocated (time, variable) array, without intermediate copies
 
-    def get_all_played(self) -> xr.DataArray:
-        """Gets all the time series of models variables into which input time series is/are played"""
-        return spr.get_all_played(self)
+        Args:
+            var_ids (optional str or sequence of str): name(s) of the model variable(s) recorded to a time series. If missing, all recorded states are retrieved.
+            out (np.ndarray, optional): float64 array of shape (time, variable) in column-major (Fortran) order. Defaults to None.
+            buffer_pool (TimeSeriesBufferPool, optional): pool of reusable buffers, used if `out` is None. Pooled buffers are overwritten by subsequent calls.
+
+        Returns:
+            np.ndarray: the array holding the values, `out` if it was specified.
+        """
+        return spr.get_recorded_into(self, var_ids, out, buffer_pool)
+
+    def get_all_recorded(
+        self,
+        start_time: Optional[ConvertibleToTimestamp] = None,
+        end_time: Optional[ConvertibleToTimestamp] = None,
+    ) -> xr.DataArray:
+        """Gets all the time series of models variables recorded from
+
+        Args:
+            start_time (datetime like): An optional parameter, the start of a period to subset the time series
+            end_time (datetime like): An optional parameter, the end of a period to subset the time series
+        """
+        return spr.get_all_recorded(self, start_time, end_time)
+
+    def get_all_played(
+        self,
+        start_time: Optional[ConvertibleToTimestamp] = None,
+        end_time: Optional[ConvertibleToTimestamp] = None,
+    ) -> xr.DataArray:
+        """Gets all the time series of models variables into which input time series is/are played
+
+        Args:
+            start_time (datetime like): An optional parameter, the start of a period to subset the time series
+            end_time (datetime like): An optional parameter, the end of a period to subset the time series
+        """
+        return spr.get_all_played(self, start_time, end_time)
 
     def apply_recording_function(
         self,
@@ -1025,6 +1138,42 @@ class HypercubeParameteriser(Parameteriser):
         """
         return sp.parameteriser_as_dataframe(self)
 
+    def parameter_names(self) -> List[str]:
+        """Names of the parameters, in the order of `values_array`, `set_values_array` and `bounds_array`
+
+        The order is read once and cached, so that whole vectors of values are moved without looking up each name.
+        See [swift2.parameteriser.invalidate_parameter_names][] if the parameters are changed with the native API directly.
+
+        Returns:
+            List[str]: parameter names
+        """
+        return sp.parameter_names(self)
+
+    def values_array(self) -> np.ndarray:
+        """Values of all the parameters, in the order of `parameter_names`
+
+        Returns:
+            np.ndarray: parameter values
+        """
+        return sp.parameter_values_array(self)
+
+    def set_values_array(self, values: np.ndarray, rollback: bool = False) -> None:
+        """Sets the values of all the parameters, in the order of `parameter_names`
+
+        Args:
+            values (np.ndarray): parameter values
+            rollback (bool, optional): if a value cannot be set, restore the previous values before raising. Defaults to False, leaving the values before it set.
+        """
+        sp.set_parameter_values_array(self, values, rollback)
+
+    def bounds_array(self) -> np.ndarray:
+        """Bounds of all the parameters, in the order of `parameter_names`
+
+        Returns:
+            np.ndarray: array of shape (parameter, 2), with the minimum then maximum values
+        """
+        return sp.parameter_bounds_array(self)
+
     def num_free_parameters(self) -> int:
         """Number of free parameters in this hypercube parameteriser
 
@@ -1289,6 +1438,7 @@ class CompositeParameteriser(HypercubeParameteriser):
             p (HypercubeParameteriser): hypercube to append to this
         """        
         swg.AddToCompositeParameterizer_py(self, p)
+        sp.invalidate_parameter_names(self)
 
 
 class ObjectiveEvaluator(DeletableCffiNativeHandle):
@@ -1303,6 +1453,24 @@ class ObjectiveEvaluator(DeletableCffiNativeHandle):
         super(ObjectiveEvaluator, self).__init__(
             handle, release_native, type_id, prior_ref_count
         )
+        self._score_cache: Optional["ObjectiveScoreCache"] = None
+
+    @property
+    def score_cache(self) -> Optional["ObjectiveScoreCache"]:
+        """The cache of scores by parameter values used by `get_score` and `get_scores`, if any"""
+        return self._score_cache
+
+    def set_score_cache(self, cache: Optional["ObjectiveScoreCache"]) -> None:
+        """Sets a cache of scores by parameter values, so that parameter sets already evaluated are not simulated again
+
+        The cache is only used by the evaluations requested from Python, `get_score` and `get_scores`.
+        Native optimisers, e.g. created with `create_sce_optim_swift`, evaluate the objective within the
+        native library, and do not use it.
+
+        Args:
+            cache (Optional[ObjectiveScoreCache]): cache for this objective only, or None to evaluate all parameter sets. See [swift2.score_cache][]
+        """
+        self._score_cache = cache
 
     def create_sce_optim_swift(
         self,
@@ -1329,23 +1497,68 @@ class ObjectiveEvaluator(DeletableCffiNativeHandle):
     def get_score(self, p_set: "HypercubeParameteriser") -> Dict[str,Any]:
         """Evaluate this objective for a given parameterisation
 
+        If a score cache is set, see `set_score_cache`, parameter sets already evaluated are not simulated again.
+
+        Args:
+            p_set (HypercubeParameteriser): parameteriser
+
+        Returns:
+            Dict[str,Any]: score(s), and a data frame representation of the input parameters.
+        """
+        if self._score_cache is None:
+            return ssf.get_score(self, p_set)
+        key = self._score_cache.key(p_set)
+        scores = self._score_cache.get(key)
+        if scores is None:
+            result = ssf.get_score(self, p_set)
+            self._score_cache.put(key, result["scores"])
+            return result
+        return {"scores": scores, "sysconfig": sp.parameteriser_as_dataframe(p_set)}
+
+    def ask_tell(
+        self,
+        simulation: "Simulation",
+        parameteriser: "HypercubeParameteriser",
+        param_names: Optional[Sequence[str]] = None,
+        n_workers: Optional[int] = None,
+    ) -> "AskTellEvaluator":
+        """Creates an evaluator of populations of parameter sets for this objective, to be driven by an external optimiser
+
+        Args:
+            simulation (Simulation): the simulation this objective is evaluated on. It is cloned, not modified.
+            parameteriser (HypercubeParameteriser): parameteriser template, defining the parameters and their bounds
+            param_names (Sequence[str], optional): names of the parameters optimised, in the order of the columns of populations. Defaults to all the parameters.
+            n_workers (int, optional): number of worker threads. Defaults to the number of CPU cores.
+
+        Returns:
+            AskTellEvaluator: evaluator of populations, see [swift2.asktell.AskTellEvaluator][]
+        """
+        return sat.AskTellEvaluator(simulation, self, parameteriser, param_names, n_workers)
+
+    async def get_score_async(self, p_set: "HypercubeParameteriser") -> Dict[str,Any]:
+        """Evaluate this objective for a given parameterisation, on a worker thread without blocking the asyncio event loop. See [swift2.aio][]
+
         Args:
             p_set (HypercubeParameteriser): parameteriser
 
         Returns:
             Dict[str,Any]: score(s), and a data frame representation of the input parameters.
         """
-        return ssf.get_score(self, p_set)
+        return await saio.get_score_async(self, p_set)
 
     def get_scores(self, p_set: "HypercubeParameteriser") -> Dict[str,float]:
         """Evaluate this objective for a given parameterisation
 
+        If a score cache is set, see `set_score_cache`, parameter sets already evaluated are not simulated again.
+
         Args:
             p_set (HypercubeParameteriser): parameteriser
 
         Returns:
             Dict[str,float]: score(s)
         """
+        if self._score_cache is not None:
+            return sscache.cached_scores(self, p_set, self._score_cache)
         return swg.EvaluateScoresForParametersWila_py(self, p_set)
 
     # EvaluateScoreForParametersWilaInitState?
@@ -1679,16 +1892,48 @@ class Optimiser(DeletableCffiNativeHandle):
     def execute_optimisation(self):
         return sp.execute_optimisation(self)
 
-    def extract_optimisation_log(self, fitness_name:str="log.likelihood") -> 'sp.MhData':
+    def stream_optimisation_log(
+        self,
+        sink_path: Optional[str] = None,
+        interval: Optional[float] = None,
+        tail_size: int = 10000,
+        overwrite: bool = False,
+    ) -> "OptimisationLogStreamer":
+        """Creates a streamer of the log of this optimiser, to a file and a bounded in-memory tail
+
+        Args:
+            sink_path (str, optional): CSV or Parquet file the log is appended to. Defaults to None.
+            interval (float, optional): minimum seconds between reads of the log while the optimiser runs. Defaults to None, the log is only read once the optimisation is complete. See [swift2.logstream][] for the limitations of reads while it runs.
+            tail_size (int, optional): maximum number of the most recent rows kept in memory. Defaults to 10000.
+            overwrite (bool, optional): replace an existing sink file. Defaults to False, an existing file is an error.
+
+        Returns:
+            OptimisationLogStreamer: log streamer, to start, or use as a context manager. See [swift2.logstream][]
+        """
+        return slog.OptimisationLogStreamer(
+            self, sink_path, interval=interval, tail_size=tail_size, overwrite=overwrite
+        )
+
+    async def execute_async(self) -> "VectorObjectiveScores":
+        """Launch the optimisation on a worker thread, without blocking the asyncio event loop. See [swift2.aio][]
+
+        Returns:
+            VectorObjectiveScores: the final population of scores
+        """
+        return await saio.execute_optimisation_async(self)
+
+    def extract_optimisation_log(self, fitness_name:str="log.likelihood", compact:bool=False, float32:bool=False) -> 'sp.MhData':
         """Extract the logger from a parameter extimator (optimiser or related)
 
         Args:
             fitness_name (str, optional): name of the fitness function to extract. Defaults to "log.likelihood".
+            compact (bool, optional): use a compact memory representation, with categorical string columns. Defaults to False.
+            float32 (bool, optional): if compact, store numeric columns other than the fitness as float32. Defaults to False.
 
         Returns:
             MhData: an object with methods to analyse the optimisation log
         """
-        return sp.extract_optimisation_log(self, fitness_name)
+        return sp.extract_optimisation_log(self, fitness_name, compact, float32)
 
     def set_maximum_threads(self, n_threads: int = -1):
         """Set the maximum number of threads (compute cores) to use in the optimisation, if possible. -1 means "as many as available". """
@@ -1802,6 +2047,14 @@ class VectorObjectiveScores(DeletableCffiNativeHandle):
 
     def as_dataframe(self):
         return sp.scores_as_dataframe(self)
+
+    def to_numpy(self) -> Tuple[np.ndarray, List[str]]:
+        """Scores and parameter values of all the points, as a numpy array rather than a data frame
+
+        Returns:
+            Tuple[np.ndarray, List[str]]: array of shape (point, column), with the scores then the parameter values of each point, and the column names
+        """
+        return sp.scores_as_numpy(self)
     
     def __str__(self):
         """string representation"""
@@ -1961,6 +2214,24 @@ class EnsembleForecastSimulation(DeletableCffiNativeHandle, SimulationMixin):
     ) -> uc.EnsembleForecastTimeSeries:
         return spr.get_recorded_ensemble_forecast(self, var_id, start_time, end_time)
 
+    def get_recorded_ensemble_forecast_cube(
+        self,
+        var_id: str,
+        start_time: ConvertibleToTimestamp = None,
+        end_time: ConvertibleToTimestamp = None,
+    ) -> xr.DataArray:
+        """Retrieves recorded ensemble forecasts as a dense (issue time, lead time, ensemble member) array
+
+        Args:
+            var_id (str): name of the output variable recorded
+            start_time (datetime like): An optional parameter, the first forecast issue time to retrieve
+            end_time (datetime like): An optional parameter, the last forecast issue time to retrieve
+
+        Returns:
+            xr.DataArray: array with dimensions (time, lead_time, ensemble), where time is the forecast issue time
+        """
+        return spr.get_recorded_ensemble_forecast_cube(self, var_id, start_time, end_time)
+
     def record_ensemble_forecast_state(
         self,
         var_ids: "VecStr" = CATCHMENT_FLOWRATE_VARID,
@@ -0,0 +1,133 @@
+"""Incremental execution of a simulation, continuing from the model states at the end of the previous run.
+
+Operational updates add a few time steps of inputs to a long history. Rather than re-running the whole
+span, the simulation resumes from the states kept at the end of the previous run, and the series
+recorded over the new time steps are appended to those previously retrieved.
+"""
+
+from typing import TYPE_CHECKING, List, Optional
+
+import pandas as pd
+import xarray as xr
+from cinterop.timeseries import TIME_DIMNAME, ConvertibleToTimestamp, TimeSeriesLike, as_timestamp
+
+import swift2.internal as si
+import swift2.simulation as ss
+from swift2.play_record import get_recorded_varnames, play_singular_simulation
+
+if TYPE_CHECKING:
+    from swift2.classes import MemoryStates, Simulation
+    from swift2.const import VecStr
+
+
+class IncrementalSimulation:
+    """A simulation executed incrementally, each run continuing from the model states at the end of the previous one.
+
+    Examples:
+        >>> inc = IncrementalSimulation(simulation, ["Catchment.StreamflowRate"])
+        >>> inc.run() # initial run over the simulation span
+        >>> # the next morning:
+        >>> inc.advance("2024-03-02", new_inputs) # new_inputs covers the time steps after the previous end
+        >>> flows = inc.get_recorded()
+    """
+
+    def __init__(
+        self,
+        simulation: "Simulation",
+        var_ids: "VecStr" = None,
+        states: Optional["MemoryStates"] = None,
+        end: Optional[ConvertibleToTimestamp] = None,
+    ) -> None:
+        """A simulation executed incrementally
+
+        Args:
+            simulation (Simulation): A swift simulation object
+            var_ids (VecStr, optional): recorded variables to retrieve and append after each run. Defaults to all recorded variables.
+            states (MemoryStates, optional): model states at `end`, to resume from e.g. states saved by a previous process. Defaults to None, in which case `run` must be called first.
+            end (ConvertibleToTimestamp, optional): time step at which `states` were taken.
+        """
+        if (states is None) != (end is None):
+            raise ValueError("states and end must be both specified, or neither")
+        si.check_singular_simulation(simulation)
+        if var_ids is None:
+            var_ids = get_recorded_varnames(simulation)
+        if isinstance(var_ids, str):
+            var_ids = [var_ids]
+        self.simulation = simulation
+        self.var_ids = list(var_ids)
+        self.states = states
+        self.end = pd.Timestamp(as_timestamp(end)) if end is not None else None
+        self._blocks: List[xr.DataArray] = []
+
+    def _exec_and_collect(self, reset_initial_states: bool) -> Optional[xr.DataArray]:
+        ss.exec_simulation(self.simulation, reset_initial_states)
+        self.states = ss.snapshot_state(self.simulation)
+        self.end = ss.get_simulation_time_index(self.simulation)[-1]
+        block = si.internal_get_recorded_tts(self.simulation, self.var_ids)
+        if block is not None:
+            self._blocks.append(block)
+        return block
+
+    def run(self, reset_initial_states: bool = True) -> Optional[xr.DataArray]:
+        """Executes the simulation over its current span, the starting point of subsequent increments
+
+        Args:
+            reset_initial_states (bool, optional): should the states of the model be reinitialized before the first time step. Defaults to True.
+
+        Returns:
+            Optional[xr.DataArray]: the series recorded over the span
+        """
+        self._blocks = []
+        return self._exec_and_collect(reset_initial_states)
+
+    def advance(
+        self,
+        end: ConvertibleToTimestamp,
+        inputs: Optional[TimeSeriesLike] = None,
+        input_var_ids: "VecStr" = None,
+    ) -> Optional[xr.DataArray]:
+        """Extends the simulation up to a new end, executing only the time steps after the previous end
+
+        Args:
+            end (ConvertibleToTimestamp): new end of the simulation
+            inputs (TimeSeriesLike, optional): new input series to play, covering at least the new time steps. Defaults to None, if inputs already played cover them.
+            input_var_ids (VecStr, optional): model variables into which `inputs` are played, if not the column names of `inputs`.
+
+        Returns:
+            Optional[xr.DataArray]: the series recorded over the new time steps, or None if `end` is not after the previous end
+
+        Raises:
+            ValueError: `end` is after the previous end, but less than one time step after it
+        """
+        if self.states is None:
+            raise ValueError("there are no states to continue from; call `run` first")
+        end = pd.Timestamp(as_timestamp(end))
+        if end <= self.end:
+            return None
+        span = ss.get_simulation_time_index(self.simulation)
+        # the next time step is found from the time index, as steps such as months are not of fixed length
+        ss.set_simulation_span(self.simulation, self.end, end)
+        time_index = ss.get_simulation_time_index(self.simulation)
+        if len(time_index) < 2:
+            ss.set_simulation_span(self.simulation, span[0], span[-1])
+            raise ValueError(
+                f"the new end {end} must be at least one time step after the previous end {self.end}"
+            )
+        ss.set_simulation_span(self.simulation, time_index[1], end)
+        if inputs is not None:
+            play_singular_simulation(self.simulation, inputs, input_var_ids)
+        ss.set_states(self.simulation, self.states)
+        return self._exec_and_collect(reset_initial_states=False)
+
+    def get_recorded(self) -> Optional[xr.DataArray]:
+        """Gets the series recorded over all the runs so far
+
+        Returns:
+            Optional[xr.DataArray]: time series with dimensions (variable_identifiers, ensemble, time)
+        """
+        if len(self._blocks) == 0:
+            return None
+        if len(self._blocks) > 1:
+            # concatenated on demand only, so that each increment is not a copy of the whole history
+            self._blocks = [xr.concat(self._blocks, dim=TIME_DIMNAME)]
+        return self._blocks[0]
@@ -0,0 +1,248 @@
+"""Opt-in instrumentation of the calls to the native SWIFT library, to profile where time is spent.
+
+When enabled, each `swift_wrap_generated.*_py` entry point is timed as a whole, including the marshalling
+of its arguments and results, and the native call within it is timed separately. Bytes marshalled are
+approximated by the sizes of array and string arguments and results. When disabled, the generated
+wrappers are the original functions, and the only overhead left is a test in `check_exceptions`.
+
+Examples:
+    >>> from swift2.instrumentation import ffi_instrumentation
+    >>> with ffi_instrumentation() as stats:
+    ...     simulation.exec_simulation()
+    ...     runoff = simulation.get_recorded(runoff_id)
+    >>> stats.report()
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import swift2.wrap.ffi_interop as _s_wrap
+import swift2.wrap.swift_wrap_generated as swg
+
+_PY_SUFFIX = "_py"
+_NATIVE_PREFIX = "_"
+_NATIVE_SUFFIX = "_native"
+
+
+def _entry_point_name(func_name: str) -> str:
+    if func_name.endswith(_PY_SUFFIX):
+        return func_name[: -len(_PY_SUFFIX)]
+    if func_name.startswith(_NATIVE_PREFIX) and func_name.endswith(_NATIVE_SUFFIX):
+        return func_name[len(_NATIVE_PREFIX) : -len(_NATIVE_SUFFIX)]
+    return func_name
+
+
+def _nbytes(x: Any) -> int:
+    if isinstance(x, np.ndarray):
+        return x.nbytes
+    if isinstance(x, (str, bytes)):
+        return len(x)
+    values = getattr(x, "values", None)
+    if isinstance(values, np.ndarray):
+        # pandas and xarray objects
+        return values.nbytes
+    if isinstance(x, (list, tuple)):
+        return sum(_nbytes(v) for v in x)
+    if isinstance(x, dict):
+        return sum(_nbytes(v) for v in x.values())
+    return 0
+
+
+class _CallStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.native_calls = 0
+        self.native_seconds = 0.0
+        self.bytes = 0
+        # reservoir sample of the durations of the calls to the entry point, for percentiles
+        self.samples: List[float] = []
+
+
+class FfiCallStatistics:
+    """Per-function statistics of the calls to the native library, collected while instrumentation is enabled."""
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        """Per-function statistics of calls to the native library
+
+        Args:
+            max_samples (int, optional): maximum number of call durations kept per function to estimate percentiles. Defaults to 10000.
+        """
+        self.max_samples = max_samples
+        self._stats: Dict[str, _CallStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> _CallStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = _CallStats()
+            self._stats[name] = stats
+        return stats
+
+    def record_call(self, func_name: str, seconds: float, n_bytes: int = 0) -> None:
+        """Records a call to a wrapper entry point, including marshalling
+
+        Args:
+            func_name (str): name of the function
+            seconds (float): duration of the call
+            n_bytes (int, optional): bytes marshalled. Defaults to 0.
+        """
+        with self._lock:
+            stats = self._get(_entry_point_name(func_name))
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.bytes += n_bytes
+            if len(stats.samples) < self.max_samples:
+                stats.samples.append(seconds)
+            else:
+                i = random.randrange(stats.calls)
+                if i < self.max_samples:
+                    stats.samples[i] = seconds
+
+    def record_native_call(self, func_name: str, seconds: float) -> None:
+        """Records the duration of a native call
+
+        Args:
+            func_name (str): name of the function
+            seconds (float): duration of the call
+        """
+        with self._lock:
+            stats = self._get(_entry_point_name(func_name))
+            stats.native_calls += 1
+            stats.native_seconds += seconds
+
+    def clear(self) -> None:
+        """Discards all the statistics collected"""
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> pd.DataFrame:
+        """Summary of the statistics collected
+
+        Returns:
+            pd.DataFrame: one row per function, sorted by decreasing total time, with the number of calls, total,
+                native and marshalling (total minus native) seconds, mean and percentile durations of calls in
+                seconds, and bytes marshalled. Functions called only from custom wrappers have native timings only.
+        """
+        rows = []
+        with self._lock:
+            for name, s in self._stats.items():
+                total = s.total_seconds if s.calls > 0 else s.native_seconds
+                calls = s.calls if s.calls > 0 else s.native_calls
+                samples = np.asarray(s.samples) if s.samples else None
+                rows.append(
+                    {
+                        "function": name,
+                        "calls": calls,
+                        "total_seconds": total,
+                        "native_seconds": s.native_seconds,
+                        "marshalling_seconds": max(total - s.native_seconds, 0.0),
+                        "mean_seconds": total / calls if calls > 0 else np.nan,
+                        "p50_seconds": np.percentile(samples, 50) if samples is not None else np.nan,
+                        "p90_seconds": np.percentile(samples, 90) if samples is not None else np.nan,
+                        "p99_seconds": np.percentile(samples, 99) if samples is not None else np.nan,
+                        "bytes": s.bytes,
+                    }
+                )
+        columns = [
+            "calls",
+            "total_seconds",
+            "native_seconds",
+            "marshalling_seconds",
+            "mean_seconds",
+            "p50_seconds",
+            "p90_seconds",
+            "p99_seconds",
+            "bytes",
+        ]
+        if len(rows) == 0:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name="function"))
+        df = pd.DataFrame(rows).set_index("function")
+        return df[columns].sort_values("total_seconds", ascending=False)
+
+
+_state_lock = threading.Lock()
+_active: Optional[FfiCallStatistics] = None
+_originals: Dict[str, Callable] = {}
+
+
+def _timed_entry_point(func: Callable, stats: FfiCallStatistics) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        n_bytes = sum(_nbytes(a) for a in args) + sum(_nbytes(a) for a in kwargs.values()) + _nbytes(result)
+        stats.record_call(func.__name__, elapsed, n_bytes)
+        return result
+
+    return wrapper
+
+
+def is_ffi_instrumentation_enabled() -> bool:
+    """Is the instrumentation of native calls enabled"""
+    return _active is not None
+
+
+def enable_ffi_instrumentation(stats: Optional[FfiCallStatistics] = None) -> FfiCallStatistics:
+    """Enables the instrumentation of the calls to the native library
+
+    Args:
+        stats (FfiCallStatistics, optional): where to collect statistics. Defaults to None, a new collection.
+
+    Returns:
+        FfiCallStatistics: statistics collected until `disable_ffi_instrumentation` is called
+    """
+    global _active
+    with _state_lock:
+        if _active is not None:
+            raise RuntimeError("FFI instrumentation is already enabled")
+        stats = stats if stats is not None else FfiCallStatistics()
+        for name, func in list(vars(swg).items()):
+            if name.endswith(_PY_SUFFIX) and callable(func):
+                _originals[name] = func
+                setattr(swg, name, _timed_entry_point(func, stats))
+        _s_wrap._native_call_recorder = stats.record_native_call
+        _active = stats
+        return stats
+
+
+def disable_ffi_instrumentation() -> Optional[FfiCallStatistics]:
+    """Disables the instrumentation of the calls to the native library, restoring the original wrappers
+
+    Returns:
+        Optional[FfiCallStatistics]: statistics collected while enabled, if it was
+    """
+    global _active
+    with _state_lock:
+        _s_wrap._native_call_recorder = None
+        for name, func in _originals.items():
+            setattr(swg, name, func)
+        _originals.clear()
+        stats = _active
+        _active = None
+        return stats
+
+
+@contextmanager
+def ffi_instrumentation(stats: Optional[FfiCallStatistics] = None) -> Iterator[FfiCallStatistics]:
+    """Instruments the calls to the native library within a `with` block
+
+    Args:
+        stats (FfiCallStatistics, optional): where to collect statistics. Defaults to None, a new collection.
+
+    Yields:
+        FfiCallStatistics: statistics collected within the block
+    """
+    stats = enable_ffi_instrumentation(stats)
+    try:
+        yield stats
+    finally:
+        disable_ffi_instrumentation()
@@ -1,4 +1,6 @@
-from typing import Any, Dict, Tuple, Optional, TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Optional, Union, TYPE_CHECKING
 import pandas as pd
 
 if TYPE_CHECKING:
@@ -12,6 +14,7 @@ import swift2.wrap.swift_wrap_custom as swc
 import swift2.wrap.swift_wrap_generated as swg
 from cinterop.cffi.marshal import(
     get_tsgeom,
+    TimeSeriesGeometry,
     TimeSeriesGeometryNative,
 )
 from cinterop.timeseries import(
@@ -21,6 +24,8 @@ from cinterop.timeseries import(
     ConvertibleToTimestamp,
     TimeSeriesLike,
     as_timestamp,
+    ENSEMBLE_DIMNAME,
+    TIME_DIMNAME,
 )
 from swift2.wrap.ffi_interop import marshal
 
@@ -28,6 +33,118 @@ import uchronia.data_set as uds
 
 TS_INTEROP_GEOM_KEY = "tsgeom"
 TS_INTEROP_VALUES_KEY = "tsvalues"
+VARIABLE_IDENTIFIERS_DIMNAME = "variable_identifiers"
+
+
+def tsgeom_key(ts_geom: Union[TimeSeriesGeometry, TimeSeriesGeometryNative]) -> Tuple:
+    """A hashable key uniquely identifying a time series geometry
+
+    Args:
+        ts_geom (Union[TimeSeriesGeometry, TimeSeriesGeometryNative]): time series geometry
+
+    Returns:
+        Tuple: start, time step length in seconds, time step code, and length.
+    """
+    return (
+        pd.Timestamp(ts_geom.start),
+        ts_geom.time_step_seconds,
+        ts_geom.time_step_code,
+        ts_geom.length,
+    )
+
+
+class TsGeometryCache:
+    """A bounded cache of native time series geometries, keyed by start, time step and length.
+
+    Native geometries returned from this cache are shared, and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        """A bounded cache of native time series geometries
+
+        Args:
+            max_size (int, optional): maximum number of geometries kept; the least recently used is released beyond that. Defaults to 128.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be strictly positive")
+        self.max_size = max_size
+        self._geoms: "OrderedDict[Tuple, TimeSeriesGeometryNative]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tsgeom: TimeSeriesGeometry) -> TimeSeriesGeometryNative:
+        """Get the native representation of a time series geometry, creating it if not already cached
+
+        Args:
+            tsgeom (TimeSeriesGeometry): time series geometry
+
+        Returns:
+            TimeSeriesGeometryNative: native time series geometry
+        """
+        key = tsgeom_key(tsgeom)
+        with self._lock:
+            geom = self._geoms.get(key)
+            if geom is not None:
+                self.hits += 1
+                self._geoms.move_to_end(key)
+                return geom
+            self.misses += 1
+            geom = marshal.as_native_tsgeom(tsgeom)
+            self._geoms[key] = geom
+            if len(self._geoms) > self.max_size:
+                self._geoms.popitem(last=False)
+            return geom
+
+    def info(self) -> Dict[str, int]:
+        """Usage statistics of this cache
+
+        Returns:
+            Dict[str, int]: numbers of hits, misses, current and maximum size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._geoms),
+                "max_size": self.max_size,
+            }
+
+    def clear(self) -> None:
+        """Release the cached geometries and reset the hit/miss counters"""
+        with self._lock:
+            self._geoms.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_tsgeom_cache = TsGeometryCache()
+
+
+def native_tsgeom(tsgeom: TimeSeriesGeometry) -> TimeSeriesGeometryNative:
+    """Native representation of a time series geometry, shared with other series of identical geometry
+
+    Args:
+        tsgeom (TimeSeriesGeometry): time series geometry
+
+    Returns:
+        TimeSeriesGeometryNative: native time series geometry, to be treated as read-only.
+    """
+    return _tsgeom_cache.get(tsgeom)
+
+
+def tsgeom_cache_info() -> Dict[str, int]:
+    """Usage statistics of the cache of native time series geometries used when playing inputs or creating objectives
+
+    Returns:
+        Dict[str, int]: numbers of hits, misses, current and maximum size
+    """
+    return _tsgeom_cache.info()
+
+
+def clear_tsgeom_cache() -> None:
+    """Clears the cache of native time series geometries"""
+    _tsgeom_cache.clear()
 
 
 def simplify_time_series(input_ts: TimeSeriesLike) -> Dict[str, Any]:
@@ -45,7 +162,7 @@ def simplify_time_series(input_ts: TimeSeriesLike) -> Dict[str, Any]:
     # def getSeriesColumn(k):
     #     return(as.numeric(input_ts[,k]))
     return {
-        TS_INTEROP_GEOM_KEY: marshal.as_native_tsgeom(get_tsgeom(input_ts)),
+        TS_INTEROP_GEOM_KEY: native_tsgeom(get_tsgeom(input_ts)),
         TS_INTEROP_VALUES_KEY: input_ts.values.squeeze(),  # lapply(1:ncol(input_ts), FUN=getSeriesColumn)
     }
 
@@ -85,19 +202,141 @@ def to_interop_univariate_series(
 # }
 
 
+class TimeSeriesBufferPool:
+    """A pool of reusable (time, variable) buffers for time series retrieval, keyed by time series geometry.
+
+    Buffers are allocated in column-major order, so that each variable is a contiguous column
+    into which the native library can write directly. A buffer obtained from the pool is
+    overwritten by the next retrieval using the same geometry and number of variables:
+    copy the data if it needs to outlive the next call.
+
+    Examples:
+        >>> pool = TimeSeriesBufferPool()
+        >>> for p in parameter_sets:
+        ...     p.apply_sys_config(simulation)
+        ...     simulation.exec_simulation()
+        ...     flows = simulation.get_recorded_into(var_ids, buffer_pool=pool)
+    """
+
+    def __init__(self, max_buffers: int = 16) -> None:
+        """A pool of reusable (time, variable) buffers
+
+        Args:
+            max_buffers (int, optional): maximum number of buffers kept; the least recently used is released beyond that. Defaults to 16.
+        """
+        if max_buffers < 1:
+            raise ValueError("max_buffers must be strictly positive")
+        self.max_buffers = max_buffers
+        self._buffers: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ts_geom: TimeSeriesGeometryNative, n_variables: int) -> np.ndarray:
+        """Get a buffer suitable for `n_variables` time series of a given geometry
+
+        Args:
+            ts_geom (TimeSeriesGeometryNative): time series geometry
+            n_variables (int): number of variables (columns)
+
+        Returns:
+            np.ndarray: a float64 array of shape (ts_geom.length, n_variables), column-major
+        """
+        key = tsgeom_key(ts_geom) + (n_variables,)
+        buffer = self._buffers.get(key)
+        if buffer is not None:
+            self.hits += 1
+            self._buffers.move_to_end(key)
+            return buffer
+        self.misses += 1
+        buffer = np.empty((ts_geom.length, n_variables), dtype=np.float64, order="F")
+        self._buffers[key] = buffer
+        if len(self._buffers) > self.max_buffers:
+            self._buffers.popitem(last=False)
+        return buffer
+
+    def clear(self) -> None:
+        """Release all the buffers held by this pool"""
+        self._buffers.clear()
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+
+def block_to_xarray_time_series(
+    ts_geom: TimeSeriesGeometryNative, block: np.ndarray, var_ids: "VecStr"
+) -> xr.DataArray:
+    """Wraps a (time, variable) array into a multivariate time series, without copying the data
+
+    Args:
+        ts_geom (TimeSeriesGeometryNative): time series geometry shared by all variables
+        block (np.ndarray): array of shape (time, variable)
+        var_ids (VecStr): variable identifiers, one per column
+
+    Returns:
+        xr.DataArray: time series with dimensions (variable_identifiers, ensemble, time), as returned by `get_multiple_time_series_from_provider`
+    """
+    # the transpose of a column-major block is a C-contiguous view
+    data = block.T[:, np.newaxis, :]
+    return xr.DataArray(
+        data,
+        coords=[
+            pd.Index(list(var_ids), name=VARIABLE_IDENTIFIERS_DIMNAME),
+            [0],
+            ts_geom.time_index(),
+        ],
+        dims=[VARIABLE_IDENTIFIERS_DIMNAME, ENSEMBLE_DIMNAME, TIME_DIMNAME],
+    )
+
+
+def _internal_get_pp_tts(
+    simulation: "Simulation",
+    var_ids: "VecStr",
+    block_func,
+    start_time: ConvertibleToTimestamp = None,
+    end_time: ConvertibleToTimestamp = None,
+) -> Optional[xr.DataArray]:
+    if isinstance(var_ids, str):
+        var_ids = [var_ids]
+    if len(var_ids) == 0:
+        return None
+    mtsg = marshal.new_native_tsgeom()
+    block = block_func(simulation, var_ids, mtsg, start_time, end_time)
+    return block_to_xarray_time_series(mtsg, block, var_ids)
+
+
 def internal_get_recorded_tts(
-    simulation: "Simulation", var_ids: "VecStr"
+    simulation: "Simulation",
+    var_ids: "VecStr",
+    start_time: ConvertibleToTimestamp = None,
+    end_time: ConvertibleToTimestamp = None,
 ) -> Optional[xr.DataArray]:
-    return uds.get_multiple_time_series_from_provider(
-        simulation, var_ids, swc.get_recorded_pkg
+    return _internal_get_pp_tts(
+        simulation, var_ids, swc.get_recorded_block, start_time, end_time
     )
 
 
 def internal_get_played_tts(
-    simulation: "Simulation", var_ids: "VecStr"
+    simulation: "Simulation",
+    var_ids: "VecStr",
+    start_time: ConvertibleToTimestamp = None,
+    end_time: ConvertibleToTimestamp = None,
 ) -> Optional[xr.DataArray]:
-    return uds.get_multiple_time_series_from_provider(
-        simulation, var_ids, swc.get_played_pkg
+    if isinstance(var_ids, str):
+        var_ids = [var_ids]
+    if not swc.played_geometries_match(simulation, var_ids):
+        # each played series keeps its own geometry, which a single block cannot hold
+        series = uds.get_multiple_time_series_from_provider(
+            simulation, var_ids, swc.get_played_pkg
+        )
+        return get_ts_window(series, start_time, end_time)
+
+    def played_block(simulation, var_ids, mtsg, start_time, end_time):
+        return swc.get_played_block(
+            simulation, var_ids, mtsg, start_time, end_time, check_geometries=False
+        )
+
+    return _internal_get_pp_tts(
+        simulation, var_ids, played_block, start_time, end_time
     )
 
 
@@ -0,0 +1,230 @@
+"""Streaming of the log of an optimiser to a file and a bounded in-memory tail, optionally while it runs.
+
+By default, the log is read once the optimisation is complete, written to a CSV or Parquet file, and its
+most recent rows kept in memory, e.g. for a dashboard built on [swift2.parameteriser.MhData][].
+
+Reading the log while the optimisation runs is opt-in, by setting an `interval`: a background thread then
+periodically reads the rows logged since its previous read. Two limitations of the native API apply:
+
+- reading the log while the optimiser appends to it from other threads relies on the native logger
+  supporting concurrent reads, which the API does not document. A RuntimeWarning is issued when the
+  background thread starts.
+- the log can only be read whole, so each read copies all the rows logged so far, of which only the new
+  ones are kept: the memory used by a read grows with the log, only the tail is bounded. The interval
+  between reads is lengthened as the log grows, so that reading it takes at most a fraction
+  `max_overhead` of the time.
+
+Examples:
+    >>> optimiser.set_calibration_logger("")
+    >>> with OptimisationLogStreamer(optimiser, "calib_log.csv", interval=10.0) as streamer:
+    ...     results = optimiser.execute_optimisation()
+    >>> # meanwhile, from another thread:
+    >>> streamer.tail_log("NSE").data
+"""
+
+import os
+import threading
+import time
+import warnings
+from typing import TYPE_CHECKING, Callable, Optional
+
+import pandas as pd
+
+import swift2.parameteriser as sp
+import swift2.wrap.swift_wrap_generated as swg
+from swift2.wrap.swift_wrap_custom import convert_optimisation_logger
+
+if TYPE_CHECKING:
+    from swift2.classes import Optimiser, VectorObjectiveScores
+
+_SINK_FORMATS = ("csv", "parquet")
+
+
+class OptimisationLogStreamer:
+    """Drains the new rows of the log of an optimiser, to a file sink and a bounded in-memory tail.
+
+    The log is read when stopping, and, if `interval` is set, periodically while the optimiser runs, which
+    relies on the native logger allowing concurrent reads; see [swift2.logstream][].
+    """
+
+    def __init__(
+        self,
+        optimiser: "Optimiser",
+        sink_path: Optional[str] = None,
+        sink_format: Optional[str] = None,
+        interval: Optional[float] = None,
+        tail_size: int = 10000,
+        on_rows: Optional[Callable[[pd.DataFrame], None]] = None,
+        overwrite: bool = False,
+        max_overhead: float = 0.1,
+    ) -> None:
+        """Streams the log of an optimiser
+
+        Args:
+            optimiser (Optimiser): optimiser, with a calibration logger set
+            sink_path (str, optional): file new rows are appended to. Defaults to None, no file.
+            sink_format (str, optional): 'csv' or 'parquet'. Defaults to the extension of `sink_path`. Parquet requires pyarrow.
+            interval (float, optional): minimum seconds between reads of the log while the optimiser runs. Defaults to None, the log is only read when stopping. Reading it while the optimiser runs relies on concurrent reads, not documented by the native API.
+            tail_size (int, optional): maximum number of the most recent rows kept in memory. Defaults to 10000.
+            on_rows (Callable[[pd.DataFrame], None], optional): function called with each batch of new rows. Defaults to None.
+            overwrite (bool, optional): replace an existing sink file. Defaults to False, an existing file is an error.
+            max_overhead (float, optional): maximum fraction of the time spent reading the log; the interval between reads is lengthened accordingly as the log grows. Defaults to 0.1.
+        """
+        if sink_path is not None and sink_format is None:
+            sink_format = os.path.splitext(sink_path)[1].lstrip(".").lower()
+        if sink_path is not None and sink_format not in _SINK_FORMATS:
+            raise ValueError(f"sink format must be one of {_SINK_FORMATS}, not '{sink_format}'")
+        if sink_path is not None and os.path.exists(sink_path):
+            # both sink formats start from an empty file, rather than appending to an earlier run
+            if not overwrite:
+                raise FileExistsError(f"the log sink {sink_path} already exists; use overwrite=True to replace it")
+            os.remove(sink_path)
+        if max_overhead <= 0:
+            raise ValueError("max_overhead must be strictly positive")
+        self.optimiser = optimiser
+        self.sink_path = sink_path
+        self.sink_format = sink_format
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.tail_size = tail_size
+        self.on_rows = on_rows
+        self.rows_streamed = 0
+        self._tail = pd.DataFrame()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._parquet_writer = None
+        self.error: Optional[BaseException] = None
+
+    def poll(self) -> pd.DataFrame:
+        """Reads the rows logged since the previous read, and appends them to the sink and the tail
+
+        Returns:
+            pd.DataFrame: the new rows, numbered in a 'PointNumber' column
+        """
+        with self._lock:
+            log_data = swg.GetOptimizerLogDataWila_py(self.optimiser)
+            rows = convert_optimisation_logger(log_data, add_numbering=True, start_row=self.rows_streamed)
+            if len(rows) == 0:
+                return rows
+            self.rows_streamed += len(rows)
+            self._write(rows)
+            tail = pd.concat([self._tail, rows], ignore_index=True) if len(self._tail) > 0 else rows
+            self._tail = tail.iloc[max(len(tail) - self.tail_size, 0) :].reset_index(drop=True)
+        if self.on_rows is not None:
+            self.on_rows(rows)
+        return rows
+
+    def _write(self, rows: pd.DataFrame) -> None:
+        if self.sink_path is None:
+            return
+        if self.sink_format == "csv":
+            # the sink was removed, if it existed, at creation: only the first batch has no file yet
+            write_header = not os.path.exists(self.sink_path)
+            rows.to_csv(self.sink_path, mode="a", header=write_header, index=False)
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("streaming the log to Parquet requires the package pyarrow") from e
+            table = pa.Table.from_pandas(rows, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.sink_path, table.schema)
+            self._parquet_writer.write_table(table)
+
+    def _run(self) -> None:
+        wait = self.interval
+        while not self._stop.wait(wait):
+            start = time.perf_counter()
+            try:
+                self.poll()
+            except Exception as e:
+                # kept for the caller of `stop`, rather than lost in this thread
+                self.error = e
+                return
+            # each read copies the whole log: read less often as it grows
+            wait = max(self.interval, (time.perf_counter() - start) / self.max_overhead)
+
+    def start(self) -> "OptimisationLogStreamer":
+        """Starts reading the log periodically, on a background thread, if `interval` is set"""
+        if self._thread is not None:
+            raise RuntimeError("this log streamer is already started")
+        if self.interval is None:
+            # the log is only read by `stop`, once the optimisation is complete
+            return self
+        warnings.warn(
+            "reading the log of a running optimiser relies on the native logger allowing concurrent reads, "
+            "which is not documented; each read also copies the whole log. Use interval=None to read it once complete.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="swift2-log-streamer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background thread, reads the rows logged last, and closes the sink"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            if self.error is None:
+                self.poll()
+        finally:
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+                self._parquet_writer = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> "OptimisationLogStreamer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def tail(self) -> pd.DataFrame:
+        """The most recent rows of the log, at most `tail_size`"""
+        with self._lock:
+            return self._tail.copy()
+
+    def tail_log(self, fitness_name: str = "log.likelihood") -> "sp.MhData":
+        """The most recent rows of the log, for analysis and plotting
+
+        Args:
+            fitness_name (str, optional): name of the fitness function to extract. Defaults to "log.likelihood".
+
+        Returns:
+            MhData: an object with methods to analyse the optimisation log
+        """
+        return sp.mk_optim_log(self.tail(), fitness=fitness_name, messages="Message", categories="Category")
+
+
+def execute_optimisation_streaming(
+    optimiser: "Optimiser",
+    sink_path: Optional[str] = None,
+    interval: Optional[float] = None,
+    tail_size: int = 10000,
+    on_rows: Optional[Callable[[pd.DataFrame], None]] = None,
+    overwrite: bool = False,
+) -> "VectorObjectiveScores":
+    """Launches an optimisation, streaming its log once complete, or while it runs if `interval` is set
+
+    Args:
+        optimiser (Optimiser): optimiser, with a calibration logger set
+        sink_path (str, optional): CSV or Parquet file the log is appended to. Defaults to None.
+        interval (float, optional): minimum seconds between reads of the log while the optimiser runs. Defaults to None, the log is only read once the optimisation is complete. See [swift2.logstream][] for the limitations of reads while it runs.
+        tail_size (int, optional): maximum number of the most recent rows kept in memory. Defaults to 10000.
+        on_rows (Callable[[pd.DataFrame], None], optional): function called with each batch of new rows. Defaults to None.
+        overwrite (bool, optional): replace an existing sink file. Defaults to False, an existing file is an error.
+
+    Returns:
+        VectorObjectiveScores: the final population of scores
+    """
+    with OptimisationLogStreamer(
+        optimiser, sink_path, interval=interval, tail_size=tail_size, on_rows=on_rows, overwrite=overwrite
+    ):
+        return sp.execute_optimisation(optimiser)
@@ -0,0 +1,211 @@
+"""Calibration of many (station, model) jobs over a pool of processes, resumable after an interruption.
+
+Each job builds and calibrates a [swift2.proto.PbmCalibration][] in a worker process. The cores are shared
+between the processes: each optimiser is limited to `cores // processes` threads, so that the processes do
+not oversubscribe the hardware. The results of a job (best parameters, scores and optimisation log) are
+saved to its own directory as soon as it completes; a job whose results are saved is skipped when the
+calibrations are run again, e.g. after an interruption.
+
+Processes are started with the 'spawn' method by default, so the factory of the calibration builder must
+be a function importable by the worker processes, i.e. defined at the top level of a module.
+
+Examples:
+    >>> # in a module, e.g. my_calibrations.py
+    >>> def new_builder():
+    ...     builder = PbmCalibrationBuilder(PbmModelFactory(OzDataProvider(data_path)))
+    ...     builder.set_sampling_periods()
+    ...     return builder
+    >>> jobs = [(station_id, "GR4J") for station_id in station_ids]
+    >>> summary = run_calibrations(jobs, new_builder, "/data/calibrations", n_processes=8)
+"""
+
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+import swift2.wrap.swift_wrap_generated as swg
+
+if TYPE_CHECKING:
+    from swift2.proto import PbmCalibrationBuilder
+
+CalibrationJob = Tuple[str, str]
+"""A calibration job, as a (station identifier, model identifier) tuple"""
+
+_RESULTS_FILENAME = "results.json"
+_PARAMETERS_FILENAME = "parameters.csv"
+_LOG_FILENAME = "log.csv"
+_ERROR_FILENAME = "error.txt"
+
+# calibration builder of a worker process, created once by the process initialiser
+_worker_builder: Optional["PbmCalibrationBuilder"] = None
+
+
+def _write_atomic(path: str, content: str) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def job_directory(output_dir: str, job: CalibrationJob) -> str:
+    """Directory the results of a calibration job are saved to
+
+    Args:
+        output_dir (str): root directory of the results of all jobs
+        job (CalibrationJob): (station identifier, model identifier)
+
+    Returns:
+        str: directory `output_dir/model_id/station_id`
+    """
+    station_id, model_id = job
+    return os.path.join(output_dir, str(model_id), str(station_id))
+
+
+def is_job_completed(output_dir: str, job: CalibrationJob) -> bool:
+    """Are the results of a calibration job saved
+
+    Args:
+        output_dir (str): root directory of the results of all jobs
+        job (CalibrationJob): (station identifier, model identifier)
+
+    Returns:
+        bool: True if the job completed, and need not be run again
+    """
+    return os.path.exists(os.path.join(job_directory(output_dir, job), _RESULTS_FILENAME))
+
+
+def _init_worker(builder_factory: Callable[[], "PbmCalibrationBuilder"], threads_per_job: int) -> None:
+    global _worker_builder
+    # also the default for any other optimiser created in this process
+    swg.SetDefaultMaxThreadsWila_py(threads_per_job)
+    _worker_builder = builder_factory()
+    _worker_builder.set_maximum_threads(threads_per_job)
+
+
+def _run_job(job: CalibrationJob, output_dir: str, validate: bool) -> Dict[str, Any]:
+    station_id, model_id = job
+    start = time.perf_counter()
+    calib = _worker_builder.build_calibration(station_id, model_id)
+    calib.calibrate()
+    verif_scores = None
+    if validate:
+        _, verif_score = calib.validate()
+        verif_scores = verif_score["scores"]
+    elapsed = time.perf_counter() - start
+
+    job_dir = job_directory(output_dir, job)
+    os.makedirs(job_dir, exist_ok=True)
+    calib.best_score["sysconfig"].to_csv(os.path.join(job_dir, _PARAMETERS_FILENAME))
+    calib.extract_optimisation_log().data.to_csv(os.path.join(job_dir, _LOG_FILENAME), index=False)
+    results = {
+        "station_id": station_id,
+        "model_id": model_id,
+        "objective_id": calib.objective_id,
+        "calib_scores": calib.best_score["scores"],
+        "verif_scores": verif_scores,
+        "elapsed_seconds": elapsed,
+        "threads": calib.max_threads,
+    }
+    # saved last: the job is only completed once its results are
+    _write_atomic(os.path.join(job_dir, _RESULTS_FILENAME), json.dumps(results))
+    error_file = os.path.join(job_dir, _ERROR_FILENAME)
+    if os.path.exists(error_file):
+        os.remove(error_file)
+    return results
+
+
+def load_job_results(output_dir: str, job: CalibrationJob) -> Dict[str, Any]:
+    """Loads the saved results of a completed calibration job
+
+    Args:
+        output_dir (str): root directory of the results of all jobs
+        job (CalibrationJob): (station identifier, model identifier)
+
+    Returns:
+        Dict[str, Any]: scores and metadata of the job, with the best parameters in 'parameters' and the log in 'log'
+    """
+    job_dir = job_directory(output_dir, job)
+    with open(os.path.join(job_dir, _RESULTS_FILENAME), "r") as f:
+        results = json.load(f)
+    results["parameters"] = pd.read_csv(os.path.join(job_dir, _PARAMETERS_FILENAME), index_col=0)
+    results["log"] = pd.read_csv(os.path.join(job_dir, _LOG_FILENAME))
+    return results
+
+
+def _summary_row(
+    job: CalibrationJob, status: str, results: Optional[Dict[str, Any]] = None, error: str = ""
+) -> Dict[str, Any]:
+    station_id, model_id = job
+    row = {"station_id": station_id, "model_id": model_id, "status": status, "elapsed_seconds": None, "error": error}
+    if results is not None:
+        row["elapsed_seconds"] = results["elapsed_seconds"]
+        objective_id = results["objective_id"]
+        row["calib_" + objective_id] = results["calib_scores"].get(objective_id)
+        if results["verif_scores"] is not None:
+            row["verif_" + objective_id] = results["verif_scores"].get(objective_id)
+    return row
+
+
+def run_calibrations(
+    jobs: Sequence[CalibrationJob],
+    builder_factory: Callable[[], "PbmCalibrationBuilder"],
+    output_dir: str,
+    n_processes: Optional[int] = None,
+    n_cores: Optional[int] = None,
+    validate: bool = False,
+    mp_context: Optional[str] = "spawn",
+) -> pd.DataFrame:
+    """Runs calibration jobs over a pool of processes, skipping those already completed
+
+    Args:
+        jobs (Sequence[CalibrationJob]): (station identifier, model identifier) of each calibration
+        builder_factory (Callable[[], PbmCalibrationBuilder]): function creating the calibration builder, called once in each worker process. It must be picklable, e.g. a function defined at the top level of a module.
+        output_dir (str): root directory of the results, one subdirectory `model_id/station_id` per job
+        n_processes (int, optional): number of worker processes. Defaults to the number of cores, or of jobs to run if fewer.
+        n_cores (int, optional): number of cores shared between the processes. Defaults to the number of CPU cores.
+        validate (bool, optional): also score the best parameters over the validation period. Defaults to False.
+        mp_context (str, optional): start method of the worker processes. Defaults to 'spawn', safer than 'fork' with native libraries using threads.
+
+    Returns:
+        pd.DataFrame: one row per job, with its status ('completed', 'skipped' or 'failed'), calibration time, and scores
+    """
+    n_cores = n_cores if n_cores is not None else (os.cpu_count() or 1)
+    rows: Dict[CalibrationJob, Dict[str, Any]] = {}
+    pending: List[CalibrationJob] = []
+    for job in jobs:
+        job = (job[0], job[1])
+        if is_job_completed(output_dir, job):
+            rows[job] = _summary_row(job, "skipped", load_job_results(output_dir, job))
+        elif job not in rows:
+            rows[job] = _summary_row(job, "pending")
+            pending.append(job)
+
+    if len(pending) > 0:
+        n_processes = n_processes if n_processes is not None else min(n_cores, len(pending))
+        n_processes = max(min(n_processes, len(pending)), 1)
+        threads_per_job = max(n_cores // n_processes, 1)
+        os.makedirs(output_dir, exist_ok=True)
+        context = mp.get_context(mp_context) if mp_context is not None else None
+        with ProcessPoolExecutor(
+            max_workers=n_processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(builder_factory, threads_per_job),
+        ) as executor:
+            futures = {executor.submit(_run_job, job, output_dir, validate): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    rows[job] = _summary_row(job, "completed", future.result())
+                except Exception as e:
+                    # not marked as completed, so that the job is run again on restart
+                    job_dir = job_directory(output_dir, job)
+                    os.makedirs(job_dir, exist_ok=True)
+                    _write_atomic(os.path.join(job_dir, _ERROR_FILENAME), repr(e))
+                    rows[job] = _summary_row(job, "failed", error=repr(e))
+    return pd.DataFrame(list(rows.values()))
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -19,6 +21,7 @@ if TYPE_CHECKING:
     )
 import swift2.wrap.swift_wrap_custom as swc
 import swift2.wrap.swift_wrap_generated as swg
+from swift2.wrap.ffi_interop import SwiftError
 from swift2.common import _df_from_dict, _npf
 from swift2.const import VecNum, VecStr
 from swift2.utils import is_common_iterable
@@ -169,6 +172,7 @@ def add_to_hypercube(parameteriser, specs):
         specs (pd.DataFrame): An optional data frame description of the parameter set, with at least columns Name, Min, Max, Value.
     """
     swc.add_parameters_pkg(parameteriser, specs)
+    invalidate_parameter_names(parameteriser)
 
 
 def set_hypercube(parameteriser: "HypercubeParameteriser", specs: pd.DataFrame):
@@ -292,6 +296,7 @@ def add_transform(
     swg.AddParameterTransform_py(
         parameteriser, param_name, inner_param_name, transform_id, a, b
     )
+    invalidate_parameter_names(parameteriser)
 
 
 #' Create a scaled parameteriser
@@ -840,7 +845,110 @@ def parameteriser_as_dataframe(parameteriser):
     Returns:
         [type]: [a data frame]
     """
-    return swc.parameteriser_to_data_frame_pkg(parameteriser)
+    names, c_names = _cached_parameter_names(parameteriser)
+    bounds = swc.get_parameter_bounds_array(parameteriser, c_names)
+    values = swc.get_parameter_values_array(parameteriser, c_names)
+    return _df_from_dict(Name=list(names), Value=values, Min=bounds[:, 0], Max=bounds[:, 1])
+
+
+# Parameter names of parameterisers, in their order and as native strings, so that whole vectors of values
+# are moved without looking up and marshalling names each time. Read once per parameteriser, and discarded
+# by the functions of this package adding, hiding or showing parameters.
+_parameter_names_cache: "weakref.WeakKeyDictionary[Any, Tuple[List[str], List[Any]]]" = weakref.WeakKeyDictionary()
+_parameter_names_lock = threading.Lock()
+
+
+def _cached_parameter_names(parameteriser) -> Tuple[List[str], List[Any]]:
+    with _parameter_names_lock:
+        entry = _parameter_names_cache.get(parameteriser)
+    if entry is not None:
+        return entry
+    n = swg.GetNumParameters_py(parameteriser)
+    names = [swg.GetParameterName_py(parameteriser, i) for i in range(n)]
+    entry = (names, swc.encode_parameter_names(names))
+    with _parameter_names_lock:
+        _parameter_names_cache[parameteriser] = entry
+    return entry
+
+
+def _with_parameter_names(parameteriser, func):
+    # a cached name no longer known to the parameteriser, e.g. renamed natively,
+    # fails the native call: the names are then read again, once
+    try:
+        return func(_cached_parameter_names(parameteriser)[1])
+    except SwiftError:
+        with _parameter_names_lock:
+            if _parameter_names_cache.pop(parameteriser, None) is None:
+                raise
+        return func(_cached_parameter_names(parameteriser)[1])
+
+
+def invalidate_parameter_names(parameteriser) -> None:
+    """Discards the cached order of the parameters of a parameteriser
+
+    The functions of this package changing the parameters of a parameteriser call it. It must be called
+    after changing them otherwise, e.g. with the functions of `swift2.wrap.swift_wrap_generated`. The orders
+    cached for all parameterisers are discarded, as the parameteriser may be part of composite parameterisers.
+
+    Args:
+        parameteriser (HypercubeParameteriser): A HypercubeParameteriser wrapper, or a type inheriting from it
+    """
+    with _parameter_names_lock:
+        _parameter_names_cache.clear()
+
+
+def parameter_names(parameteriser) -> List[str]:
+    """Names of the parameters, in the order of the arrays of `parameter_values_array` and related functions
+
+    Args:
+        parameteriser (HypercubeParameteriser): A HypercubeParameteriser wrapper, or a type inheriting from it
+
+    Returns:
+        List[str]: parameter names
+    """
+    return list(_cached_parameter_names(parameteriser)[0])
+
+
+def parameter_values_array(parameteriser) -> np.ndarray:
+    """Values of all the parameters, in the order of `parameter_names`
+
+    Args:
+        parameteriser (HypercubeParameteriser): A HypercubeParameteriser wrapper, or a type inheriting from it
+
+    Returns:
+        np.ndarray: parameter values
+    """
+    return _with_parameter_names(
+        parameteriser, lambda c_names: swc.get_parameter_values_array(parameteriser, c_names)
+    )
+
+
+def set_parameter_values_array(parameteriser, values: np.ndarray, rollback: bool = False) -> None:
+    """Sets the values of all the parameters, in the order of `parameter_names`
+
+    Args:
+        parameteriser (HypercubeParameteriser): A HypercubeParameteriser wrapper, or a type inheriting from it
+        values (np.ndarray): parameter values
+        rollback (bool, optional): if a value cannot be set, restore the previous values before raising. Defaults to False, leaving the values before it set.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    _with_parameter_names(
+        parameteriser, lambda c_names: swc.set_parameter_values_array(parameteriser, c_names, values, rollback)
+    )
+
+
+def parameter_bounds_array(parameteriser) -> np.ndarray:
+    """Bounds of all the parameters, in the order of `parameter_names`
+
+    Args:
+        parameteriser (HypercubeParameteriser): A HypercubeParameteriser wrapper, or a type inheriting from it
+
+    Returns:
+        np.ndarray: array of shape (parameter, 2), with the minimum then maximum values
+    """
+    return _with_parameter_names(
+        parameteriser, lambda c_names: swc.get_parameter_bounds_array(parameteriser, c_names)
+    )
 
 
 def num_free_parameters(parameteriser) -> int:
@@ -879,6 +987,21 @@ def scores_as_dataframe(scores_population):
     return swc.vec_scores_as_dataframe_pkg(scores_population)
 
 
+def scores_as_numpy(scores_population) -> Tuple[np.ndarray, List[str]]:
+    """Convert objective scores to a numpy array, without building a data frame
+
+    Args:
+        scores_population (VectorObjectiveScores): population of objective scores
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: array of shape (point, column), with the scores then the parameter values of each point, and the column names
+    """
+    score_values, score_names, param_values, param_names = swc.vec_scores_as_arrays(scores_population)
+    if len(score_values) == 0:
+        return (np.empty((0, 0)), [])
+    return (np.hstack([score_values, param_values]), score_names + param_names)
+
+
 #' Sort objective scores according to one of the objective values
 #'
 #'
@@ -1260,6 +1383,7 @@ def hide_parameters(
         strict (bool, optional): logical, default False. Used only if regex and starts_with are False. If True, raises an error if one of the "patterns" has no exact match in the parameters.. Defaults to False.
     """
     swg.HideParameters_py(parameteriser, patterns, regex, starts_with, strict)
+    invalidate_parameter_names(parameteriser)
 
 
 #' Show some parameters in a filter parameteriser
@@ -1282,6 +1406,7 @@ def show_parameters(parameteriser, patterns, regex=False, starts_with=False):
         starts_with (bool, optional): should the patterns be used as starting strings in the parameter names. Defaults to False.
     """
     swg.ShowParameters_py(parameteriser, patterns, regex, starts_with)
+    invalidate_parameter_names(parameteriser)
 
 
 #' min/max bound a column in a data frame
@@ -1362,11 +1487,85 @@ class MhData:
         Returns:
             Any: New MhData object with subset data
         """
-        criterion: pd.DataFrame = self._data[[colname]]
-        indices = criterion.squeeze().str.match(pattern)
-        data = self._data.loc[indices.values]
+        criterion: pd.Series = self._data[colname]
+        if isinstance(criterion.dtype, pd.CategoricalDtype):
+            # match the few distinct categories rather than every row
+            categories = criterion.cat.categories
+            matching = np.flatnonzero(categories.astype(str).str.match(pattern))
+            indices = np.isin(criterion.cat.codes.values, matching)
+        else:
+            indices = criterion.str.match(pattern).values
+        data = self._data.loc[indices]
         return MhData(data, self._fitness, self._messages, self._categories)
 
+    def compact(self, float32: bool = False, float32_columns: Optional[Sequence[str]] = None) -> "MhData":
+        """A copy of this log with a compact memory representation
+
+        String columns such as the messages and categories are converted to categorical columns.
+
+        Args:
+            float32 (bool, optional): store numeric columns other than the fitness and point numbers as float32, e.g. parameter values. Defaults to False.
+            float32_columns (Sequence[str], optional): numeric columns to store as float32, if not those implied by `float32`.
+
+        Returns:
+            MhData: New MhData object with compact data
+        """
+        d = self._data.copy()
+        for colname in d.columns:
+            # string columns are of StringDtype from pandas 3, of object dtype before
+            if pd.api.types.is_object_dtype(d[colname]) or pd.api.types.is_string_dtype(d[colname]):
+                d[colname] = d[colname].astype("category")
+        if float32_columns is None and float32:
+            float32_columns = [
+                colname
+                for colname in d.columns
+                if d[colname].dtype == np.float64 and colname not in (self._fitness, "PointNumber")
+            ]
+        if float32_columns is not None:
+            d = d.astype({colname: np.float32 for colname in float32_columns})
+        return MhData(d, self._fitness, self._messages, self._categories)
+
+    def memory_usage(self) -> int:
+        """Memory used by the data of this log, in bytes, including that of strings"""
+        return int(self._data.memory_usage(index=True, deep=True).sum())
+
+    def to_parquet(self, path: str) -> None:
+        """Saves the data of this log to a Parquet file. Categorical and float32 columns are preserved.
+
+        This method requires the package `pyarrow` to be installed.
+
+        Args:
+            path (str): file path
+        """
+        self._data.to_parquet(path, engine="pyarrow", index=False)
+
+    @staticmethod
+    def read_parquet(
+        path: str,
+        fitness: str = "NSE",
+        messages: str = "Message",
+        categories: str = "Category",
+        memory_map: bool = True,
+    ) -> "MhData":
+        """Loads a log saved with `to_parquet`
+
+        This method requires the package `pyarrow` to be installed.
+
+        Args:
+            path (str): file path
+            fitness (str, optional): name of the fitness column. Defaults to "NSE".
+            messages (str, optional): name of the messages column. Defaults to "Message".
+            categories (str, optional): name of the categories column. Defaults to "Category".
+            memory_map (bool, optional): read the file through a memory map rather than buffered reads. Defaults to True.
+
+        Returns:
+            MhData: the log
+        """
+        import pyarrow.parquet as pq
+
+        data = pq.read_table(path, memory_map=memory_map).to_pandas()
+        return MhData(data, fitness, messages, categories)
+
     def bound_fitness(self, obj_lims: Sequence[float] = None) -> pd.DataFrame:
         """Return a copy of the log data with the fitness measure bound by min/max limits
 
@@ -1455,12 +1654,16 @@ def mk_optim_log(
     )
 
 
-def extract_optimisation_log(estimator, fitness_name="log.likelihood") -> 'MhData':
+def extract_optimisation_log(
+    estimator, fitness_name="log.likelihood", compact: bool = False, float32: bool = False
+) -> 'MhData':
     """Extract the logger from a parameter extimator (optimiser or related)
 
     Args:
         estimator (Optimiser): the optimiser instance
         fitness_name (str, optional): name of the fitness function to extract. Defaults to "log.likelihood".
+        compact (bool, optional): use a compact memory representation, see [swift2.parameteriser.MhData.compact][]. Defaults to False.
+        float32 (bool, optional): if compact, store numeric columns other than the fitness as float32. Defaults to False.
 
     Returns:
         MhData: an object with methods to analyse the optimisation log
@@ -1469,6 +1672,8 @@ def extract_optimisation_log(estimator, fitness_name="log.likelihood") -> 'MhDat
     log_mh = mk_optim_log(
         optim_log, fitness=fitness_name, messages="Message", categories="Category"
     )
+    if compact:
+        log_mh = log_mh.compact(float32=float32)
     # geom_ops = log_mh.subset_by_message()
     # return {"data": log_mh, "geom_ops": geom_ops}
     return log_mh
@@ -9,14 +9,25 @@ if TYPE_CHECKING:
     )
     from uchronia.classes import TimeSeriesLibrary, EnsembleForecastTimeSeries
     from swift2.const import NdSimulation, RecordToSignature
+    from swift2.internal import TimeSeriesBufferPool
 
-from cinterop.timeseries import TimeSeriesLike
+from cinterop.cffi.marshal import TimeSeriesGeometry
+from cinterop.timeseries import (
+    TimeSeriesLike,
+    ConvertibleToTimestamp,
+    ENSEMBLE_DIMNAME,
+    LEADTIME_DIMNAME,
+    TIME_DIMNAME,
+)
 
 import uchronia.wrap.uchronia_wrap_generated as uwg
-import uchronia.data_set as uds
+import numpy as np
 import pandas as pd
+import xarray as xr
 
+import swift2.wrap.swift_wrap_custom as swc
 import swift2.wrap.swift_wrap_generated as swg
+from swift2.wrap.ffi_interop import marshal
 import swift2.internal as si
 from swift2.utils import is_common_iterable
 from swift2.internal import simplify_time_series
@@ -143,13 +154,57 @@ def play_singular_simulation(simulation, input_ts, var_ids):
                 assert len(input_ts.columns) == len(var_ids)
             assert len(ts_values.shape) == 2
             assert ts_values.shape[1] == len(var_ids)
-            for i, v in enumerate(var_ids):
-                swg.Play_py(
-                    simulation,
-                    v,
-                    ts_values[:, i],
-                    ts_geom,
-                )
+            swc.play_block(simulation, list(var_ids), ts_values, ts_geom)
+
+
+def play_input_array(
+    simulation: "Simulation",
+    values: np.ndarray,
+    var_ids: "VecStr",
+    ts_geom: TimeSeriesGeometry,
+) -> None:
+    """
+    Sets one or more series as inputs to a simulation, from a numpy array such as a memory-mapped one
+
+    The array is passed to the native library as is: the values of each series must be contiguous in
+    memory, so that no copy is made in Python.
+
+    Args:
+        simulation (Simulation): A swift simulation object
+        values (np.ndarray): float64 array of shape (time,), or (time, variable) in column-major order. For a C-contiguous array of shape (variable, time), e.g. loaded with `np.load(f, mmap_mode='r')`, pass its transpose `.T`.
+        var_ids (VecStr): model variable identifiers, one per column of `values`
+        ts_geom (TimeSeriesGeometry): time series geometry of the values, e.g. `TimeSeriesGeometry(start, 3600, length)`
+    """
+    swc.check_native_readable_columns(values)
+    if isinstance(var_ids, str):
+        var_ids = [var_ids]
+    n_time = values.shape[0]
+    if n_time != ts_geom.length:
+        raise ValueError(
+            f"values have {n_time} time steps but the time series geometry has length {ts_geom.length}"
+        )
+    if len(values.shape) == 1:
+        values = values.reshape((n_time, 1))
+    swc.play_block(simulation, list(var_ids), values, si.native_tsgeom(ts_geom))
+
+
+def play_input_npy(
+    simulation: "Simulation",
+    path: str,
+    var_ids: "VecStr",
+    ts_geom: TimeSeriesGeometry,
+) -> None:
+    """
+    Sets one or more series as inputs to a simulation, from a `.npy` file memory-mapped rather than loaded in memory
+
+    Args:
+        simulation (Simulation): A swift simulation object
+        path (str): path to a `.npy` file with a float64 array of shape (time,), or (time, variable) in Fortran order
+        var_ids (VecStr): model variable identifiers, one per column of the array
+        ts_geom (TimeSeriesGeometry): time series geometry of the values
+    """
+    values = np.load(path, mmap_mode="r")
+    play_input_array(simulation, values, var_ids, ts_geom)
 
 
 def play_ensemble_forecast_input(
@@ -204,11 +259,10 @@ def get_played(simulation: "Simulation", var_ids=None, start_time=None, end_time
 
     """
 
-    series = None
     if var_ids is None:
         var_ids = get_played_varnames(simulation)
-    series = si.internal_get_played_tts(simulation, var_ids)
-    return si.get_ts_window(series, start_time, end_time)
+    # the window is applied while copying from the native series, not after
+    return si.internal_get_played_tts(simulation, var_ids, start_time, end_time)
 
 
 def get_played_varnames(simulation):
@@ -248,25 +302,63 @@ def get_recorded(
     if si.is_ensemble_forecast_simulation(simulation):
         return get_recorded_ensemble_forecast(simulation, var_ids, start_time, end_time)
     else:
-        series = None
         if var_ids is None:
             var_ids = get_recorded_varnames(simulation)
-        series = si.internal_get_recorded_tts(simulation, var_ids)
-        return si.get_ts_window(series, start_time, end_time)
+        # the window is applied while copying from the native series, not after
+        return si.internal_get_recorded_tts(simulation, var_ids, start_time, end_time)
 
 
-def get_all_recorded(simulation):
+def get_recorded_into(
+    simulation: "Simulation",
+    var_ids: "VecStr" = None,
+    out: Optional[np.ndarray] = None,
+    buffer_pool: Optional["TimeSeriesBufferPool"] = None,
+) -> np.ndarray:
+    """
+    Retrieves recorded time series into a preallocated (time, variable) array
+
+    Values are written by the native library directly into the columns of the array,
+    without intermediate allocations, which suits repeated retrievals e.g. in calibration post-processing.
+
+    Args:
+        simulation (Simulation): A swift simulation object
+        var_ids (VecStr): name(s) of the output variable(s) recorded to a time series. If missing, all recorded states are retrieved.
+        out (np.ndarray, optional): float64 array of shape (time, variable), in column-major (Fortran) order, e.g. `np.empty((n, len(var_ids)), order='F')`. Defaults to None.
+        buffer_pool (TimeSeriesBufferPool, optional): pool of reusable buffers, used if `out` is None. If both are None, a new array is allocated.
+
+    Returns:
+        np.ndarray: the array holding the values, `out` if it was specified.
+    """
+    if var_ids is None:
+        var_ids = get_recorded_varnames(simulation)
+    if isinstance(var_ids, str):
+        var_ids = [var_ids]
+    n = len(var_ids)
+    if out is None:
+        mtsg = marshal.new_native_tsgeom()
+        if n > 0:
+            swg.GetRecordedTsGeometry_py(simulation, var_ids[0], mtsg)
+        else:
+            mtsg.length = 0
+        if buffer_pool is not None:
+            out = buffer_pool.get(mtsg, n)
+        else:
+            out = np.empty((mtsg.length, n), dtype=np.float64, order="F")
+    elif len(out.shape) != 2 or out.shape[1] != n:
+        raise ValueError(
+            f"output buffer must be of shape (time, {n}) but has shape {out.shape}"
+        )
+    return swc.get_recorded_data_into(simulation, var_ids, out)
+
+
+def get_all_recorded(simulation, start_time=None, end_time=None):
     all_ids = get_recorded_varnames(simulation)
-    return uds.get_multiple_time_series_from_provider(
-        simulation, all_ids, si.internal_get_recorded_tts
-    )
+    return si.internal_get_recorded_tts(simulation, all_ids, start_time, end_time)
 
 
-def get_all_played(simulation):
+def get_all_played(simulation, start_time=None, end_time=None):
     all_ids = get_played_varnames(simulation)
-    return uds.get_multiple_time_series_from_provider(
-        simulation, all_ids, si.internal_get_played_tts
-    )
+    return si.internal_get_played_tts(simulation, all_ids, start_time, end_time)
 
 
 def get_recorded_ensemble_forecast(
@@ -286,6 +378,9 @@ def get_recorded_ensemble_forecast(
     Returns:
         an xts time series, possibly multivariate.
 
+    Note:
+        See also `get_recorded_ensemble_forecast_cube`, to retrieve the values as a dense array, optionally over a window of issue times.
+
     """
     si.check_ensemble_forecast_simulation(simulation)
     return swg.GetRecordedEnsembleForecastTimeSeries_py(simulation, var_id)
@@ -293,6 +388,41 @@ def get_recorded_ensemble_forecast(
     # getTsWindow(series, start_time, end_time)
 
 
+def get_recorded_ensemble_forecast_cube(
+    simulation: "EnsembleForecastSimulation",
+    var_id: str,
+    start_time: ConvertibleToTimestamp = None,
+    end_time: ConvertibleToTimestamp = None,
+) -> xr.DataArray:
+    """
+    Retrieves recorded ensemble forecasts as a dense (issue time, lead time, ensemble member) array
+
+    The values are copied by the native library one lead time at a time, for all the issue times, into
+    a single array, without going through a per-forecast conversion of an ensemble forecast time series.
+
+    Args:
+        simulation (EnsembleForecastSimulation): an ensemble forecast simulation
+        var_id (str): name of the output variable recorded
+        start_time (datetime like): An optional parameter, the first forecast issue time to retrieve
+        end_time (datetime like): An optional parameter, the last forecast issue time to retrieve
+
+    Returns:
+        xr.DataArray: array with dimensions (time, lead_time, ensemble), where time is the forecast issue time
+    """
+    si.check_ensemble_forecast_simulation(simulation)
+    mtsg, n_members, n_leads = swc.get_ensemble_forecast_recorded_geometry(simulation, var_id)
+    i_start, i_end = swc.window_indices(mtsg, start_time, end_time)
+    issue_times = mtsg.time_index()[i_start:i_end]
+    cube = np.empty((i_end - i_start, n_members, n_leads), dtype=np.float64)
+    swc.get_ensemble_forecast_recorded_into(simulation, var_id, i_start, cube, n_issue_times=mtsg.length)
+    return xr.DataArray(
+        cube.transpose((0, 2, 1)),
+        coords=[issue_times, np.arange(n_leads), np.arange(n_members)],
+        dims=[TIME_DIMNAME, LEADTIME_DIMNAME, ENSEMBLE_DIMNAME],
+        name=var_id,
+    )
+
+
 def get_recorded_varnames(simulation):
     """
     Gets all the names of the recorded states
@@ -0,0 +1,197 @@
+"""Pools of pre-cloned simulations and other native objects, to avoid cloning them for each use."""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
+
+import swift2.simulation as ss
+
+if TYPE_CHECKING:
+    from swift2.classes import Simulation
+
+
+class ClonePool:
+    """A pool of up to `size` objects created by a function, e.g. clones of native objects, checked out for exclusive use and returned for reuse.
+
+    Examples:
+        >>> def new_worker():
+        ...     return (simulation.clone(), parameteriser.clone())
+        >>> pool = ClonePool(new_worker, size=8)
+        >>> with pool.checkout() as (sim, p):
+        ...     p.apply_sys_config(sim)
+        ...     sim.exec_simulation()
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int = 4,
+        prewarm: bool = False,
+        reset: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        """A pool of objects created by a function
+
+        Args:
+            factory (Callable[[], Any]): function creating a new object for the pool
+            size (int, optional): maximum number of objects. Defaults to 4.
+            prewarm (bool, optional): create all the objects now, rather than on demand. Defaults to False.
+            reset (Callable[[Any], None], optional): function applied to each object returned to the pool. Defaults to None.
+        """
+        if size < 1:
+            raise ValueError("size must be strictly positive")
+        self.size = size
+        self._factory = factory
+        self._reset = reset
+        self._available: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._n_clones = 0
+        self._n_checkouts = 0
+        self._n_waits = 0
+        self._wait_seconds = 0.0
+        if prewarm:
+            for _ in range(size):
+                self._n_clones += 1
+                self._available.put(self._factory())
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Checks out an object, waiting for one to be returned if all are in use
+
+        Args:
+            timeout (float, optional): maximum time to wait, in seconds. Defaults to None, no limit.
+
+        Raises:
+            TimeoutError: no object became available within `timeout`
+
+        Returns:
+            Any: an object for exclusive use until released
+        """
+        try:
+            item = self._available.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_clone = self._n_clones < self.size
+                if can_clone:
+                    # reserve the slot, the object itself is created outside the lock
+                    self._n_clones += 1
+            if can_clone:
+                try:
+                    item = self._factory()
+                except Exception:
+                    with self._lock:
+                        self._n_clones -= 1
+                    raise
+            else:
+                start = time.perf_counter()
+                try:
+                    item = self._available.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"no object available in the pool after {timeout} seconds")
+                finally:
+                    with self._lock:
+                        self._n_waits += 1
+                        self._wait_seconds += time.perf_counter() - start
+        with self._lock:
+            self._n_checkouts += 1
+        return item
+
+    def release(self, item: Any) -> None:
+        """Returns an object to the pool, after applying the `reset` function if any
+
+        Args:
+            item (Any): object previously obtained from `acquire`
+        """
+        if self._reset is not None:
+            self._reset(item)
+        self._available.put(item)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Checks out an object for the duration of a `with` block
+
+        Args:
+            timeout (float, optional): maximum time to wait, in seconds. Defaults to None, no limit.
+
+        Yields:
+            Any: an object for exclusive use within the block
+        """
+        item = self.acquire(timeout)
+        try:
+            yield item
+        finally:
+            self.release(item)
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistics on the use of this pool
+
+        Returns:
+            Dict[str, Any]: numbers of objects created, checkouts, checkouts that had to wait, total wait time in seconds, objects available, and reuse rate (fraction of checkouts that did not need a new object)
+        """
+        with self._lock:
+            n_checkouts = self._n_checkouts
+            return {
+                "size": self.size,
+                "clones": self._n_clones,
+                "checkouts": n_checkouts,
+                "waits": self._n_waits,
+                "wait_seconds": self._wait_seconds,
+                "available": self._available.qsize(),
+                "reuse_rate": (
+                    max(n_checkouts - self._n_clones, 0) / n_checkouts if n_checkouts > 0 else 0.0
+                ),
+            }
+
+
+class SimulationPool(ClonePool):
+    """A pool of up to `size` clones of a simulation, checked out for exclusive use and returned for reuse.
+
+    Simulations are cloned from a template, optionally configured (e.g. span, recorded variables)
+    by a function, then reused: their model states are reset when they are returned to the pool.
+    Other changes made while checked out, such as parameters applied, persist across uses unless
+    undone by a `reset` function, also applied when a simulation is returned.
+
+    Examples:
+        >>> def configure(s):
+        ...     s.set_simulation_span(run_start, valid_end)
+        ...     s.record_state(runoff_id)
+        >>> pool = SimulationPool(simulation, size=4, configure=configure)
+        >>> with pool.checkout() as sim:
+        ...     parameteriser.apply_sys_config(sim)
+        ...     sim.exec_simulation()
+        ...     runoff = sim.get_recorded(runoff_id)
+        >>> pool.stats()
+    """
+
+    def __init__(
+        self,
+        simulation: "Simulation",
+        size: int = 4,
+        configure: Optional[Callable[["Simulation"], None]] = None,
+        prewarm: bool = True,
+        reset: Optional[Callable[["Simulation"], None]] = None,
+    ) -> None:
+        """A pool of clones of a simulation
+
+        Args:
+            simulation (Simulation): template simulation, cloned but not modified
+            size (int, optional): maximum number of clones. Defaults to 4.
+            configure (Callable[[Simulation], None], optional): function applied once to each new clone. Defaults to None.
+            prewarm (bool, optional): create all the clones now, rather than on demand. Defaults to True.
+            reset (Callable[[Simulation], None], optional): function applied to each simulation returned to the pool, e.g. to restore parameter values. Defaults to None.
+        """
+        self._template = simulation
+        self._configure = configure
+        self._reset_simulation = reset
+        super().__init__(self._new_clone, size=size, prewarm=prewarm, reset=self._reset_clone)
+
+    def _new_clone(self) -> "Simulation":
+        sim = self._template.clone()
+        if self._configure is not None:
+            self._configure(sim)
+        return sim
+
+    def _reset_clone(self, simulation: "Simulation") -> None:
+        if self._reset_simulation is not None:
+            self._reset_simulation(simulation)
+        ss.reset_model_states(simulation)
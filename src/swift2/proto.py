@@ -25,6 +25,7 @@ from swift2.common import _df_from_dict, _npf
 
 import swift2.parameteriser as sp
 import swift2.doc_helper as std
+from swift2.pool import SimulationPool
 
 OBSERVED_SERIES_COLNAME = "Observed"
 MODELLED_SERIES_COLNAME = "Modelled"
@@ -83,6 +84,9 @@ class PbmCalibration:
 
         self.optimiser = None
         self.opt_log = None
+        self.max_threads = None
+        self._full_span_simulations = None
+        self._full_span = None
         self.parameter_template = parameters_for(self.model_id)
 
     def max_walltime_seconds(self, sec: int):
@@ -110,6 +114,8 @@ class PbmCalibration:
         urs = sp.create_parameter_sampler(0, self.parameter_template, "urs")
         optimizer = sp.create_sce_optim_swift(objective, term, sce_params, urs)
         optimizer.set_calibration_logger("")
+        if self.max_threads is not None:
+            optimizer.set_maximum_threads(self.max_threads)
         self.optimiser = optimizer
         self.opt_log = None
         self.calib_results = self.optimiser.execute_optimisation()
@@ -135,29 +141,48 @@ class PbmCalibration:
             )
         return self.opt_log
 
+    def _full_span_pool(self) -> SimulationPool:
+        # simulations over the calibration and validation periods, cloned once and reused,
+        # rebuilt if these periods change
+        span = (self.run_start, self.valid_end)
+        if self._full_span_simulations is None or self._full_span != span:
+            def configure(sim: "Simulation"):
+                sim.set_simulation_span(*span)
+
+            # the parameters applied by each use are restored to those of the template simulation
+            param_ids = sp.parameter_names(self.parameter_template)
+            initial_values = ss.get_state_value(self._simulation, param_ids)
+
+            def reset(sim: "Simulation"):
+                ss.set_state_value(sim, list(initial_values.keys()), list(initial_values.values()))
+
+            self._full_span_simulations = SimulationPool(
+                self._simulation, size=1, configure=configure, reset=reset
+            )
+            self._full_span = span
+        return self._full_span_simulations
+
     def best_modelled_runoff(self):
-        sim = self._simulation.clone()
-        sim.set_simulation_span(self.run_start, self.valid_end)
-        self.best_params.apply_sys_config(sim)
-        sim.exec_simulation()
-        return sim.get_recorded(self.runoff_id)
+        with self._full_span_pool().checkout() as sim:
+            self.best_params.apply_sys_config(sim)
+            sim.exec_simulation()
+            return sim.get_recorded(self.runoff_id)
 
     def validate(self):
         best_p = self.calib_results.get_best_score(
             score_name=self.objective_id, convert_to_py=False
         ).parameteriser
-        simul_validation = self._simulation.clone()
-        simul_validation.set_simulation_span(self.run_start, self.valid_end)
-        best_p.apply_sys_config(simul_validation)
-        simul_validation.exec_simulation()
-        objective_verif = simul_validation.create_objective(
-            self.runoff_id,
-            self.runoff_ts,
-            self.objective_id,
-            self.valid_start,
-            self.valid_end,
-        )
-        verif_score = objective_verif.get_score(best_p)
+        with self._full_span_pool().checkout() as simul_validation:
+            best_p.apply_sys_config(simul_validation)
+            simul_validation.exec_simulation()
+            objective_verif = simul_validation.create_objective(
+                self.runoff_id,
+                self.runoff_ts,
+                self.objective_id,
+                self.valid_start,
+                self.valid_end,
+            )
+            verif_score = objective_verif.get_score(best_p)
         self.verif_score = verif_score
 
         return self.best_score, self.verif_score
@@ -231,6 +256,7 @@ class PbmCalibrationBuilder:
         self.objective_id = "NSE"
         self.max_walltime_seconds(10)
         self.convergence_criterion = 0.002
+        self.max_threads = None
 
     def set_sampling_periods(
         self,
@@ -251,6 +277,9 @@ class PbmCalibrationBuilder:
     def max_walltime_seconds(self, sec: int):
         self.max_hours_walltime = sec / 3600
 
+    def set_maximum_threads(self, n_threads: int):
+        self.max_threads = n_threads
+
     def build_calibration(self, station_id, model_id):
         sim = self.model_factory.new_monthly_lumped_model(station_id, model_id)
         calib = PbmCalibration(station_id, model_id, sim, self.model_factory.data_repo)
@@ -262,6 +291,7 @@ class PbmCalibrationBuilder:
         calib.s_valid = self.s_valid
         calib.max_hours_walltime = self.max_hours_walltime
         calib.convergence_criterion = self.convergence_criterion
+        calib.max_threads = self.max_threads
         return calib
 
 def ts_plot(x, title, y_units):
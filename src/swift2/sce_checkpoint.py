@@ -0,0 +1,255 @@
+"""Checkpointed shuffled complex evolution (SCE) optimisations, resumable after an interruption.
+
+The native SCE optimiser runs to completion in a single call, and its internal state cannot be saved.
+Nor can its initial population be set: it is sampled within the feasible hypercube. A SCE optimisation
+therefore cannot be resumed mid-run. It is instead run as a sequence of segmented restarts, each one a SCE
+run limited to a number of iterations, over the original feasible bounds, with a population sampler seeded
+deterministically from the base seed and the segment number. The best parameter set across all segments
+is kept. After each segment, the best parameter set, the log of the segment and the counters are saved to
+a directory; an interrupted optimisation resumes from the last completed segment. Segments only depend on
+the seed and the run settings, not on the previous ones, so with the same settings a resumed optimisation
+runs the segments an uninterrupted one would have.
+
+Examples:
+    >>> opt = CheckpointedSceOptimiser(objective, parameteriser, "calib_ckpt", seed=42, score_name="NSE")
+    >>> opt.execute_optimisation() # if pre-empted, the same call in a new process resumes
+    >>> best = opt.best_parameteriser()
+"""
+
+import json
+import os
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import swift2.parameteriser as sp
+import swift2.wrap.swift_wrap_generated as swg
+
+if TYPE_CHECKING:
+    from swift2.classes import HypercubeParameteriser, ObjectiveEvaluator
+
+_STATE_FILENAME = "state.json"
+SEGMENT_COLNAME = "Segment"
+
+
+def _write_atomic(path: str, write) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    # so that an interruption leaves the previous checkpoint intact
+    os.replace(tmp_path, path)
+
+
+class CheckpointedSceOptimiser:
+    """A SCE optimisation run as a sequence of seeded restarts, checkpointed to a directory after each segment.
+
+    Segments do not continue the population of the previous segment, which the native optimiser cannot be
+    initialised with; they explore the original feasible bounds afresh, and the best point over all segments is kept.
+    """
+
+    def __init__(
+        self,
+        objective: "ObjectiveEvaluator",
+        parameteriser: "HypercubeParameteriser",
+        checkpoint_dir: str,
+        seed: int = 0,
+        score_name: str = "NSE",
+        maximise: bool = True,
+        iterations_per_segment: int = 100,
+        max_segments: int = 20,
+        tolerance: Optional[float] = None,
+        patience: int = 3,
+        sce_params: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """A checkpointed SCE optimisation
+
+        Args:
+            objective (ObjectiveEvaluator): objective to optimise
+            parameteriser (HypercubeParameteriser): parameteriser defining the feasible parameter space
+            checkpoint_dir (str): directory of the checkpoints. If it holds a checkpoint, the optimisation resumes from it, and all the other settings but `max_segments` must be those it was created with.
+            seed (int, optional): base seed of the population samplers. Defaults to 0.
+            score_name (str, optional): score identifying the best parameter set. Defaults to "NSE".
+            maximise (bool, optional): is the score maximised. Defaults to True.
+            iterations_per_segment (int, optional): maximum number of SCE iterations per segment. Defaults to 100.
+            max_segments (int, optional): maximum number of segments. Defaults to 20.
+            tolerance (float, optional): minimum improvement of the best score for a segment to count as improving. Defaults to None, run all segments.
+            patience (int, optional): stop after this many consecutive segments not improving the best score by at least `tolerance`. Defaults to 3. Ignored if `tolerance` is None.
+            sce_params (Dict[str, float], optional): SCE hyperparameters. Defaults to [swift2.parameteriser.get_default_sce_parameters][].
+        """
+        if patience < 1:
+            raise ValueError("patience must be at least 1")
+        self.objective = objective
+        self.parameteriser = parameteriser
+        self.checkpoint_dir = checkpoint_dir
+        self.iterations_per_segment = iterations_per_segment
+        self.max_segments = max_segments
+        self.tolerance = tolerance
+        self.patience = patience
+        self.sce_params = dict(sce_params) if sce_params is not None else sp.get_default_sce_parameters()
+        self.param_names = sp.parameter_names(parameteriser)
+        bounds = sp.parameter_bounds_array(parameteriser)
+        self.state: Dict[str, Any] = {
+            "seed": seed,
+            "score_name": score_name,
+            "maximise": maximise,
+            # the run settings a checkpoint must be resumed with, for the segments to be reproducible
+            "settings": {
+                "iterations_per_segment": iterations_per_segment,
+                "tolerance": tolerance,
+                "patience": patience,
+                "sce_params": {k: float(v) for k, v in self.sce_params.items()},
+                "param_names": list(self.param_names),
+                "lower": bounds[:, 0].tolist(),
+                "upper": bounds[:, 1].tolist(),
+            },
+            "segments_completed": 0,
+            "points_logged": 0,
+            "segments_without_improvement": 0,
+            "converged": False,
+            "best_score": None,
+            "best_parameters": None,
+        }
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        if os.path.exists(self._path(_STATE_FILENAME)):
+            self._load_state()
+
+    @classmethod
+    def resume(
+        cls,
+        checkpoint_dir: str,
+        objective: "ObjectiveEvaluator",
+        parameteriser: "HypercubeParameteriser",
+        **kwargs,
+    ) -> "CheckpointedSceOptimiser":
+        """Resumes an optimisation from a checkpoint directory
+
+        Args:
+            checkpoint_dir (str): directory of the checkpoints
+            objective (ObjectiveEvaluator): objective to optimise, as for the interrupted optimisation
+            parameteriser (HypercubeParameteriser): parameteriser, as for the interrupted optimisation
+            kwargs: other arguments of the constructor, as for the interrupted optimisation except `max_segments`, which may be changed
+
+        Returns:
+            CheckpointedSceOptimiser: the optimisation, to continue with `execute_optimisation`
+        """
+        if not os.path.exists(os.path.join(checkpoint_dir, _STATE_FILENAME)):
+            raise FileNotFoundError(f"no checkpoint found in {checkpoint_dir}")
+        return cls(objective, parameteriser, checkpoint_dir, **kwargs)
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.checkpoint_dir, filename)
+
+    def _log_path(self, segment: int) -> str:
+        return self._path(f"log_{segment:04d}.csv")
+
+    def _load_state(self) -> None:
+        with open(self._path(_STATE_FILENAME), "r") as f:
+            saved = json.load(f)
+        if "settings" not in saved:
+            raise ValueError(f"the checkpoint in {self.checkpoint_dir} does not record its run settings")
+        keys = ("seed", "score_name", "maximise")
+        expected = dict(self.state["settings"], **{k: self.state[k] for k in keys})
+        found = dict(saved["settings"], **{k: saved[k] for k in keys})
+        mismatches = [
+            f"{key}: {found.get(key)!r} in the checkpoint, {value!r} here"
+            for key, value in expected.items()
+            if found.get(key) != value
+        ]
+        if len(mismatches) > 0:
+            raise ValueError(
+                f"the checkpoint in {self.checkpoint_dir} was created with other settings; " + "; ".join(mismatches)
+            )
+        self.state.update(saved)
+
+    def _save_checkpoint(self) -> None:
+        # saved after the log of the segment: the segment is only completed once its state is
+        _write_atomic(self._path(_STATE_FILENAME), lambda f: f.write(json.dumps(self.state).encode()))
+
+    @property
+    def segments_completed(self) -> int:
+        """Number of segments completed, including before a resumption"""
+        return self.state["segments_completed"]
+
+    @property
+    def is_complete(self) -> bool:
+        """Is the optimisation complete, all segments run or converged"""
+        return self.state["converged"] or self.segments_completed >= self.max_segments
+
+    def _run_segment(self) -> None:
+        segment = self.segments_completed
+        # always the original feasible bounds: a converged population must not shrink the search space
+        sampler = sp.create_parameter_sampler(self.state["seed"] + segment, self.parameteriser, "urs")
+        termination = swg.CreateSceMaxIterationTerminationWila_py(self.iterations_per_segment)
+        optimiser = sp.create_sce_optim_swift(self.objective, termination, self.sce_params, sampler)
+        sp.set_calibration_logger(optimiser, "")
+        results = sp.execute_optimisation(optimiser)
+
+        log = sp.get_logger_content(optimiser)
+        log[SEGMENT_COLNAME] = segment
+        log["PointNumber"] = np.arange(
+            self.state["points_logged"] + 1, self.state["points_logged"] + len(log) + 1, dtype=int
+        )
+        log.to_csv(self._log_path(segment), index=False)
+
+        population, columns = sp.scores_as_numpy(results)
+        score_name = self.state["score_name"]
+        scores = population[:, columns.index(score_name)]
+        i_best = int(np.argmax(scores) if self.state["maximise"] else np.argmin(scores))
+        segment_best = float(scores[i_best])
+        previous_best = self.state["best_score"]
+        improved = previous_best is None or (
+            segment_best > previous_best if self.state["maximise"] else segment_best < previous_best
+        )
+        if improved:
+            self.state["best_score"] = segment_best
+            self.state["best_parameters"] = {
+                name: float(population[i_best, columns.index(name)]) for name in self.param_names
+            }
+        if self.tolerance is not None and previous_best is not None:
+            # independent restarts often do not improve on the best: only a run of them is a convergence
+            if improved and abs(segment_best - previous_best) >= self.tolerance:
+                self.state["segments_without_improvement"] = 0
+            else:
+                self.state["segments_without_improvement"] += 1
+            self.state["converged"] = self.state["segments_without_improvement"] >= self.patience
+        self.state["points_logged"] += len(log)
+        self.state["segments_completed"] = segment + 1
+        self._save_checkpoint()
+
+    def execute_optimisation(self) -> Tuple[float, Dict[str, float]]:
+        """Runs the segments not yet completed, checkpointing after each one
+
+        Returns:
+            Tuple[float, Dict[str, float]]: the best score, and the parameter values achieving it
+        """
+        while not self.is_complete:
+            self._run_segment()
+        return (self.state["best_score"], dict(self.state["best_parameters"] or {}))
+
+    def best_parameteriser(self) -> "HypercubeParameteriser":
+        """The best parameter set found so far, as a clone of the parameteriser with its original bounds"""
+        if self.state["best_parameters"] is None:
+            raise ValueError("no segment of the optimisation was completed yet")
+        p = self.parameteriser.clone()
+        best = self.state["best_parameters"]
+        sp.set_parameter_value(p, list(best.keys()), list(best.values()))
+        return p
+
+    def get_log_content(self) -> pd.DataFrame:
+        """The log of all the completed segments, with a 'Segment' column"""
+        logs = [pd.read_csv(self._log_path(i)) for i in range(self.segments_completed)]
+        if len(logs) == 0:
+            return pd.DataFrame()
+        return pd.concat(logs, ignore_index=True)
+
+    def extract_optimisation_log(self, fitness_name: str = "log.likelihood") -> "sp.MhData":
+        """The log of all the completed segments, for analysis and plotting
+
+        Args:
+            fitness_name (str, optional): name of the fitness function to extract. Defaults to "log.likelihood".
+
+        Returns:
+            MhData: an object with methods to analyse the optimisation log
+        """
+        return sp.mk_optim_log(self.get_log_content(), fitness=fitness_name, messages="Message", categories="Category")
@@ -0,0 +1,200 @@
+"""Memoisation of objective scores by parameter values, to skip simulations for parameter sets already evaluated.
+
+Optimisers and repeated validations often evaluate the same parameter sets more than once. Scores are
+cached by a hash of the parameter values, quantised to a relative precision so that values differing
+only by floating point noise share an entry.
+
+A cache is only valid for one objective, and as long as the simulation it evaluates is otherwise unchanged,
+e.g. same inputs and simulation span.
+
+Only evaluations requested from Python go through the cache, e.g. `ObjectiveEvaluator.get_score`. Native
+optimisers such as SCE evaluate the objective within the native library, bypassing it: the cache does not
+avoid repeated evaluations within a native optimisation.
+
+Examples:
+    >>> cache = ObjectiveScoreCache(max_entries=10000, path="scores.json")
+    >>> objective.set_score_cache(cache)
+    >>> objective.get_scores(p) # simulates
+    >>> objective.get_scores(p) # does not
+    >>> cache.info()
+    >>> cache.save()
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import numpy as np
+
+import swift2.parameteriser as sp
+import swift2.wrap.swift_wrap_generated as swg
+
+if TYPE_CHECKING:
+    from swift2.classes import HypercubeParameteriser, ObjectiveEvaluator
+
+
+def parameter_vector_key(p_set: "HypercubeParameteriser", precision_bits: int = 40) -> str:
+    """A hash of the names and values of the parameters of a parameteriser
+
+    Args:
+        p_set (HypercubeParameteriser): parameteriser
+        precision_bits (int, optional): number of bits of the mantissa of values kept, a relative precision of about 1e-12 by default. Defaults to 40.
+
+    Returns:
+        str: hexadecimal digest
+    """
+    names = sp.parameter_names(p_set)
+    values = sp.parameter_values_array(p_set)
+    mantissa, exponent = np.frexp(values)
+    scale = float(2**precision_bits)
+    quantised = np.ldexp(np.round(mantissa * scale) / scale, exponent)
+    h = hashlib.sha1()
+    h.update("\n".join(names).encode())
+    h.update(quantised.astype("<f8").tobytes())
+    return h.hexdigest()
+
+
+class ObjectiveScoreCache:
+    """A bounded cache of objective scores, with least recently used eviction, optionally persisted to a JSON file."""
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None, precision_bits: int = 40) -> None:
+        """A bounded cache of objective scores
+
+        Args:
+            max_entries (int, optional): maximum number of parameter sets whose scores are kept. Defaults to 1024.
+            path (str, optional): file the cache is saved to by `save`, and loaded from now if it exists. Defaults to None.
+            precision_bits (int, optional): relative precision of parameter values in keys, see `parameter_vector_key`. Defaults to 40.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be strictly positive")
+        self.max_entries = max_entries
+        self.path = path
+        self.precision_bits = precision_bits
+        self._scores: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def key(self, p_set: "HypercubeParameteriser") -> str:
+        """Key of the parameter values of a parameteriser in this cache"""
+        return parameter_vector_key(p_set, self.precision_bits)
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """Gets the scores for a key, if cached
+
+        Args:
+            key (str): key, see `key`
+
+        Returns:
+            Optional[Dict[str, float]]: scores by name, or None if not cached
+        """
+        with self._lock:
+            scores = self._scores.get(key)
+            if scores is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._scores.move_to_end(key)
+            return dict(scores)
+
+    def put(self, key: str, scores: Dict[str, float]) -> None:
+        """Adds scores to the cache, evicting the least recently used ones if over capacity
+
+        Args:
+            key (str): key, see `key`
+            scores (Dict[str, float]): scores by name
+        """
+        with self._lock:
+            self._scores[key] = {k: float(v) for k, v in scores.items()}
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found cached scores"""
+        with self._lock:
+            n = self.hits + self.misses
+            return self.hits / n if n > 0 else 0.0
+
+    def info(self) -> Dict[str, Any]:
+        """Usage statistics of this cache
+
+        Returns:
+            Dict[str, Any]: numbers of hits, misses, entries, and hit rate
+        """
+        with self._lock:
+            n = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._scores),
+                "hit_rate": self.hits / n if n > 0 else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Removes all the scores from the cache and resets the hit/miss counters"""
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Saves the cached scores to a JSON file
+
+        Args:
+            path (str, optional): file path. Defaults to the path this cache was created with.
+        """
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("no path to save the cache to")
+        with self._lock:
+            content = json.dumps({"precision_bits": self.precision_bits, "scores": self._scores})
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """Adds the scores saved in a JSON file to the cache
+
+        Args:
+            path (str): file path
+        """
+        with open(path, "r") as f:
+            content = json.load(f)
+        if content.get("precision_bits") != self.precision_bits:
+            raise ValueError(
+                f"scores in {path} are keyed with a precision of {content.get('precision_bits')} bits, not {self.precision_bits}"
+            )
+        for key, scores in content["scores"].items():
+            self.put(key, scores)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+def cached_scores(
+    objective: "ObjectiveEvaluator", p_set: "HypercubeParameteriser", cache: ObjectiveScoreCache
+) -> Dict[str, float]:
+    """Scores of an objective for a parameteriser, evaluated only if not already cached
+
+    Args:
+        objective (ObjectiveEvaluator): objective evaluator
+        p_set (HypercubeParameteriser): parameteriser
+        cache (ObjectiveScoreCache): cache of the scores of this objective
+
+    Returns:
+        Dict[str, float]: score(s)
+    """
+    key = cache.key(p_set)
+    scores = cache.get(key)
+    if scores is None:
+        scores = swg.EvaluateScoresForParametersWila_py(objective, p_set)
+        cache.put(key, scores)
+    return scores
@@ -0,0 +1,399 @@
+"""Global sensitivity analysis of an objective to the parameters of a hypercube: Sobol indices and Morris elementary effects.
+
+Designs are generated within the bounds of the parameters, evaluated in parallel over clones of the
+simulation and objective, and the indices computed from the scores. Evaluations can be checkpointed
+to a file, so that a large study interrupted can be resumed.
+
+Examples:
+    >>> evaluator = ObjectiveBatchEvaluator(simulation, objective, parameteriser)
+    >>> indices = sobol_analysis(evaluator, num_samples=4096, seed=42, checkpoint_file="sobol.npz")
+    >>> effects = morris_analysis(evaluator, num_trajectories=100, seed=42)
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from refcount.interop import is_cffi_native_handle
+
+import swift2.parameteriser as sp
+import swift2.wrap.swift_wrap_custom as swc
+import swift2.wrap.swift_wrap_generated as swg
+from swift2.pool import ClonePool
+
+if TYPE_CHECKING:
+    from swift2.classes import HypercubeParameteriser, ObjectiveEvaluator, Simulation
+
+# two-sided 95% quantile of the standard normal distribution, for bootstrap confidence intervals
+_Z_95 = 1.959963984540054
+
+
+def parameter_bounds(
+    parameteriser: "HypercubeParameteriser", param_names: Optional[Sequence[str]] = None
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Names, lower and upper bounds of parameters of a hypercube
+
+    Args:
+        parameteriser (HypercubeParameteriser): parameteriser
+        param_names (Sequence[str], optional): names of the parameters. Defaults to all the parameters, in their order.
+
+    Returns:
+        Tuple[List[str], np.ndarray, np.ndarray]: names, lower bounds and upper bounds
+    """
+    df = sp.parameteriser_as_dataframe(parameteriser).set_index("Name")
+    if param_names is None:
+        param_names = list(df.index)
+    param_names = list(param_names)
+    return (
+        param_names,
+        df.loc[param_names, "Min"].values.astype(np.float64),
+        df.loc[param_names, "Max"].values.astype(np.float64),
+    )
+
+
+def saltelli_design(
+    lower: np.ndarray, upper: np.ndarray, num_samples: int, seed: Optional[int] = None
+) -> np.ndarray:
+    """Parameter sets to estimate first order and total Sobol indices, with the scheme of Saltelli et al. (2010)
+
+    Args:
+        lower (np.ndarray): lower bounds of the parameters
+        upper (np.ndarray): upper bounds of the parameters
+        num_samples (int): number of base samples N
+        seed (int, optional): seed of the random number generator. Defaults to None.
+
+    Returns:
+        np.ndarray: array of shape (N * (d + 2), d) for d parameters: the N rows of the sample matrix A, those of B,
+            then for each parameter i in turn the N rows of A with column i taken from B.
+    """
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    d = len(lower)
+    rng = np.random.default_rng(seed)
+    a = rng.random((num_samples, d))
+    b = rng.random((num_samples, d))
+    ab = np.repeat(a[np.newaxis, :, :], d, axis=0)
+    i = np.arange(d)
+    ab[i, :, i] = b[:, i].T
+    unit = np.concatenate([a, b, ab.reshape(d * num_samples, d)])
+    return lower + unit * (upper - lower)
+
+
+def sobol_indices(
+    scores: np.ndarray,
+    num_samples: int,
+    num_resamples: int = 100,
+    seed: Optional[int] = None,
+) -> pd.DataFrame:
+    """First order and total Sobol indices, from the scores of a design from `saltelli_design`
+
+    First order indices use the estimator of Saltelli et al. (2010), total indices that of Jansen (1999).
+
+    Args:
+        scores (np.ndarray): scores for each parameter set of the design, in the same order
+        num_samples (int): number of base samples N of the design
+        num_resamples (int, optional): number of bootstrap resamples for confidence intervals, 0 for none. Defaults to 100.
+        seed (int, optional): seed for the bootstrap. Defaults to None.
+
+    Returns:
+        pd.DataFrame: one row per parameter, with columns S1, ST, and the half widths of their 95% confidence intervals S1_conf, ST_conf
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = num_samples
+    if len(scores) % n != 0 or len(scores) // n < 3:
+        raise ValueError(f"{len(scores)} scores is not consistent with a design of {n} base samples")
+    d = len(scores) // n - 2
+    f_a = scores[:n]
+    f_b = scores[n : 2 * n]
+    f_ab = scores[2 * n :].reshape(d, n)
+
+    def estimate(f_a, f_b, f_ab):
+        # arrays over [..., sample] and [..., parameter, sample]
+        variance = np.var(np.concatenate([f_a, f_b], axis=-1), axis=-1)[..., np.newaxis]
+        s1 = np.mean(f_b[..., np.newaxis, :] * (f_ab - f_a[..., np.newaxis, :]), axis=-1) / variance
+        st = 0.5 * np.mean((f_a[..., np.newaxis, :] - f_ab) ** 2, axis=-1) / variance
+        return s1, st
+
+    s1, st = estimate(f_a, f_b, f_ab)
+    result = pd.DataFrame({"S1": s1, "ST": st})
+    if num_resamples > 0:
+        idx = np.random.default_rng(seed).integers(0, n, size=(num_resamples, n))
+        s1_b, st_b = estimate(f_a[idx], f_b[idx], f_ab[:, idx].transpose((1, 0, 2)))
+        result["S1_conf"] = _Z_95 * np.std(s1_b, axis=0, ddof=1)
+        result["ST_conf"] = _Z_95 * np.std(st_b, axis=0, ddof=1)
+    return result
+
+
+def morris_design(
+    lower: np.ndarray,
+    upper: np.ndarray,
+    num_trajectories: int,
+    num_levels: int = 4,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Parameter sets along random one-at-a-time trajectories, for the elementary effects method of Morris (1991)
+
+    Args:
+        lower (np.ndarray): lower bounds of the parameters
+        upper (np.ndarray): upper bounds of the parameters
+        num_trajectories (int): number of trajectories r
+        num_levels (int, optional): number of levels of the grid, an even number. Defaults to 4.
+        seed (int, optional): seed of the random number generator. Defaults to None.
+
+    Returns:
+        np.ndarray: array of shape (r * (d + 1), d) for d parameters; each trajectory is d + 1 consecutive rows,
+            each one differing from the previous one in a single parameter.
+    """
+    if num_levels < 2 or num_levels % 2 != 0:
+        raise ValueError("num_levels must be an even number")
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    d = len(lower)
+    r = num_trajectories
+    rng = np.random.default_rng(seed)
+    delta = num_levels / (2.0 * (num_levels - 1))
+    # starting points on the grid such that a step of +/- delta stays within [0, 1]
+    base = rng.integers(0, num_levels // 2, size=(r, d)) / (num_levels - 1)
+    sign = rng.choice([-1.0, 1.0], size=(r, d))
+    start = base + (sign < 0) * delta
+    order = np.argsort(rng.random((r, d)), axis=1)
+    steps = np.zeros((r, d + 1, d))
+    t = np.arange(r)[:, np.newaxis]
+    k = np.arange(1, d + 1)[np.newaxis, :]
+    steps[t, k, order] = sign[t, order] * delta
+    unit = start[:, np.newaxis, :] + np.cumsum(steps, axis=1)
+    return lower + unit.reshape(r * (d + 1), d) * (upper - lower)
+
+
+def morris_indices(
+    parameter_sets: np.ndarray,
+    scores: np.ndarray,
+    num_trajectories: int,
+    lower: np.ndarray,
+    upper: np.ndarray,
+) -> pd.DataFrame:
+    """Statistics of the elementary effects, from the scores of a design from `morris_design`
+
+    Args:
+        parameter_sets (np.ndarray): the design, of shape (r * (d + 1), d)
+        scores (np.ndarray): scores for each parameter set of the design
+        num_trajectories (int): number of trajectories r
+        lower (np.ndarray): lower bounds of the parameters
+        upper (np.ndarray): upper bounds of the parameters
+
+    Returns:
+        pd.DataFrame: one row per parameter, with columns mu, mu_star (mean of absolute values) and sigma of the elementary effects
+    """
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    d = len(lower)
+    r = num_trajectories
+    unit = ((np.asarray(parameter_sets, dtype=np.float64) - lower) / (upper - lower)).reshape(r, d + 1, d)
+    y = np.asarray(scores, dtype=np.float64).reshape(r, d + 1)
+    dx = np.diff(unit, axis=1)
+    changed = np.argmax(np.abs(dx), axis=2)
+    t = np.arange(r)[:, np.newaxis]
+    k = np.arange(d)[np.newaxis, :]
+    effects = np.empty((r, d))
+    effects[t, changed] = np.diff(y, axis=1) / dx[t, k, changed]
+    return pd.DataFrame(
+        {
+            "mu": effects.mean(axis=0),
+            "mu_star": np.abs(effects).mean(axis=0),
+            "sigma": effects.std(axis=0, ddof=1) if r > 1 else np.full(d, np.nan),
+        }
+    )
+
+
+class ObjectiveBatchEvaluator:
+    """Evaluates an objective for many parameter sets, over clones of the simulation and objective, one per worker thread.
+
+    Evaluations can be checkpointed to a file, from which they resume if interrupted.
+    """
+
+    def __init__(
+        self,
+        simulation: "Simulation",
+        objective: "ObjectiveEvaluator",
+        parameteriser: "HypercubeParameteriser",
+        param_names: Optional[Sequence[str]] = None,
+        score_name: Optional[str] = None,
+        n_workers: Optional[int] = None,
+    ) -> None:
+        """Evaluates an objective for many parameter sets
+
+        Args:
+            simulation (Simulation): the simulation the objective is evaluated on. It is cloned, not modified.
+            objective (ObjectiveEvaluator): the objective. It is cloned, not modified.
+            parameteriser (HypercubeParameteriser): template parameteriser, whose values are set from each parameter set
+            param_names (Sequence[str], optional): names of the parameters varied, in the order of the columns of parameter sets. Defaults to all the parameters.
+            score_name (str, optional): name of the score, for multi-objective evaluators. Defaults to the first score.
+            n_workers (int, optional): number of worker threads. Defaults to the number of CPU cores.
+        """
+        self.param_names, self.lower, self.upper = parameter_bounds(parameteriser, param_names)
+        self.score_name = score_name
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        if self.n_workers < 1:
+            raise ValueError("n_workers must be strictly positive")
+        self._simulation = simulation
+        if is_cffi_native_handle(objective, "OBJECTIVE_EVALUATOR_WILA_PTR"):
+            objective = swg.UnwrapObjectiveEvaluatorWila_py(objective)
+        self._objective = objective
+        self._parameteriser = parameteriser
+        # clones are created lazily, at most one per worker thread, and reused across evaluations
+        self._workers = ClonePool(self._new_worker, size=self.n_workers)
+        self._clone_lock = threading.Lock()
+
+    @property
+    def num_parameters(self) -> int:
+        """Number of parameters in each parameter set"""
+        return len(self.param_names)
+
+    def _new_worker(self):
+        with self._clone_lock:
+            simulation = self._simulation.clone()
+            objective = swg.CloneObjectiveEvaluator_py(self._objective, simulation)
+            objective = swg.WrapObjectiveEvaluatorWila_py(objective, False)
+            # the simulation is kept with the objective evaluating it
+            return (simulation, objective, self._parameteriser.clone())
+
+    def _scores_one(self, values: np.ndarray) -> Tuple[List[float], List[str]]:
+        with self._workers.checkout() as (_, objective, parameteriser):
+            sp.set_parameter_value(parameteriser, self.param_names, values)
+            scores = swg.EvaluateScoreForParametersWila_py(objective, parameteriser)
+            return swc._get_scores(scores)
+
+    def _evaluate_one(self, values: np.ndarray) -> float:
+        score_values, score_names = self._scores_one(values)
+        if self.score_name is None:
+            return score_values[0]
+        return score_values[score_names.index(self.score_name)]
+
+    def _check_parameter_sets(self, parameter_sets: np.ndarray) -> np.ndarray:
+        parameter_sets = np.asarray(parameter_sets, dtype=np.float64)
+        if len(parameter_sets.shape) != 2 or parameter_sets.shape[1] != self.num_parameters:
+            raise ValueError(
+                f"parameter sets must be of shape (set, {self.num_parameters}), not {parameter_sets.shape}"
+            )
+        return parameter_sets
+
+    def evaluate_scores(self, parameter_sets: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+        """Evaluates all the scores of the objective for each parameter set
+
+        Args:
+            parameter_sets (np.ndarray): array of shape (set, parameter), with columns in the order of `param_names`
+
+        Returns:
+            Tuple[np.ndarray, List[str]]: scores of shape (set, score), and the names of the scores
+        """
+        parameter_sets = self._check_parameter_sets(parameter_sets)
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            results = list(executor.map(self._scores_one, parameter_sets))
+        if len(results) == 0:
+            return (np.empty((0, 0)), [])
+        names = list(results[0][1])
+        return (np.array([r[0] for r in results], dtype=np.float64).reshape(len(results), len(names)), names)
+
+    def evaluate(
+        self,
+        parameter_sets: np.ndarray,
+        checkpoint_file: Optional[str] = None,
+        checkpoint_every: int = 1000,
+    ) -> np.ndarray:
+        """Evaluates the objective for each parameter set
+
+        Args:
+            parameter_sets (np.ndarray): array of shape (set, parameter), with columns in the order of `param_names`
+            checkpoint_file (str, optional): file where the scores evaluated are saved periodically. If it exists, evaluations are resumed from it. Defaults to None.
+            checkpoint_every (int, optional): number of evaluations between checkpoints. Defaults to 1000.
+
+        Returns:
+            np.ndarray: scores, one per parameter set
+        """
+        parameter_sets = self._check_parameter_sets(parameter_sets)
+        n_sets = parameter_sets.shape[0]
+        scores = np.full(n_sets, np.nan)
+        done = np.zeros(n_sets, dtype=bool)
+        if checkpoint_file is not None and os.path.exists(checkpoint_file):
+            with np.load(checkpoint_file) as saved:
+                if not np.array_equal(saved["parameter_sets"], parameter_sets):
+                    raise ValueError(f"checkpoint file {checkpoint_file} is for different parameter sets")
+                scores[:] = saved["scores"]
+                done[:] = saved["done"]
+        pending = np.flatnonzero(~done)
+        chunk_size = checkpoint_every if checkpoint_file is not None else max(len(pending), 1)
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            for i in range(0, len(pending), chunk_size):
+                chunk = pending[i : i + chunk_size]
+                scores[chunk] = list(executor.map(self._evaluate_one, parameter_sets[chunk]))
+                done[chunk] = True
+                if checkpoint_file is not None:
+                    _save_checkpoint(checkpoint_file, parameter_sets, scores, done)
+        return scores
+
+
+def _save_checkpoint(path: str, parameter_sets: np.ndarray, scores: np.ndarray, done: np.ndarray) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, parameter_sets=parameter_sets, scores=scores, done=done)
+    # atomic, so that an interruption leaves the previous checkpoint intact
+    os.replace(tmp_path, path)
+
+
+def sobol_analysis(
+    evaluator: ObjectiveBatchEvaluator,
+    num_samples: int,
+    seed: Optional[int] = None,
+    num_resamples: int = 100,
+    checkpoint_file: Optional[str] = None,
+    checkpoint_every: int = 1000,
+) -> pd.DataFrame:
+    """Sobol sensitivity analysis of an objective to parameters
+
+    Args:
+        evaluator (ObjectiveBatchEvaluator): evaluator of the objective
+        num_samples (int): number of base samples N; the objective is evaluated N * (d + 2) times for d parameters
+        seed (int, optional): seed of the random number generator, to be specified to resume from a checkpoint. Defaults to None.
+        num_resamples (int, optional): number of bootstrap resamples for confidence intervals. Defaults to 100.
+        checkpoint_file (str, optional): file to checkpoint evaluations to and resume them from. Defaults to None.
+        checkpoint_every (int, optional): number of evaluations between checkpoints. Defaults to 1000.
+
+    Returns:
+        pd.DataFrame: first order and total indices, see `sobol_indices`, indexed by parameter name
+    """
+    design = saltelli_design(evaluator.lower, evaluator.upper, num_samples, seed)
+    scores = evaluator.evaluate(design, checkpoint_file, checkpoint_every)
+    result = sobol_indices(scores, num_samples, num_resamples, seed)
+    result.index = pd.Index(evaluator.param_names, name="Name")
+    return result
+
+
+def morris_analysis(
+    evaluator: ObjectiveBatchEvaluator,
+    num_trajectories: int,
+    num_levels: int = 4,
+    seed: Optional[int] = None,
+    checkpoint_file: Optional[str] = None,
+    checkpoint_every: int = 1000,
+) -> pd.DataFrame:
+    """Morris elementary effects screening of the parameters of an objective
+
+    Args:
+        evaluator (ObjectiveBatchEvaluator): evaluator of the objective
+        num_trajectories (int): number of trajectories r; the objective is evaluated r * (d + 1) times for d parameters
+        num_levels (int, optional): number of levels of the grid, an even number. Defaults to 4.
+        seed (int, optional): seed of the random number generator, to be specified to resume from a checkpoint. Defaults to None.
+        checkpoint_file (str, optional): file to checkpoint evaluations to and resume them from. Defaults to None.
+        checkpoint_every (int, optional): number of evaluations between checkpoints. Defaults to 1000.
+
+    Returns:
+        pd.DataFrame: statistics of the elementary effects, see `morris_indices`, indexed by parameter name
+    """
+    design = morris_design(evaluator.lower, evaluator.upper, num_trajectories, num_levels, seed)
+    scores = evaluator.evaluate(design, checkpoint_file, checkpoint_every)
+    result = morris_indices(design, scores, num_trajectories, evaluator.lower, evaluator.upper)
+    result.index = pd.Index(evaluator.param_names, name="Name")
+    return result
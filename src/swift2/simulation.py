@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from swift2.classes import MemoryStates, Simulation
     from swift2.const import VecStr
 import numpy as np
+import pandas as pd
 
 import swift2.wrap.swift_wrap_custom as swc
 import swift2.wrap.swift_wrap_generated as swg
@@ -75,6 +76,26 @@ def exec_simulation(simulation: "Simulation", reset_initial_states=True):
         swg.ExecuteSimulation_py(simulation, reset_initial_states)
 
 
+def get_simulation_time_index(simulation: "Simulation") -> pd.DatetimeIndex:
+    """
+    Gets the time steps over the span of a simulation
+
+    Args:
+        simulation (Simulation): A swift simulation object
+
+    Returns:
+        pd.DatetimeIndex: the time of each time step of the simulation span
+    """
+    span = swc.get_simulation_span_pkg(simulation)
+    start, end = pd.Timestamp(span["start"]), pd.Timestamp(span["end"])
+    n = swg.GetNumStepsForTimeSpan_py(simulation, start.to_pydatetime(), end.to_pydatetime())
+    if "monthly" in span["time step"].lower():
+        return pd.DatetimeIndex([start + pd.DateOffset(months=i) for i in range(n)])
+    if n < 2:
+        return pd.DatetimeIndex([start][:n])
+    return pd.date_range(start, periods=n, freq=(end - start) / (n - 1))
+
+
 def check_simulation(simulation) -> Dict:
     """
     Checks whether a simulation is configured to a state where it is executable
@@ -0,0 +1,179 @@
+"""Parallel execution of a catchment split into subcatchments, scheduled along their upstream to downstream dependencies.
+
+Subcatchments resulting from [swift2.model_definitions.split_to_subcatchments][] that do not depend on one another,
+typically headwater tributaries, are executed concurrently. The outflow of each subcatchment is then played
+as an input to the subcatchment immediately downstream of it, which is executed once all its upstream
+subcatchments are.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, List, Optional, OrderedDict, Set, Tuple
+
+import pandas as pd
+import xarray as xr
+
+import swift2.model_definitions as smd
+import swift2.simulation as ss
+from swift2.const import CATCHMENT_FLOWRATE_VARID
+from swift2.play_record import get_recorded, play_singular_simulation, record_state
+
+if TYPE_CHECKING:
+    from swift2.classes import Simulation
+
+REMAINDER_KEY = "remainder"
+
+
+def _split_element_id(element_id: str) -> Tuple[str, str]:
+    parts = element_id.split(".", 1)
+    if len(parts) != 2 or parts[0] not in ("node", "link"):
+        raise ValueError(f"expected a node or link identifier such as 'node.n1', got '{element_id}'")
+    return (parts[0], parts[1])
+
+
+def default_inflow_var_id(node_links: pd.DataFrame, element_id: str) -> str:
+    """Model variable receiving the outflow of a split element, in the subcatchment downstream of it
+
+    For a node, this is the inflow of the link immediately downstream; for a link, the inflow of its downstream node.
+
+    Args:
+        node_links (pd.DataFrame): the 'NodeLink' table of the catchment structure, see [swift2.model_definitions.get_catchment_structure][]
+        element_id (str): split element identifier such as 'node.n1', 'link.lnk2'
+
+    Returns:
+        str: model variable identifier
+    """
+    kind, e_id = _split_element_id(element_id)
+    if kind == "node":
+        links = node_links.LinkId[node_links.UpstreamId == e_id].values
+        if len(links) == 0:
+            raise ValueError(f"no link downstream of {element_id}")
+        return f"link.{links[0]}.InflowRate"
+    nodes = node_links.DownstreamId[node_links.LinkId == e_id].values
+    if len(nodes) == 0:
+        raise ValueError(f"no node downstream of {element_id}")
+    return f"node.{nodes[0]}.InflowRate"
+
+
+class SubcatchmentDagExecutor:
+    """Executes the subcatchments of a split catchment concurrently, along the dependency graph between them.
+
+    Examples:
+        >>> sub_cats = simulation.split_to_subcatchments(["node.7", "node.12", "node.25"])
+        >>> dag = SubcatchmentDagExecutor(simulation, sub_cats)
+        >>> outflows = dag.execute()
+        >>> outlet_flow = outflows[dag.outlet_key]
+    """
+
+    def __init__(
+        self,
+        simulation: "Simulation",
+        subcatchments: OrderedDict[str, "Simulation"],
+        inflow_var_ids: Optional[Dict[str, str]] = None,
+        n_workers: Optional[int] = None,
+    ) -> None:
+        """Executes the subcatchments of a split catchment
+
+        Args:
+            simulation (Simulation): the whole catchment simulation, from which the subcatchments were split
+            subcatchments (OrderedDict[str, Simulation]): subcatchments, as returned by `split_to_subcatchments` with upstream elements included
+            inflow_var_ids (Dict[str, str], optional): for split element identifiers, the model variable in the downstream subcatchment into which its outflow is played. Defaults are given by `default_inflow_var_id`.
+            n_workers (int, optional): maximum number of subcatchments executed concurrently. Defaults to the number of CPU cores.
+        """
+        self.subcatchments = subcatchments
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        node_links = smd.get_catchment_structure(simulation)["NodeLink"]
+        inflow_var_ids = dict(inflow_var_ids) if inflow_var_ids is not None else {}
+        members = {
+            k: set("node." + x for x in ss.get_node_ids(s)) | set("link." + x for x in ss.get_link_ids(s))
+            for k, s in subcatchments.items()
+        }
+        # key of the upstream subcatchment -> (key of the downstream one, variable played into it)
+        self.downstream: Dict[str, Tuple[str, str]] = {}
+        self.upstream: Dict[str, Set[str]] = {k: set() for k in subcatchments}
+        for k in subcatchments:
+            if k == REMAINDER_KEY:
+                continue
+            if k not in inflow_var_ids:
+                inflow_var_ids[k] = default_inflow_var_id(node_links, k)
+            receiving = ".".join(inflow_var_ids[k].split(".")[:2])
+            for other, elements in members.items():
+                if other != k and receiving in elements:
+                    self.downstream[k] = (other, inflow_var_ids[k])
+                    self.upstream[other].add(k)
+                    break
+        outlets = [k for k in subcatchments if k not in self.downstream]
+        if len(outlets) != 1:
+            raise ValueError(f"expected a single outlet subcatchment, found {outlets}")
+        self.outlet_key: str = outlets[0]
+
+    def outflow_var_id(self, key: str) -> str:
+        """Model variable for the outflow of a subcatchment
+
+        Args:
+            key (str): key of the subcatchment
+
+        Returns:
+            str: the outflow of the split element, or the catchment outflow for the outlet subcatchment
+        """
+        return CATCHMENT_FLOWRATE_VARID if key == self.outlet_key else f"{key}.OutflowRate"
+
+    def _run(self, key: str) -> xr.DataArray:
+        sim = self.subcatchments[key]
+        var_id = self.outflow_var_id(key)
+        record_state(sim, var_id)
+        ss.exec_simulation(sim)
+        return get_recorded(sim, var_id)
+
+    def execution_levels(self) -> List[List[str]]:
+        """Subcatchments grouped by depth in the dependency graph; subcatchments in a group are independent of each other
+
+        Returns:
+            List[List[str]]: keys of subcatchments, headwaters first
+        """
+        levels = []
+        done: Set[str] = set()
+        remaining = list(self.subcatchments.keys())
+        while remaining:
+            level = [k for k in remaining if self.upstream[k] <= done]
+            if len(level) == 0:
+                raise ValueError(f"circular dependencies between subcatchments {remaining}")
+            levels.append(level)
+            done.update(level)
+            remaining = [k for k in remaining if k not in done]
+        return levels
+
+    def execute(self) -> Dict[str, xr.DataArray]:
+        """Executes all the subcatchments, each as soon as those upstream of it are
+
+        Returns:
+            Dict[str, xr.DataArray]: the outflow of each subcatchment; that of `outlet_key` is the outflow of the whole catchment.
+        """
+        outflows: Dict[str, xr.DataArray] = {}
+        # inflows to downstream subcatchments, summed if several upstream ones flow into the same variable
+        inflows: Dict[str, Dict[str, pd.Series]] = {k: {} for k in self.subcatchments}
+        n_pending_upstream = {k: len(v) for k, v in self.upstream.items()}
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            running: Dict[Future, str] = {
+                executor.submit(self._run, k): k for k, n in n_pending_upstream.items() if n == 0
+            }
+            while running:
+                finished, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for f in finished:
+                    key = running.pop(f)
+                    outflows[key] = f.result()
+                    if key not in self.downstream:
+                        continue
+                    down_key, inflow_var_id = self.downstream[key]
+                    series = outflows[key].squeeze(drop=True).to_series()
+                    pending = inflows[down_key]
+                    pending[inflow_var_id] = (
+                        pending[inflow_var_id] + series if inflow_var_id in pending else series
+                    )
+                    n_pending_upstream[down_key] -= 1
+                    if n_pending_upstream[down_key] == 0:
+                        # played from this scheduling thread only, before the downstream subcatchment is submitted
+                        for var_id, inflow in pending.items():
+                            play_singular_simulation(self.subcatchments[down_key], inflow, var_id)
+                        running[executor.submit(self._run, down_key)] = down_key
+        return outflows
@@ -4,6 +4,8 @@
 from functools import wraps
 from cffi import FFI
 import os
+import threading
+import time
 from typing import List, Dict, Any
 from refcount.putils import library_short_filename, update_path_windows
 import pandas as pd
@@ -41,20 +43,56 @@ class SwiftError(Exception):
         super(SwiftError, self).__init__(message)
 
 
-# This will store the exception message raised by swift
-_exception_txt_raised_swift = None
+# This will store the exception message raised by swift, per calling thread: several threads may call
+# swift concurrently, and each must only see the errors raised by its own calls.
+_swift_error_state = threading.local()
+# Exception messages raised from a thread not within a call from Python, e.g. a thread created by
+# the native library; there is no knowing which caller they relate to, so the next check raises them.
+_orphan_exceptions_txt: List[bytes] = []
+_orphan_exceptions_lock = threading.Lock()
+
+# Set by swift2.instrumentation when enabled: a callable (function name, elapsed seconds)
+# receiving the duration of native calls. None, and the call is not timed, when disabled.
+_native_call_recorder = None
 
 
 @swift_ffi.callback("void(char *)")
 def _exception_callback_swift(exception_string):
     """
     This function is called when swift raises an exception.
-    It sets the global variable ``_exception_txt_raised_swift``
+    It records the exception message for the thread calling swift.
 
     :param cdata exception_string: Exception string.
     """
-    global _exception_txt_raised_swift
-    _exception_txt_raised_swift = swift_ffi.string(exception_string)
+    message = swift_ffi.string(exception_string)
+    if getattr(_swift_error_state, "depth", 0) > 0:
+        _swift_error_state.exception_txt = message
+    else:
+        with _orphan_exceptions_lock:
+            _orphan_exceptions_txt.append(message)
+
+
+def _pop_exception_txt():
+    temp_exception = getattr(_swift_error_state, "exception_txt", None)
+    if temp_exception is not None:
+        _swift_error_state.exception_txt = None
+        return temp_exception
+    if _orphan_exceptions_txt:
+        with _orphan_exceptions_lock:
+            if _orphan_exceptions_txt:
+                return _orphan_exceptions_txt.pop(0)
+    return None
+
+
+def raise_pending_exception():
+    """
+    Raises a Python SwiftError exception if swift raised an exception in this thread
+    since the last check, e.g. between the native calls of a loop within a function
+    decorated with ``check_exceptions``, to stop at the first failing call.
+    """
+    temp_exception = _pop_exception_txt()
+    if temp_exception is not None:
+        raise SwiftError(temp_exception)
 
 
 def check_exceptions(func):
@@ -67,20 +105,30 @@ def check_exceptions(func):
     def wrapper(*args, **kwargs):
         """
         This decorator will first call the function ``func``
-        After that it will raise a Python SwiftError exception if the
-        global variable ``_exception_txt_raised_swift`` is set.
+        After that it will raise a Python SwiftError exception if
+        swift raised an exception during this call, in this thread.
 
         :param func func: Python function wrapping a swift function.
         """
         # log_func_call(func, *args, **kwargs)
         # Call the function
-        return_value = func(*args, **kwargs)
+        state = _swift_error_state
+        depth = getattr(state, "depth", 0)
+        state.depth = depth + 1
+        recorder = _native_call_recorder
+        try:
+            if recorder is None:
+                return_value = func(*args, **kwargs)
+            else:
+                start = time.perf_counter()
+                try:
+                    return_value = func(*args, **kwargs)
+                finally:
+                    recorder(func.__name__, time.perf_counter() - start)
+        finally:
+            state.depth = depth
         # Check if an exception was raised
-        global _exception_txt_raised_swift
-        if _exception_txt_raised_swift is not None:
-            temp_exception = _exception_txt_raised_swift
-            _exception_txt_raised_swift = None
-            raise SwiftError(temp_exception)
+        raise_pending_exception()
         return return_value
 
     return wrapper
@@ -9,11 +9,22 @@ import numpy as np
 
 from refcount.interop import DeletableCffiNativeHandle, wrap_as_pointer_handle
 from cinterop.cffi.marshal import as_bytes, geom_to_xarray_time_series, dtts_as_datetime
+from cinterop.timeseries import as_timestamp
 import uchronia.wrap.uchronia_wrap_generated as uwg
-from swift2.wrap.ffi_interop import marshal, swift_so, check_exceptions
+from swift2.wrap.ffi_interop import (
+    SwiftError,
+    _pop_exception_txt,
+    check_exceptions,
+    marshal,
+    raise_pending_exception,
+    swift_ffi,
+    swift_so,
+)
 import swift2.wrap.swift_wrap_generated as swg
 
 if TYPE_CHECKING:
+    from cinterop.cffi.marshal import TimeSeriesGeometryNative
+    from cinterop.timeseries import ConvertibleToTimestamp
     from swift2.classes import (
         Simulation,
         EnsembleSimulation,
@@ -181,36 +192,385 @@ if TYPE_CHECKING:
 # }
 
 
-def _array_for_geom(mtsg) -> np.ndarray:
-    return np.empty((mtsg.length,))
-
-
-def _get_pp_data(simulation: Any, variable_identifier: str, mtsg, gaom_func, data_func):
+def check_native_writable_buffer(values: np.ndarray, length: int) -> None:
+    """Check that an array can be written into in place by the native library.
+
+    The marshalling of `double*` arguments silently falls back on a copy if the array is
+    not a contiguous array of double precision floats, in which case the values written
+    by the native library would never reach the caller's array.
+
+    Args:
+        values (np.ndarray): array to write into
+        length (int): expected length of the array
+
+    Raises:
+        TypeError: not a numpy array of float64
+        ValueError: unexpected shape, or not contiguous in memory
+    """
+    if not isinstance(values, np.ndarray) or values.dtype != np.float64:
+        raise TypeError("output buffer must be a numpy array of dtype float64")
+    if values.shape != (length,):
+        raise ValueError(
+            f"output buffer has shape {values.shape} but the time series has length {length}"
+        )
+    if not values.flags["C_CONTIGUOUS"]:
+        raise ValueError(
+            "output buffer must be contiguous in memory; for a 2D (time, variable) array use column-major (Fortran) order"
+        )
+
+
+def check_native_readable_columns(values: np.ndarray) -> None:
+    """Check that the series in a 1D or (time, variable) array can be read in place by the native library.
+
+    Args:
+        values (np.ndarray): array, possibly memory-mapped, of shape (time,) or (time, variable)
+
+    Raises:
+        TypeError: not a numpy array of dtype float64
+        ValueError: the values of each series are not contiguous in memory, and would be copied
+    """
+    if not isinstance(values, np.ndarray) or values.dtype != np.float64:
+        raise TypeError("values must be a numpy array of dtype float64")
+    if len(values.shape) == 1:
+        if not values.flags["C_CONTIGUOUS"]:
+            raise ValueError("values must be contiguous in memory")
+    elif len(values.shape) == 2:
+        if not values.flags["F_CONTIGUOUS"]:
+            raise ValueError(
+                "a (time, variable) array must be in column-major order, e.g. the transpose `.T` of a C-contiguous (variable, time) array"
+            )
+    else:
+        raise ValueError(f"values must be of shape (time,) or (time, variable), not {values.shape}")
+
+
+def _array_for_geom(mtsg, out: np.ndarray = None) -> np.ndarray:
+    if out is None:
+        return np.empty((mtsg.length,))
+    check_native_writable_buffer(out, mtsg.length)
+    return out
+
+
+def _get_pp_data(
+    simulation: Any,
+    variable_identifier: str,
+    mtsg,
+    gaom_func,
+    data_func,
+    out: np.ndarray = None,
+):
     # v = marshal.as_charptr(variable_identifier, True)
     gaom_func(simulation, variable_identifier, mtsg)
-    values = _array_for_geom(mtsg)
+    values = _array_for_geom(mtsg, out)
     data_func(simulation.ptr, variable_identifier, values, mtsg.length)
     return values
 
 
-def get_played_data(simulation: Any, variable_identifier: str, mtsg):
+def get_played_data(simulation: Any, variable_identifier: str, mtsg, out: np.ndarray = None):
     return _get_pp_data(
         simulation,
         variable_identifier,
         mtsg,
         swg.GetPlayedTsGeometry_py,
         swg.GetPlayed_py,
+        out,
     )
 
 
-def get_recorded_data(simulation: Any, variable_identifier: str, mtsg):
+def get_recorded_data(simulation: Any, variable_identifier: str, mtsg, out: np.ndarray = None):
     return _get_pp_data(
         simulation,
         variable_identifier,
         mtsg,
         swg.GetRecordedTsGeometry_py,
         swg.GetRecorded_py,
+        out,
+    )
+
+
+def get_recorded_data_into(
+    simulation: "Simulation",
+    variable_identifiers: Sequence[str],
+    out: np.ndarray,
+) -> np.ndarray:
+    """Copy recorded series into the columns of a preallocated (time, variable) array, without intermediate allocations."""
+    mtsg = marshal.new_native_tsgeom()
+    for i, v in enumerate(variable_identifiers):
+        get_recorded_data(simulation, v, mtsg, out[:, i])
+    return out
+
+
+def window_indices(
+    mtsg: "TimeSeriesGeometryNative",
+    start_time: "ConvertibleToTimestamp" = None,
+    end_time: "ConvertibleToTimestamp" = None,
+) -> Tuple[int, int]:
+    """Resolve a time window to the indices of the time steps of a series falling within it.
+
+    Args:
+        mtsg (TimeSeriesGeometryNative): geometry of the time series
+        start_time (ConvertibleToTimestamp, optional): start of the window, inclusive. Defaults to the start of the series.
+        end_time (ConvertibleToTimestamp, optional): end of the window, inclusive. Defaults to the end of the series.
+
+    Returns:
+        Tuple[int, int]: index of the first time step in the window, and one past the index of the last one.
+    """
+    n = mtsg.length
+    if start_time is None and end_time is None:
+        return (0, n)
+    if mtsg.time_step_code == 0:
+        start = pd.Timestamp(mtsg.start)
+        step = pd.Timedelta(seconds=mtsg.time_step_seconds)
+        i_start = 0 if start_time is None else int(np.ceil((as_timestamp(start_time) - start) / step))
+        i_end = n if end_time is None else int(np.floor((as_timestamp(end_time) - start) / step)) + 1
+    else:
+        index = mtsg.time_index()
+        i_start = 0 if start_time is None else int(index.searchsorted(as_timestamp(start_time), side="left"))
+        i_end = n if end_time is None else int(index.searchsorted(as_timestamp(end_time), side="right"))
+    i_start = min(max(i_start, 0), n)
+    i_end = min(max(i_end, i_start), n)
+    return (i_start, i_end)
+
+
+def _get_pp_block(
+    simulation: Any,
+    variable_identifiers: Sequence[str],
+    mtsg,
+    gaom_func,
+    data_func,
+    start_time: "ConvertibleToTimestamp" = None,
+    end_time: "ConvertibleToTimestamp" = None,
+) -> np.ndarray:
+    # The geometry of the first series is used for all columns: the caller must ensure
+    # that all the series span the same time steps, see `played_geometries_match`.
+    n = len(variable_identifiers)
+    if n == 0:
+        raise ValueError("at least one variable identifier is required")
+    gaom_func(simulation, variable_identifiers[0], mtsg)
+    length = mtsg.length
+    i_start, i_end = window_indices(mtsg, start_time, end_time)
+    block = np.empty((i_end - i_start, n), dtype=np.float64, order="F")
+    if (i_start, i_end) == (0, length):
+        for i, v in enumerate(variable_identifiers):
+            data_func(simulation.ptr, v, block[:, i], length)
+        return block
+    # The native API copies whole series only: reuse one scratch buffer
+    # and keep only the window, rather than materialising the full block.
+    scratch = np.empty((length,), dtype=np.float64)
+    for i, v in enumerate(variable_identifiers):
+        data_func(simulation.ptr, v, scratch, length)
+        block[:, i] = scratch[i_start:i_end]
+    if i_start > 0:
+        if mtsg.time_step_code == 0:
+            step = pd.Timedelta(seconds=mtsg.time_step_seconds)
+            mtsg.start = pd.Timestamp(mtsg.start) + i_start * step
+        else:
+            mtsg.start = mtsg.time_index()[i_start]
+    mtsg.length = i_end - i_start
+    return block
+
+
+def _geometry_key(mtsg) -> Tuple:
+    return (pd.Timestamp(mtsg.start), mtsg.time_step_seconds, mtsg.time_step_code, mtsg.length)
+
+
+def played_geometries_match(simulation: Any, variable_identifiers: Sequence[str]) -> bool:
+    """Do several played series all have the same time series geometry.
+
+    Unlike recorded series, which all span the simulation, each played series keeps its own geometry.
+    """
+    mtsg = marshal.new_native_tsgeom()
+    keys = set()
+    for v in variable_identifiers:
+        swg.GetPlayedTsGeometry_py(simulation, v, mtsg)
+        keys.add(_geometry_key(mtsg))
+        if len(keys) > 1:
+            return False
+    return True
+
+
+def get_played_block(
+    simulation: Any,
+    variable_identifiers: Sequence[str],
+    mtsg,
+    start_time: "ConvertibleToTimestamp" = None,
+    end_time: "ConvertibleToTimestamp" = None,
+    check_geometries: bool = True,
+) -> np.ndarray:
+    """Copy several played series into a new (time, variable) array, in column-major order.
+
+    If a time window is specified, only the values within it are kept, and `mtsg` is updated to describe the window.
+
+    Raises:
+        ValueError: the played series do not all have the same time series geometry, if `check_geometries` is True.
+    """
+    if check_geometries and not played_geometries_match(simulation, variable_identifiers):
+        raise ValueError(
+            "the played series do not all have the same time series geometry; retrieve them one at a time"
+        )
+    return _get_pp_block(
+        simulation,
+        variable_identifiers,
+        mtsg,
+        swg.GetPlayedTsGeometry_py,
+        swg.GetPlayed_py,
+        start_time,
+        end_time,
+    )
+
+
+def get_recorded_block(
+    simulation: Any,
+    variable_identifiers: Sequence[str],
+    mtsg,
+    start_time: "ConvertibleToTimestamp" = None,
+    end_time: "ConvertibleToTimestamp" = None,
+) -> np.ndarray:
+    """Copy several recorded series into a new (time, variable) array, in column-major order.
+
+    If a time window is specified, only the values within it are kept, and `mtsg` is updated to describe the window.
+    """
+    return _get_pp_block(
+        simulation,
+        variable_identifiers,
+        mtsg,
+        swg.GetRecordedTsGeometry_py,
+        swg.GetRecorded_py,
+        start_time,
+        end_time,
+    )
+
+
+@check_exceptions
+def play_block(
+    simulation: "Simulation",
+    variable_identifiers: Sequence[str],
+    block: np.ndarray,
+    geom: "TimeSeriesGeometryNative",
+) -> None:
+    """Play the columns of a (time, variable) array as inputs to a simulation, sharing one time series geometry.
+
+    Args:
+        simulation (Simulation): simulation
+        variable_identifiers (Sequence[str]): model variable identifiers, one per column
+        block (np.ndarray): float64 array of shape (time, variable). It is converted to column-major order once, if need be.
+        geom (TimeSeriesGeometryNative): geometry of the time series
+    """
+    block = np.asfortranarray(block, dtype=np.float64)
+    if len(block.shape) != 2 or block.shape[1] != len(variable_identifiers):
+        raise ValueError(
+            f"expected an array of shape (time, {len(variable_identifiers)}), got {block.shape}"
+        )
+    simulation_xptr = wrap_as_pointer_handle(simulation)
+    geom_xptr = wrap_as_pointer_handle(geom)
+    for i, v in enumerate(variable_identifiers):
+        # each column of a column-major array is contiguous, and passed without copy
+        values_numarray = marshal.as_c_double_array(block[:, i], shallow=True)
+        swift_so.Play(simulation_xptr.ptr, as_bytes(v), values_numarray.ptr, geom_xptr.ptr)
+        # stop at the first column failing to play
+        raise_pending_exception()
+
+
+def _get_ensemble_forecast_lead(
+    ef_simulation: "EnsembleForecastSimulation",
+    variable_identifier: str,
+    lead_time_index: int,
+    rows: np.ndarray,
+) -> None:
+    # The native function takes the index of a lead time, and one pointer per ensemble member, to which it
+    # writes the values of this lead time for every forecast issue time; these point to the rows of the
+    # C-contiguous (member, issue time) array `rows`, written in place.
+    n_members, row_length = rows.shape
+    if (
+        not rows.flags["C_CONTIGUOUS"]
+        or rows.dtype != np.float64
+        or n_members != swg.GetEnsembleForecastEnsembleSize_py(ef_simulation)
+    ):
+        raise ValueError(f"invalid buffer of shape {rows.shape} for the ensemble forecasts of '{variable_identifier}'")
+    ef_simulation_xptr = wrap_as_pointer_handle(ef_simulation)
+    base = swift_ffi.cast("double *", swift_ffi.from_buffer(rows))
+    row_ptrs = swift_ffi.new("double*[]", n_members)
+    for m in range(n_members):
+        row_ptrs[m] = base + m * row_length
+    swift_so.GetEnsembleForecastEnsembleRecorded(
+        ef_simulation_xptr.ptr, as_bytes(variable_identifier), lead_time_index, row_ptrs
+    )
+
+
+def get_ensemble_forecast_recorded_geometry(
+    ef_simulation: "EnsembleForecastSimulation", variable_identifier: str
+) -> Tuple["TimeSeriesGeometryNative", int, int]:
+    """Geometry of the ensemble forecasts recorded for a variable
+
+    The native API only exposes the geometry of the issue times from a copy of the recorded ensemble
+    forecast time series. This copy is released before returning, so that it does not coexist with a
+    dense array of the values allocated by the caller, but it is a transient cost the size of the forecasts.
+
+    Args:
+        ef_simulation (EnsembleForecastSimulation): ensemble forecast simulation
+        variable_identifier (str): recorded variable identifier
+
+    Returns:
+        Tuple[TimeSeriesGeometryNative, int, int]: geometry of the forecast issue times, ensemble size and lead time length
+    """
+    mtsg = marshal.new_native_tsgeom()
+    efts = swg.GetRecordedEnsembleForecastTimeSeries_py(ef_simulation, variable_identifier)
+    uwg.GetEnsembleForecastTimeSeriesGeometry_py(efts, mtsg)
+    del efts
+    n_members = swg.GetEnsembleForecastEnsembleSize_py(ef_simulation)
+    n_leads = swg.GetEnsembleForecastLeadLength_py(ef_simulation)
+    return (mtsg, n_members, n_leads)
+
+
+@check_exceptions
+def get_ensemble_forecast_recorded_into(
+    ef_simulation: "EnsembleForecastSimulation",
+    variable_identifier: str,
+    first_forecast_index: int,
+    out: np.ndarray,
+    n_issue_times: int,
+) -> np.ndarray:
+    """Copy recorded ensemble forecasts into a preallocated (issue time, member, lead time) array.
+
+    The native library copies the values of one lead time for all the issue times at once. These are
+    copied, one lead time after the other, into a (member, issue time) buffer sized for all the issue
+    times recorded, and the issue times within the window of `out` are copied from it.
+
+    Args:
+        ef_simulation (EnsembleForecastSimulation): ensemble forecast simulation
+        variable_identifier (str): recorded variable identifier
+        first_forecast_index (int): index of the issue time of the first forecast copied into `out`
+        out (np.ndarray): float64 array of shape (number of forecasts, ensemble size, lead time length)
+        n_issue_times (int): number of forecast issue times recorded, the length of the geometry returned by `get_ensemble_forecast_recorded_geometry`
+
+    Returns:
+        np.ndarray: `out`
+    """
+    if not isinstance(out, np.ndarray) or out.dtype != np.float64 or len(out.shape) != 3:
+        raise TypeError("output buffer must be a 3D numpy array of dtype float64")
+    n_forecasts, n_members, n_leads = out.shape
+    expected_shape = (
+        swg.GetEnsembleForecastEnsembleSize_py(ef_simulation),
+        swg.GetEnsembleForecastLeadLength_py(ef_simulation),
     )
+    if (n_members, n_leads) != expected_shape:
+        raise ValueError(
+            f"output buffer must be of shape (number of forecasts, {expected_shape[0]}, {expected_shape[1]}), not {out.shape}"
+        )
+    if first_forecast_index < 0 or first_forecast_index + n_forecasts > n_issue_times:
+        raise IndexError(
+            f"forecasts {first_forecast_index} to {first_forecast_index + n_forecasts - 1} are out of the {n_issue_times} recorded issue times"
+        )
+    if n_forecasts == 0:
+        return out
+    # the native function writes a value for every issue time recorded, whatever the window
+    rows = np.empty((n_members, n_issue_times), dtype=np.float64)
+    window = slice(first_forecast_index, first_forecast_index + n_forecasts)
+    for lead in range(n_leads):
+        _get_ensemble_forecast_lead(ef_simulation, variable_identifier, lead, rows)
+        # stop at the first lead time failing to copy
+        raise_pending_exception()
+        out[:, :, lead] = rows[:, window].T
+    return out
 
 
 def get_played_pkg(simulation: "Simulation", variable_identifier):
@@ -302,6 +662,93 @@ def parameteriser_to_data_frame_pkg(parameteriser):
     return _df_from_dict(Name=pnames, Value=values, Min=minima, Max=maxima)
 
 
+def encode_parameter_names(names: Sequence[str]) -> List[Any]:
+    """Parameter names as native strings, to be reused across calls of the `*_parameter_*_array` functions
+
+    Args:
+        names (Sequence[str]): parameter names
+
+    Returns:
+        List[Any]: native strings, owned by the list
+    """
+    return [swift_ffi.new("char[]", as_bytes(n)) for n in names]
+
+
+@check_exceptions
+def get_parameter_values_array(parameteriser: "HypercubeParameteriser", c_names: List[Any]) -> np.ndarray:
+    """Values of parameters, one native call per parameter, with names marshalled beforehand
+
+    Args:
+        parameteriser (HypercubeParameteriser): parameteriser
+        c_names (List[Any]): parameter names, from `encode_parameter_names`
+
+    Returns:
+        np.ndarray: values in the order of `c_names`
+    """
+    ptr = wrap_as_pointer_handle(parameteriser).ptr
+    values = np.empty(len(c_names), dtype=np.float64)
+    for i, c in enumerate(c_names):
+        values[i] = swift_so.GetParameterValue(ptr, c)
+        # stop at the first unknown parameter, rather than returning a value from a failed call
+        raise_pending_exception()
+    return values
+
+
+@check_exceptions
+def get_parameter_bounds_array(parameteriser: "HypercubeParameteriser", c_names: List[Any]) -> np.ndarray:
+    """Minimum and maximum values of parameters, two native calls per parameter, with names marshalled beforehand
+
+    Args:
+        parameteriser (HypercubeParameteriser): parameteriser
+        c_names (List[Any]): parameter names, from `encode_parameter_names`
+
+    Returns:
+        np.ndarray: array of shape (parameter, 2), minima then maxima, in the order of `c_names`
+    """
+    ptr = wrap_as_pointer_handle(parameteriser).ptr
+    bounds = np.empty((len(c_names), 2), dtype=np.float64)
+    for i, c in enumerate(c_names):
+        bounds[i, 0] = swift_so.GetParameterMinValue(ptr, c)
+        raise_pending_exception()
+        bounds[i, 1] = swift_so.GetParameterMaxValue(ptr, c)
+        raise_pending_exception()
+    return bounds
+
+
+@check_exceptions
+def set_parameter_values_array(
+    parameteriser: "HypercubeParameteriser", c_names: List[Any], values: np.ndarray, rollback: bool = False
+) -> None:
+    """Sets the values of parameters, one native call per parameter, with names marshalled beforehand
+
+    If a value cannot be set, e.g. an unknown parameter or a value out of bounds, the values before it
+    are left set, unless `rollback` is True.
+
+    Args:
+        parameteriser (HypercubeParameteriser): parameteriser
+        c_names (List[Any]): parameter names, from `encode_parameter_names`
+        values (np.ndarray): values in the order of `c_names`
+        rollback (bool, optional): if a value cannot be set, restore the values as they were before raising. Defaults to False. This reads all the values beforehand.
+    """
+    if len(values) != len(c_names):
+        raise ValueError(f"expected {len(c_names)} values, got {len(values)}")
+    previous = get_parameter_values_array(parameteriser, c_names) if rollback else None
+    ptr = wrap_as_pointer_handle(parameteriser).ptr
+    n_set = 0
+    try:
+        for c, v in zip(c_names, values.tolist()):
+            swift_so.SetParameterValue(ptr, c, v)
+            raise_pending_exception()
+            n_set += 1
+    except SwiftError:
+        if previous is not None:
+            for c, old in zip(c_names[:n_set], previous[:n_set].tolist()):
+                swift_so.SetParameterValue(ptr, c, old)
+            # the restored values were valid; discard an error restoring them, so that the first one is raised
+            _pop_exception_txt()
+        raise
+
+
 def _get_scores(scores):
     n = swg.GetNumScoresWila_py(scores)
     names = [swg.GetScoreNameWila_py(scores, i) for i in range(n)]
@@ -405,13 +852,63 @@ def default_sce_parameters_pkg(n=4, nshuffle=40):
 
 # [[Rcpp::export]]
 def vec_scores_as_dataframe_pkg(setOfScores) -> pd.DataFrame:
-    vectorOfScores = setOfScores
-    n = swg.GetLengthSetOfScores_py(vectorOfScores)
-    rows = [
-        _scores_as_flat_dict(swg.GetScoresAtIndex_py(vectorOfScores, i))
-        for i in range(n)
-    ]
-    return pd.DataFrame(rows)
+    score_values, score_names, param_values, param_names = vec_scores_as_arrays(setOfScores)
+    if len(score_values) == 0:
+        return pd.DataFrame()
+    d = dict(zip(score_names, score_values.T))
+    d.update(zip(param_names, param_values.T))
+    return pd.DataFrame(d, copy=False)
+
+
+@check_exceptions
+def vec_scores_as_arrays(
+    set_of_scores: "VectorObjectiveScores",
+) -> Tuple[np.ndarray, List[str], np.ndarray, List[str]]:
+    """Scores and parameter values of all the points of a population, read column-wise.
+
+    Score and parameter names are read once, from the first point, assuming all points share them.
+
+    Args:
+        set_of_scores (VectorObjectiveScores): population of scores
+
+    Returns:
+        Tuple[np.ndarray, List[str], np.ndarray, List[str]]: score values of shape (point, score), score names,
+            parameter values of shape (point, parameter), parameter names
+    """
+    vptr = wrap_as_pointer_handle(set_of_scores).ptr
+    n = swift_so.GetLengthSetOfScores(vptr)
+    raise_pending_exception()
+    if n == 0:
+        return (np.empty((0, 0)), [], np.empty((0, 0)), [])
+    first = swg.GetScoresAtIndex_py(set_of_scores, 0)
+    _, score_names = _get_scores(first)
+    p = swg.GetSystemConfigurationWila_py(first)
+    param_names = [swg.GetParameterName_py(p, i) for i in range(swg.GetNumParameters_py(p))]
+    c_names = encode_parameter_names(param_names)
+    n_scores = len(score_names)
+    # column-major, so that each column of the data frame is a contiguous array
+    score_values = np.empty((n, n_scores), dtype=np.float64, order="F")
+    param_values = np.empty((n, len(c_names)), dtype=np.float64, order="F")
+    # each native call is checked, so that the first error is raised and a failed call
+    # returning a null pointer is not followed by calls using it
+    for i in range(n):
+        scores_ptr = swift_so.GetScoresAtIndex(vptr, i)
+        raise_pending_exception()
+        try:
+            for j in range(n_scores):
+                score_values[i, j] = swift_so.GetScoreWila(scores_ptr, j)
+                raise_pending_exception()
+            p_ptr = swift_so.GetSystemConfigurationWila(scores_ptr)
+            raise_pending_exception()
+            try:
+                for j, c in enumerate(c_names):
+                    param_values[i, j] = swift_so.GetParameterValue(p_ptr, c)
+                    raise_pending_exception()
+            finally:
+                swift_so.DisposeSharedPointer(p_ptr)
+        finally:
+            swift_so.DisposeSharedPointer(scores_ptr)
+    return (score_values, score_names, param_values, param_names)
 
 
 # std::vector<std::string> CreateVecStr(char** values, int length)
@@ -428,14 +925,15 @@ from swift2.common import _df_from_dict
 
 
 def convert_optimisation_logger(
-    log_data: DeletableCffiNativeHandle, add_numbering=False
+    log_data: DeletableCffiNativeHandle, add_numbering=False, start_row: int = 0
 ):
     if log_data is None:
         raise ValueError("OptimizerLogData* log_data cannot be nullptr")
 
     ptr = log_data.ptr
-    numRows = ptr.LogLength
-    if numRows == 0:
+    # only rows from start_row on are converted, e.g. those not read by a previous call
+    numRows = ptr.LogLength - start_row
+    if numRows <= 0:
         return pd.DataFrame()
 
     names = marshal.c_charptrptr_as_string_list(
@@ -446,17 +944,17 @@ def convert_optimisation_logger(
     )
     # columns with categorical values (strings)
     str_data = [
-        (names[i], marshal.c_charptrptr_as_string_list(ptr.StringData[i], numRows))
+        (names[i], marshal.c_charptrptr_as_string_list(ptr.StringData[i] + start_row, numRows))
         for i in range(ptr.StringDataCount)
     ]
     # columns with numeric values (parameter values, objectives)
     num_data = [
-        (num_names[i], marshal.as_numeric_np_array(ptr.NumericData[i], numRows))
+        (num_names[i], marshal.as_numeric_np_array(ptr.NumericData[i] + start_row, numRows))
         for i in range(ptr.NumericDataCount)
     ]
     nbs = []
     if add_numbering:
-        nbs = [("PointNumber", np.arange(1, numRows + 1, dtype=int))]
+        nbs = [("PointNumber", np.arange(start_row + 1, start_row + numRows + 1, dtype=int))]
     d = dict(str_data + num_data + nbs)
     return _df_from_dict(**d)
 
@@ -0,0 +1,149 @@
+"""Shared fixtures of the tests of swift2.
+
+The tests run the SWIFT native library on the sample data of the package. Test modules are skipped if
+the native library cannot be loaded, and tests of ensemble forecasts are skipped if the sample data
+directory of uchronia, set by the environment variable SWIFT_SAMPLE_DATA_DIR, is not available.
+"""
+
+import os
+import sys
+
+import pytest
+
+_SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+try:
+    import swift2.wrap.ffi_interop  # noqa: F401
+
+    _native_library_error = None
+except OSError as e:
+    _native_library_error = str(e)
+
+
+class _NativeLibraryMissingModule(pytest.Module):
+    def collect(self):
+        pytest.skip(f"the SWIFT native library cannot be loaded: {_native_library_error}", allow_module_level=True)
+
+
+def pytest_pycollect_makemodule(module_path, parent):
+    if _native_library_error is not None:
+        return _NativeLibraryMissingModule.from_parent(parent, path=module_path)
+    return None
+
+
+SIMUL_START = "1990-01-01"
+SIMUL_END = "1992-12-31"
+RUNOFF_ID = "subarea.Subarea.runoff"
+RAIN_ID = "subarea.Subarea.P"
+PET_ID = "subarea.Subarea.E"
+
+
+@pytest.fixture
+def simulation():
+    """A daily GR4J one sub-catchment simulation over three years of the MMH sample data"""
+    from swift2.simulation import create_subarea_simulation
+
+    return create_subarea_simulation(
+        data_id="MMH",
+        simul_start=SIMUL_START,
+        simul_end=SIMUL_END,
+        model_id="GR4J",
+        tstep="daily",
+        varname_rain="P",
+        varname_pet="E",
+    )
+
+
+@pytest.fixture
+def parameteriser():
+    """A GR4J parameteriser of the sub-area of `simulation`"""
+    from swift2.doc_helper import get_free_params
+    from swift2.parameteriser import create_parameteriser
+    from swift2.utils import vpaste
+
+    pspec = get_free_params("GR4J")
+    pspec.Value = [542.1981111, -0.4127542, 7.7403390, 1.2388548]
+    pspec.Min = [1.0, -30.0, 1.0, 1.0]
+    pspec.Max = [1000.0, 30.0, 1000.0, 240.0]
+    pspec.Name = vpaste("subarea.Subarea.", pspec.Name)
+    return create_parameteriser("Generic", pspec)
+
+
+@pytest.fixture
+def observed_runoff():
+    """Observed runoff depth of the MMH sample data, over the span of `simulation`"""
+    from cinterop.timeseries import pd_series_to_xr_series
+    from swift2.doc_helper import sample_series
+
+    obs = sample_series("MMH", "flow")[slice(SIMUL_START, SIMUL_END)]
+    obs[obs < -1] = float("nan")
+    return pd_series_to_xr_series(obs)
+
+
+@pytest.fixture
+def objective(simulation, observed_runoff):
+    """NSE of the runoff of `simulation`, after one year of warmup"""
+    simulation.record_state(RUNOFF_ID)
+    return simulation.create_objective(RUNOFF_ID, observed_runoff, "NSE", "1991-01-01", SIMUL_END)
+
+
+@pytest.fixture
+def sce_optimiser(objective, parameteriser):
+    """A short SCE optimisation of `objective`, with a calibration logger set"""
+    import swift2.wrap.swift_wrap_generated as swg
+    from swift2.doc_helper import sce_parameter
+    from swift2.parameteriser import create_parameter_sampler
+
+    termination = swg.CreateSceMaxIterationTerminationWila_py(3)
+    sampler = create_parameter_sampler(0, parameteriser, "urs")
+    optimiser = objective.create_sce_optim_swift(termination, sce_parameter(4, nshuffle=3), sampler)
+    optimiser.set_calibration_logger("")
+    return optimiser
+
+
+@pytest.fixture
+def ensemble_forecast_simulation():
+    """An hourly ensemble forecast simulation of the Upper Murray sample data, recording the catchment outflow"""
+    if "SWIFT_SAMPLE_DATA_DIR" not in os.environ or not os.path.isdir(os.environ["SWIFT_SAMPLE_DATA_DIR"]):
+        pytest.skip("the sample data directory SWIFT_SAMPLE_DATA_DIR is not available")
+    import numpy as np
+    import uchronia.sample_data as usd
+    from cinterop.timeseries import as_timestamp
+    from swift2.const import CATCHMENT_FLOWRATE_VARID
+    from swift2.simulation import create_catchment, get_subarea_ids
+    from swift2.utils import mk_full_data_id, paste0
+
+    node_ids = paste0("n", [i + 1 for i in range(6)])
+    link_ids = paste0("lnk", [i + 1 for i in range(5)])
+    simulation = create_catchment(
+        node_ids,
+        paste0(node_ids, "_name"),
+        link_ids,
+        paste0(link_ids, "_name"),
+        paste0("n", [2, 5, 4, 3, 1]),
+        paste0("n", [6, 2, 2, 4, 4]),
+        "GR4J",
+        np.array([1.2, 2.3, 4.4, 2.2, 1.5]),
+    )
+    data_library = usd.sample_time_series_library("upper murray")
+    precip_ids = mk_full_data_id("subarea", get_subarea_ids(simulation), "P")
+    pet_ids = mk_full_data_id("subarea", get_subarea_ids(simulation), "E")
+    n = len(precip_ids)
+    simulation.play_inputs(data_library, precip_ids, np.repeat("rain_obs", n), np.repeat("", n))
+    simulation.play_inputs(data_library, pet_ids, np.repeat("pet_obs", n), np.repeat("daily_to_hourly", n))
+    simulation.set_simulation_span(start=as_timestamp("2007-01-01"), end=as_timestamp("2010-08-01 20"))
+    simulation.exec_simulation()
+    ems = simulation.create_ensemble_forecast_simulation(
+        data_library,
+        start=as_timestamp("2010-08-01 21"),
+        end=as_timestamp("2010-08-05 21"),
+        input_map={"rain_fcast_ens": precip_ids},
+        lead_time=24 * 2 + 23,
+        ensemble_size=100,
+        n_time_steps_between_forecasts=24,
+    )
+    ems.record_state(CATCHMENT_FLOWRATE_VARID)
+    ems.exec_simulation()
+    return ems
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from swift2.aio import configure_async, run_native
+from conftest import RUNOFF_ID
+
+
+class _Owner:
+    """Stands for a native object, which operations are serialised on"""
+
+
+@pytest.fixture
+def async_config():
+    yield configure_async
+    configure_async()
+
+
+class _Tracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def work(self, seconds=0.05):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+        return seconds
+
+
+def test_operations_on_distinct_objects_run_concurrently(async_config):
+    async_config(max_workers=4)
+    tracker = _Tracker()
+
+    async def main():
+        return await asyncio.gather(*[run_native(_Owner(), tracker.work) for _ in range(4)])
+
+    assert asyncio.run(main()) == [0.05] * 4
+    assert tracker.max_running > 1
+
+
+def test_operations_on_the_same_object_are_serialised(async_config):
+    async_config(max_workers=4)
+    tracker = _Tracker()
+    owner = _Owner()
+
+    async def main():
+        await asyncio.gather(*[run_native(owner, tracker.work, 0.01) for _ in range(4)])
+
+    asyncio.run(main())
+    assert tracker.max_running == 1
+
+
+def test_operations_in_flight_are_bounded(async_config):
+    async_config(max_workers=4, max_in_flight=2)
+    tracker = _Tracker()
+
+    async def main():
+        await asyncio.gather(*[run_native(_Owner(), tracker.work, 0.02) for _ in range(6)])
+
+    asyncio.run(main())
+    assert tracker.max_running == 2
+
+
+def test_cancelled_operation_keeps_its_slot_until_done(async_config):
+    async_config(max_workers=2, max_in_flight=1)
+    tracker = _Tracker()
+
+    async def main():
+        task = asyncio.ensure_future(run_native(_Owner(), tracker.work, 0.1))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # the cancelled operation still runs; the next one waits for its slot
+        await run_native(_Owner(), tracker.work, 0.01)
+
+    asyncio.run(main())
+    assert tracker.max_running == 1
+
+
+def test_errors_propagate_to_the_awaiting_task(async_config):
+    def fail():
+        raise RuntimeError("native failure")
+
+    async def main():
+        await run_native(_Owner(), fail)
+
+    with pytest.raises(RuntimeError, match="native failure"):
+        asyncio.run(main())
+
+
+def test_async_simulation_and_score_match_blocking_calls(simulation, parameteriser, objective):
+    parameteriser.apply_sys_config(simulation)
+    expected_score = objective.get_score(parameteriser)
+    expected = simulation.clone()
+    expected.exec_simulation()
+
+    async def main():
+        await simulation.exec_simulation_async()
+        return await objective.get_score_async(parameteriser)
+
+    score = asyncio.run(main())
+    assert score["scores"] == expected_score["scores"]
+    assert np.array_equal(
+        simulation.get_recorded(RUNOFF_ID).values, expected.get_recorded(RUNOFF_ID).values, equal_nan=True
+    )
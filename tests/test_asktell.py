@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from swift2.asktell import LOG_CATEGORY_COLNAME, LOG_MESSAGE_COLNAME, AskTellEvaluator
+
+
+@pytest.fixture
+def bridge(simulation, objective, parameteriser):
+    return AskTellEvaluator(simulation, objective, parameteriser, n_workers=2)
+
+
+def _random_search(bridge, n_generations=3, size=4, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n_generations):
+        population = rng.uniform(bridge.lower, bridge.upper, size=(size, len(bridge.param_names)))
+        bridge.evaluate(population)
+
+
+def test_generations_logged_as_native_optimisers(bridge, parameteriser):
+    assert np.array_equal(bridge.values(), parameteriser.values_array())
+    _random_search(bridge)
+    assert bridge.generation == 3
+    assert bridge.score_names == ["NSE"]
+    log = bridge.get_log_content(add_numbering=True)
+    assert len(log) == 12
+    assert list(log[LOG_CATEGORY_COLNAME].unique()) == ["Generation 0", "Generation 1", "Generation 2"]
+    assert set(log[LOG_MESSAGE_COLNAME]) == {"Evaluated"}
+    assert list(log.PointNumber) == list(range(1, 13))
+    assert set(bridge.param_names) <= set(log.columns)
+    mh = bridge.extract_optimisation_log("NSE")
+    assert len(mh.subset_by_pattern(LOG_CATEGORY_COLNAME, "Generation 1").data) == 4
+
+
+def test_best_parameter_set(bridge, objective):
+    _random_search(bridge)
+    values, score = bridge.best()
+    log = bridge.get_log_content()
+    assert score == log.NSE.max()
+    assert bridge.best(maximise=False)[1] == log.NSE.min()
+    best = bridge.best_parameteriser()
+    assert np.array_equal(best.values_array(), values)
+    assert objective.get_score(best)["scores"]["NSE"] == pytest.approx(score)
+
+
+def test_scores_told_from_outside(bridge):
+    with pytest.raises(ValueError):
+        bridge.best()
+    population = np.tile(bridge.values(), (2, 1))
+    bridge.tell(population, np.array([0.5, 0.7]), message="External", score_names=["NSE"])
+    log = bridge.get_log_content()
+    assert list(log.NSE) == [0.5, 0.7] and set(log[LOG_MESSAGE_COLNAME]) == {"External"}
+    with pytest.raises(ValueError):
+        bridge.tell(population, np.zeros((2, 2)))
+
+
+def test_empty_population_not_logged(bridge):
+    scores = bridge.evaluate(np.empty((0, len(bridge.param_names))))
+    assert scores.shape[0] == 0
+    assert bridge.generation == 0
+    assert len(bridge.get_log_content()) == 0
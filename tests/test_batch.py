@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from swift2.batch import BatchRunner
+from conftest import RUNOFF_ID
+
+
+def _parameter_sets(parameteriser, n, seed=0):
+    bounds = parameteriser.bounds_array()
+    rng = np.random.default_rng(seed)
+    return rng.uniform(bounds[:, 0], bounds[:, 1], size=(n, len(bounds)))
+
+
+def _run_sequentially(simulation, parameteriser, parameter_sets):
+    expected = []
+    for values in parameter_sets:
+        p = parameteriser.clone()
+        p.set_values_array(values)
+        p.apply_sys_config(simulation)
+        simulation.exec_simulation()
+        expected.append(simulation.get_recorded(RUNOFF_ID).squeeze(drop=True).values)
+    return np.stack(expected)
+
+
+def test_batch_matches_sequential_runs(simulation, parameteriser):
+    simulation.record_state(RUNOFF_ID)
+    parameter_sets = _parameter_sets(parameteriser, 8)
+    runner = BatchRunner(simulation, parameteriser, RUNOFF_ID, n_workers=3)
+    flows = runner.run(parameter_sets)
+    assert flows.shape == (8, runner.n_time, 1)
+    expected = _run_sequentially(simulation.clone(), parameteriser, parameter_sets)
+    assert np.array_equal(flows[:, :, 0], expected, equal_nan=True)
+    # clones are reused across runs
+    assert np.array_equal(runner.run(parameter_sets[:2]), flows[:2], equal_nan=True)
+
+
+def test_batch_leaves_templates_unchanged(simulation, parameteriser):
+    simulation.record_state(RUNOFF_ID)
+    values = parameteriser.values_array()
+    BatchRunner(simulation, parameteriser, RUNOFF_ID, n_workers=2).run(_parameter_sets(parameteriser, 2))
+    assert np.array_equal(parameteriser.values_array(), values)
+
+
+def test_batch_columns_follow_param_names(simulation, parameteriser):
+    simulation.record_state(RUNOFF_ID)
+    names = parameteriser.parameter_names()
+    parameter_sets = _parameter_sets(parameteriser, 2)
+    reordered = BatchRunner(simulation, parameteriser, RUNOFF_ID, n_workers=1, param_names=names[::-1])
+    runner = BatchRunner(simulation, parameteriser, RUNOFF_ID, n_workers=1)
+    assert np.array_equal(
+        reordered.run(parameter_sets[:, ::-1]), runner.run(parameter_sets), equal_nan=True
+    )
+
+
+def test_batch_arguments_checked(simulation, parameteriser):
+    simulation.record_state(RUNOFF_ID)
+    with pytest.raises(ValueError):
+        BatchRunner(simulation, parameteriser, RUNOFF_ID, n_workers=0)
+    runner = BatchRunner(simulation, parameteriser, RUNOFF_ID, n_workers=1)
+    with pytest.raises(ValueError):
+        runner.run(np.zeros((2, runner.num_parameters + 1)))
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from swift2.checkpoint import (
+    StateCheckpointCache,
+    checkpoint_key,
+    exec_simulation_with_checkpoint,
+    simulation_fingerprint,
+)
+from swift2.simulation import get_simulation_time_index
+from conftest import RAIN_ID, RUNOFF_ID
+
+CHECKPOINT_DATE = pd.Timestamp("1990-12-31")
+
+
+def test_fingerprint_identifies_played_inputs(simulation):
+    fingerprint = simulation_fingerprint(simulation)
+    assert simulation_fingerprint(simulation.clone()) == fingerprint
+    assert simulation_fingerprint(simulation, CHECKPOINT_DATE) != fingerprint
+    wetter = simulation.clone()
+    wetter.play_input(wetter.get_played(RAIN_ID).squeeze(drop=True) * 1.1, RAIN_ID)
+    assert simulation_fingerprint(wetter) != fingerprint
+
+
+def test_checkpoint_key_depends_on_parameters_start_and_simulation(parameteriser):
+    key = checkpoint_key(parameteriser, CHECKPOINT_DATE, run_start="1990-01-01", simulation_id="a")
+    assert checkpoint_key(parameteriser, CHECKPOINT_DATE, run_start="1990-01-01", simulation_id="a") == key
+    assert checkpoint_key(parameteriser, CHECKPOINT_DATE, run_start="1990-01-02", simulation_id="a") != key
+    assert checkpoint_key(parameteriser, CHECKPOINT_DATE, run_start="1990-01-01", simulation_id="b") != key
+    assert checkpoint_key(parameteriser, "1991-01-01", run_start="1990-01-01", simulation_id="a") != key
+    name = parameteriser.parameter_names()[0]
+    parameteriser.set_parameter_value(name, parameteriser.values_array()[0] + 1)
+    assert checkpoint_key(parameteriser, CHECKPOINT_DATE, run_start="1990-01-01", simulation_id="a") != key
+    # a parameter not affecting the states up to the checkpoint does not change the key
+    others = parameteriser.parameter_names()[1:]
+    before = checkpoint_key(parameteriser, CHECKPOINT_DATE, others, "1990-01-01", "a")
+    parameteriser.set_parameter_value(name, parameteriser.values_array()[0] + 1)
+    assert checkpoint_key(parameteriser, CHECKPOINT_DATE, others, "1990-01-01", "a") == before
+
+
+def test_cache_evicts_least_recently_used(simulation):
+    simulation.exec_simulation()
+    states = simulation.snapshot_state()
+    cache = StateCheckpointCache(max_entries=2)
+    cache.put("a", states)
+    cache.put("b", states)
+    assert cache.get("a") is states
+    cache.put("c", states)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is states
+    assert cache.get("c") is states
+    assert cache.info() == {"hits": 3, "misses": 1, "size": 2, "bytes": 0}
+    cache.clear()
+    assert len(cache) == 0 and cache.info()["hits"] == 0
+
+
+def test_cache_memory_cap_keeps_at_least_one_entry(simulation):
+    simulation.exec_simulation()
+    states = simulation.snapshot_state()
+    cache = StateCheckpointCache(max_entries=10, max_bytes=1)
+    cache.put("a", states)
+    cache.put("b", states)
+    assert len(cache) == 1
+    assert cache.get("b") is states
+    assert cache.info()["bytes"] > 1
+
+
+def test_cache_rejects_invalid_capacity():
+    with pytest.raises(ValueError):
+        StateCheckpointCache(max_entries=0)
+
+
+def test_checkpointed_run_matches_full_run(simulation, parameteriser):
+    simulation.record_state(RUNOFF_ID)
+    parameteriser.apply_sys_config(simulation)
+    simulation.exec_simulation()
+    full = simulation.get_recorded(RUNOFF_ID).squeeze(drop=True)
+    expected = full.sel(time=slice(CHECKPOINT_DATE + pd.Timedelta(days=1), None)).values
+
+    cache = StateCheckpointCache()
+    sim_id = simulation_fingerprint(simulation, CHECKPOINT_DATE)
+    assert not exec_simulation_with_checkpoint(simulation, parameteriser, cache, CHECKPOINT_DATE, sim_id)
+    assert np.allclose(simulation.get_recorded(RUNOFF_ID).squeeze(drop=True).values, expected, equal_nan=True)
+    assert exec_simulation_with_checkpoint(simulation, parameteriser, cache, CHECKPOINT_DATE, sim_id)
+    assert np.allclose(simulation.get_recorded(RUNOFF_ID).squeeze(drop=True).values, expected, equal_nan=True)
+    assert len(cache) == 1
+    # the simulation span is restored
+    assert np.array_equal(get_simulation_time_index(simulation).values, full.time.values)
+
+
+def test_checkpoint_date_must_be_before_the_end(simulation, parameteriser):
+    end = get_simulation_time_index(simulation)[-1]
+    with pytest.raises(ValueError):
+        exec_simulation_with_checkpoint(simulation, parameteriser, StateCheckpointCache(), end, "a")
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from cinterop.timeseries import TIME_DIMNAME
+
+from swift2.chunked import NpyRecordedStore, exec_simulation_chunked
+from swift2.simulation import get_simulation_time_index
+from conftest import RAIN_ID, RUNOFF_ID
+
+VAR_IDS = [RUNOFF_ID, RAIN_ID]
+
+
+@pytest.fixture
+def recorded_simulation(simulation, parameteriser):
+    parameteriser.apply_sys_config(simulation)
+    simulation.record_state(VAR_IDS)
+    return simulation
+
+
+def test_chunked_run_matches_single_run(recorded_simulation, tmp_path):
+    recorded_simulation.exec_simulation()
+    expected = recorded_simulation.get_recorded(VAR_IDS)
+    # a block size not dividing the span, to check the last partial block
+    store = recorded_simulation.exec_simulation(chunk_size=100, spill_dir=str(tmp_path))
+    stored = store.as_xarray()
+    assert np.array_equal(stored.coords[TIME_DIMNAME].values, expected.coords[TIME_DIMNAME].values)
+    assert np.allclose(stored.values, expected.values, equal_nan=True)
+    # the span is restored, and the store can be reopened read-only
+    assert np.array_equal(get_simulation_time_index(recorded_simulation).values, expected.coords[TIME_DIMNAME].values)
+    reopened = NpyRecordedStore(str(tmp_path))
+    assert reopened.var_ids == VAR_IDS
+    assert reopened.values.flags["F_CONTIGUOUS"]
+    assert np.array_equal(reopened.as_xarray().values, stored.values, equal_nan=True)
+
+
+def test_chunked_run_selected_variables(recorded_simulation, tmp_path):
+    store = exec_simulation_chunked(recorded_simulation, 365, str(tmp_path), var_ids=RUNOFF_ID)
+    assert store.var_ids == [RUNOFF_ID]
+    assert store.values.shape == (len(get_simulation_time_index(recorded_simulation)), 1)
+
+
+def test_chunked_run_arguments_checked(recorded_simulation, tmp_path):
+    with pytest.raises(ValueError):
+        recorded_simulation.exec_simulation(chunk_size=10)
+    with pytest.raises(ValueError):
+        exec_simulation_chunked(recorded_simulation, 0, str(tmp_path))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from cinterop.timeseries import ENSEMBLE_DIMNAME, TIME_DIMNAME
+
+import swift2.wrap.swift_wrap_custom as swc
+from swift2.const import CATCHMENT_FLOWRATE_VARID
+
+
+def _forecast_values(forecasts, i):
+    # (lead time, member) values of the forecast issued at the i-th issue time
+    return forecasts[i].transpose(TIME_DIMNAME, ENSEMBLE_DIMNAME).values
+
+
+def test_cube_matches_recorded_ensemble_forecasts(ensemble_forecast_simulation):
+    ems = ensemble_forecast_simulation
+    forecasts = ems.get_recorded_ensemble_forecast(CATCHMENT_FLOWRATE_VARID)
+    cube = ems.get_recorded_ensemble_forecast_cube(CATCHMENT_FLOWRATE_VARID)
+    issue_times = forecasts.time_index()
+    assert cube.shape[0] == len(issue_times)
+    assert np.array_equal(cube.coords[TIME_DIMNAME].values, np.asarray(issue_times, dtype="datetime64[ns]"))
+    for i in range(len(issue_times)):
+        assert np.array_equal(cube.values[i], _forecast_values(forecasts, i), equal_nan=True)
+
+
+def test_cube_window_of_issue_times(ensemble_forecast_simulation):
+    ems = ensemble_forecast_simulation
+    full = ems.get_recorded_ensemble_forecast_cube(CATCHMENT_FLOWRATE_VARID)
+    issue_times = full.coords[TIME_DIMNAME].values
+    window = ems.get_recorded_ensemble_forecast_cube(CATCHMENT_FLOWRATE_VARID, issue_times[1], issue_times[2])
+    assert np.array_equal(window.coords[TIME_DIMNAME].values, issue_times[1:3])
+    assert np.array_equal(window.values, full.values[1:3], equal_nan=True)
+
+
+def test_buffer_shape_is_checked(ensemble_forecast_simulation):
+    ems = ensemble_forecast_simulation
+    mtsg, n_members, n_leads = swc.get_ensemble_forecast_recorded_geometry(ems, CATCHMENT_FLOWRATE_VARID)
+    too_short = np.empty((1, n_members, n_leads - 1))
+    with pytest.raises(ValueError):
+        swc.get_ensemble_forecast_recorded_into(ems, CATCHMENT_FLOWRATE_VARID, 0, too_short, mtsg.length)
+    out = np.empty((2, n_members, n_leads))
+    with pytest.raises(IndexError):
+        swc.get_ensemble_forecast_recorded_into(ems, CATCHMENT_FLOWRATE_VARID, mtsg.length - 1, out, mtsg.length)
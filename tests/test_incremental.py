@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from cinterop.timeseries import TIME_DIMNAME
+
+from swift2.incremental import IncrementalSimulation
+from conftest import RAIN_ID, RUNOFF_ID, SIMUL_END, SIMUL_START
+
+FIRST_END = "1991-12-31"
+
+
+@pytest.fixture
+def recorded_simulation(simulation, parameteriser):
+    parameteriser.apply_sys_config(simulation)
+    simulation.record_state(RUNOFF_ID)
+    return simulation
+
+
+def _full_run(simulation):
+    simulation = simulation.clone()
+    simulation.exec_simulation()
+    return simulation.get_recorded(RUNOFF_ID)
+
+
+def _assert_same_series(actual, expected):
+    assert np.array_equal(actual.coords[TIME_DIMNAME].values, expected.coords[TIME_DIMNAME].values)
+    assert np.allclose(actual.values, expected.values, equal_nan=True)
+
+
+def test_increments_match_a_single_run(recorded_simulation):
+    expected = _full_run(recorded_simulation)
+    recorded_simulation.set_simulation_span(SIMUL_START, FIRST_END)
+    inc = IncrementalSimulation(recorded_simulation, RUNOFF_ID)
+    inc.run()
+    block = inc.advance("1992-06-30")
+    assert pd.Timestamp(block.coords[TIME_DIMNAME].values[0]) == pd.Timestamp("1992-01-01")
+    inc.advance(SIMUL_END)
+    _assert_same_series(inc.get_recorded(), expected)
+
+
+def test_increment_with_new_inputs(recorded_simulation):
+    rain = recorded_simulation.get_played(RAIN_ID).squeeze(drop=True)
+    recorded_simulation.set_simulation_span(SIMUL_START, FIRST_END)
+    inc = IncrementalSimulation(recorded_simulation, RUNOFF_ID)
+    inc.run()
+    # the first year is already simulated: only the new time steps differ from the played rain
+    wetter = rain.where(rain[TIME_DIMNAME] <= pd.Timestamp(FIRST_END), rain * 2)
+    inc.advance(SIMUL_END, wetter, RAIN_ID)
+
+    expected_simulation = recorded_simulation.clone()
+    expected_simulation.play_input(wetter, RAIN_ID)
+    expected_simulation.set_simulation_span(SIMUL_START, SIMUL_END)
+    expected = _full_run(expected_simulation)
+    _assert_same_series(inc.get_recorded(), expected)
+
+
+def test_resume_from_saved_states(recorded_simulation):
+    expected = _full_run(recorded_simulation)
+    recorded_simulation.set_simulation_span(SIMUL_START, FIRST_END)
+    first = IncrementalSimulation(recorded_simulation, RUNOFF_ID)
+    first.run()
+    resumed = IncrementalSimulation(recorded_simulation.clone(), RUNOFF_ID, states=first.states, end=first.end)
+    increment = resumed.advance(SIMUL_END)
+    _assert_same_series(increment, expected.sel({TIME_DIMNAME: slice("1992-01-01", None)}))
+
+
+def test_advance_checks(recorded_simulation):
+    with pytest.raises(ValueError):
+        IncrementalSimulation(recorded_simulation, RUNOFF_ID, end=FIRST_END)
+    inc = IncrementalSimulation(recorded_simulation, RUNOFF_ID)
+    assert inc.get_recorded() is None
+    with pytest.raises(ValueError):
+        inc.advance(SIMUL_END)
+    recorded_simulation.set_simulation_span(SIMUL_START, FIRST_END)
+    inc.run()
+    assert inc.advance(FIRST_END) is None
+    with pytest.raises(ValueError):
+        inc.advance("1991-12-31 12:00")
+    # the span is left unchanged by a failed increment
+    assert inc.advance("1992-01-01") is not None
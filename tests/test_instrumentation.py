@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import swift2.wrap.swift_wrap_generated as swg
+from swift2.instrumentation import (
+    FfiCallStatistics,
+    disable_ffi_instrumentation,
+    enable_ffi_instrumentation,
+    ffi_instrumentation,
+    is_ffi_instrumentation_enabled,
+)
+from conftest import RUNOFF_ID
+
+
+def test_native_calls_timed_within_block(simulation):
+    simulation.record_state(RUNOFF_ID)
+    original = swg.ExecuteSimulation_py
+    with ffi_instrumentation() as stats:
+        assert is_ffi_instrumentation_enabled()
+        simulation.exec_simulation()
+        simulation.exec_simulation()
+        runoff = simulation.get_recorded(RUNOFF_ID)
+    assert not is_ffi_instrumentation_enabled()
+    assert swg.ExecuteSimulation_py is original
+    report = stats.report()
+    row = report.loc["ExecuteSimulation"]
+    assert row.calls == 2 and row.native_seconds > 0
+    assert row.native_seconds <= row.total_seconds
+    assert row.p50_seconds <= row.p99_seconds
+    # the values of the recorded series are marshalled into an array
+    assert report.loc["GetRecorded"].bytes >= runoff.values.nbytes
+    assert list(report.total_seconds) == sorted(report.total_seconds, reverse=True)
+
+
+def test_statistics_not_collected_once_disabled(simulation):
+    stats = enable_ffi_instrumentation()
+    with pytest.raises(RuntimeError):
+        enable_ffi_instrumentation()
+    assert disable_ffi_instrumentation() is stats
+    simulation.exec_simulation()
+    assert len(stats.report()) == 0
+    assert disable_ffi_instrumentation() is None
+
+
+def test_call_statistics():
+    stats = FfiCallStatistics(max_samples=5)
+    for i in range(20):
+        stats.record_call("GetRecorded_py", 0.1, n_bytes=8)
+    stats.record_native_call("_GetRecorded_native", 0.05)
+    stats.record_native_call("_Play_native", 0.2)
+    report = stats.report()
+    assert list(report.index) == ["GetRecorded", "Play"]
+    row = report.loc["GetRecorded"]
+    assert row.calls == 20 and row.bytes == 160
+    assert row.total_seconds == pytest.approx(2.0)
+    assert row.marshalling_seconds == pytest.approx(1.95)
+    assert row.p90_seconds == pytest.approx(0.1)
+    assert len(stats._stats["GetRecorded"].samples) == 5
+    # only timed natively, e.g. when called from custom wrappers
+    assert report.loc["Play"].calls == 1 and np.isnan(report.loc["Play"].p50_seconds)
+    stats.clear()
+    assert len(stats.report()) == 0
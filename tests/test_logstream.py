@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from swift2.logstream import OptimisationLogStreamer, execute_optimisation_streaming
+
+
+def test_log_streamed_once_complete_by_default(sce_optimiser, tmp_path):
+    sink = str(tmp_path / "log.csv")
+    execute_optimisation_streaming(sce_optimiser, sink)
+    streamed = pd.read_csv(sink)
+    log = sce_optimiser.extract_optimisation_log(fitness_name="NSE").data
+    assert len(streamed) == len(log)
+    assert list(streamed["PointNumber"]) == list(range(1, len(log) + 1))
+
+
+def test_tail_is_bounded(sce_optimiser):
+    streamer = OptimisationLogStreamer(sce_optimiser, tail_size=5)
+    with streamer:
+        sce_optimiser.execute_optimisation()
+    tail = streamer.tail()
+    assert len(tail) == 5
+    assert list(tail["PointNumber"]) == list(range(streamer.rows_streamed - 4, streamer.rows_streamed + 1))
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_existing_sink_is_refused_or_replaced(sce_optimiser, tmp_path, extension):
+    sink = tmp_path / f"log.{extension}"
+    sink.write_text("from an earlier run")
+    with pytest.raises(FileExistsError):
+        OptimisationLogStreamer(sce_optimiser, str(sink))
+    assert sink.read_text() == "from an earlier run"
+    OptimisationLogStreamer(sce_optimiser, str(sink), overwrite=True)
+    assert not sink.exists()
+
+
+def test_csv_sink_has_one_header(sce_optimiser, tmp_path):
+    sink = str(tmp_path / "log.csv")
+    streamer = OptimisationLogStreamer(sce_optimiser, sink)
+    sce_optimiser.execute_optimisation()
+    rows = streamer.poll()
+    assert len(streamer.poll()) == 0
+    streamer.stop()
+    assert len(pd.read_csv(sink)) == len(rows)
+
+
+def test_polling_while_running_is_opt_in_and_warns(sce_optimiser):
+    with pytest.warns(RuntimeWarning, match="concurrent"):
+        with OptimisationLogStreamer(sce_optimiser, interval=0.01) as streamer:
+            sce_optimiser.execute_optimisation()
+    log = sce_optimiser.extract_optimisation_log(fitness_name="NSE").data
+    assert streamer.rows_streamed == len(log)
+
+
+def test_invalid_sink_format(sce_optimiser, tmp_path):
+    with pytest.raises(ValueError):
+        OptimisationLogStreamer(sce_optimiser, str(tmp_path / "log.txt"))
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+import swift2.wrap.ffi_interop as fi
+from swift2.wrap.ffi_interop import SwiftError, check_exceptions, swift_ffi
+
+INVALID_ID = "subarea.Subarea.NoSuchState"
+VALID_ID = "subarea.Subarea.x1"
+
+
+def _raise_native(message: bytes) -> None:
+    fi._exception_callback_swift(swift_ffi.new("char[]", message))
+
+
+def test_native_error_raised_in_calling_thread(simulation):
+    with pytest.raises(SwiftError):
+        simulation.get_state_value(INVALID_ID)
+    # no error left pending for subsequent calls
+    simulation.get_state_value(VALID_ID)
+
+
+def test_errors_not_seen_by_other_threads(simulation):
+    clones = [simulation.clone() for _ in range(4)]
+    failures = []
+    unexpected = []
+
+    def failing(sim):
+        for _ in range(200):
+            try:
+                sim.get_state_value(INVALID_ID)
+            except SwiftError:
+                failures.append(None)
+
+    def succeeding(sim):
+        for _ in range(200):
+            try:
+                sim.get_state_value(VALID_ID)
+            except SwiftError as e:
+                unexpected.append(e)
+
+    threads = [threading.Thread(target=failing, args=(clones[i],)) for i in range(2)]
+    threads += [threading.Thread(target=succeeding, args=(clones[i],)) for i in range(2, 4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(failures) == 400
+    assert unexpected == []
+
+
+def test_error_kept_for_the_thread_of_the_call():
+    @check_exceptions
+    def call(message):
+        _raise_native(message)
+        seen_elsewhere = []
+        t = threading.Thread(target=lambda: seen_elsewhere.append(fi._pop_exception_txt()))
+        t.start()
+        t.join()
+        assert seen_elsewhere == [None]
+
+    with pytest.raises(SwiftError, match="in this thread"):
+        call(b"in this thread")
+    assert fi._pop_exception_txt() is None
+
+
+def test_error_outside_calls_raised_by_next_check():
+    # as from a thread created by the native library, not within a call from Python
+    _raise_native(b"orphan")
+
+    @check_exceptions
+    def call():
+        return 1
+
+    with pytest.raises(SwiftError, match="orphan"):
+        call()
+    assert call() == 1
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from swift2.parameteriser import MhData, extract_optimisation_log
+
+
+@pytest.fixture
+def log():
+    n = 12
+    messages = ["Initial Population", "Reflection", "Contraction", "Random"] * (n // 4)
+    data = pd.DataFrame(
+        {
+            "Category": ["Complex No 0"] * (n // 2) + ["Complex No 1"] * (n // 2),
+            "Message": messages,
+            "NSE": np.linspace(0.1, 0.9, n),
+            "x1": np.linspace(100.0, 200.0, n),
+            "PointNumber": np.arange(1, n + 1, dtype=np.float64),
+        }
+    )
+    return MhData(data, fitness="NSE")
+
+
+def test_compact_log_keeps_content(log):
+    compact = log.compact()
+    assert isinstance(compact.data.Message.dtype, pd.CategoricalDtype)
+    assert isinstance(compact.data.Category.dtype, pd.CategoricalDtype)
+    assert compact.memory_usage() < log.memory_usage()
+    assert list(compact.data.Message.astype(str)) == list(log.data.Message)
+    assert compact.data.NSE.dtype == np.float64
+    # the original log is not modified
+    assert not isinstance(log.data.Message.dtype, pd.CategoricalDtype)
+
+
+def test_compact_log_float32(log):
+    compact = log.compact(float32=True)
+    assert compact.data.x1.dtype == np.float32
+    assert compact.data.NSE.dtype == np.float64 and compact.data.PointNumber.dtype == np.float64
+    assert log.compact(float32_columns=["NSE"]).data.NSE.dtype == np.float32
+
+
+def test_subset_same_rows_for_categorical_columns(log):
+    pattern = "Initial.*|Reflec.*|Contrac.*"
+    expected = log.subset_by_message(pattern).data
+    compact = log.compact().subset_by_message(pattern).data
+    assert len(expected) == 9
+    assert list(compact.index) == list(expected.index)
+    assert list(log.compact().subset_by_pattern("Category", ".*1$").data.index) == list(range(6, 12))
+
+
+def test_parquet_round_trip(log, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "log.parquet")
+    compact = log.compact(float32=True)
+    compact.to_parquet(path)
+    loaded = MhData.read_parquet(path, fitness="NSE")
+    pd.testing.assert_frame_equal(loaded.data, compact.data)
+
+
+def test_extract_compact_log_from_optimiser(sce_optimiser):
+    sce_optimiser.execute_optimisation()
+    full = extract_optimisation_log(sce_optimiser, fitness_name="NSE")
+    compact = extract_optimisation_log(sce_optimiser, fitness_name="NSE", compact=True)
+    assert isinstance(compact.data.Message.dtype, pd.CategoricalDtype)
+    assert len(compact.subset_by_message().data) == len(full.subset_by_message().data)
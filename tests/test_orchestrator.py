@@ -0,0 +1,109 @@
+import os
+
+import pandas as pd
+import pytest
+
+from swift2.orchestrator import is_job_completed, job_directory, load_job_results, run_calibrations
+from conftest import RUNOFF_ID, SIMUL_END, SIMUL_START
+
+FAILING_STATION = "no_such_station"
+
+
+class _MmhCalibration:
+    """A short SCE calibration of GR4J on the MMH sample data, with the interface used by the orchestrator"""
+
+    def __init__(self, max_threads):
+        from cinterop.timeseries import pd_series_to_xr_series
+        from swift2.doc_helper import get_free_params, sample_series
+        from swift2.parameteriser import create_parameteriser
+        from swift2.simulation import create_subarea_simulation
+        from swift2.utils import vpaste
+
+        self.objective_id = "NSE"
+        self.max_threads = max_threads
+        self.simulation = create_subarea_simulation(
+            data_id="MMH", simul_start=SIMUL_START, simul_end=SIMUL_END, model_id="GR4J",
+            tstep="daily", varname_rain="P", varname_pet="E",
+        )
+        self.simulation.record_state(RUNOFF_ID)
+        obs = sample_series("MMH", "flow")[slice(SIMUL_START, SIMUL_END)]
+        obs[obs < -1] = float("nan")
+        self.observed = pd_series_to_xr_series(obs)
+        pspec = get_free_params("GR4J")
+        pspec.Name = vpaste("subarea.Subarea.", pspec.Name)
+        self.parameteriser = create_parameteriser("Generic", pspec)
+
+    def calibrate(self):
+        import swift2.wrap.swift_wrap_generated as swg
+        from swift2.doc_helper import sce_parameter
+        from swift2.parameteriser import create_parameter_sampler
+
+        objective = self.simulation.create_objective(RUNOFF_ID, self.observed, "NSE", "1991-01-01", "1991-12-31")
+        termination = swg.CreateSceMaxIterationTerminationWila_py(2)
+        sampler = create_parameter_sampler(0, self.parameteriser, "urs")
+        self.optimiser = objective.create_sce_optim_swift(termination, sce_parameter(4, nshuffle=2), sampler)
+        self.optimiser.set_calibration_logger("")
+        self.optimiser.set_maximum_threads(self.max_threads)
+        results = self.optimiser.execute_optimisation()
+        self.best_parameteriser = results.get_best_score("NSE", convert_to_py=False).parameteriser
+        self.best_score = results.get_best_score("NSE", convert_to_py=True)
+
+    def validate(self):
+        objective = self.simulation.create_objective(RUNOFF_ID, self.observed, "NSE", "1992-01-01", SIMUL_END)
+        return self.best_score, objective.get_score(self.best_parameteriser)
+
+    def extract_optimisation_log(self):
+        return self.optimiser.extract_optimisation_log(fitness_name="NSE")
+
+
+class _MmhCalibrationBuilder:
+    def __init__(self):
+        self.max_threads = 1
+
+    def set_maximum_threads(self, n_threads):
+        self.max_threads = n_threads
+
+    def build_calibration(self, station_id, model_id):
+        if station_id == FAILING_STATION:
+            raise ValueError(f"unknown station {station_id}")
+        return _MmhCalibration(self.max_threads)
+
+
+def new_mmh_builder():
+    # defined at the top level of the module, to be importable by spawned worker processes
+    return _MmhCalibrationBuilder()
+
+
+def test_job_directories(tmp_path):
+    job = ("410730", "GR4J")
+    assert job_directory(str(tmp_path), job) == os.path.join(str(tmp_path), "GR4J", "410730")
+    assert not is_job_completed(str(tmp_path), job)
+
+
+def test_jobs_run_then_skipped(tmp_path):
+    output_dir = str(tmp_path)
+    jobs = [("MMH", "GR4J"), ("MMH_bis", "GR4J"), ("MMH", "GR4J")]
+    summary = run_calibrations(jobs, new_mmh_builder, output_dir, n_processes=2, n_cores=2, validate=True)
+    assert len(summary) == 2
+    assert list(summary.status) == ["completed", "completed"]
+    assert summary.calib_NSE.notna().all() and summary.verif_NSE.notna().all()
+    results = load_job_results(output_dir, ("MMH", "GR4J"))
+    assert results["threads"] == 1
+    assert set(results["parameters"].Name) == {"subarea.Subarea.x1", "subarea.Subarea.x2", "subarea.Subarea.x3", "subarea.Subarea.x4"}
+    assert len(results["log"]) > 0 and "NSE" in results["log"].columns
+
+    again = run_calibrations(jobs, new_mmh_builder, output_dir, n_processes=2, n_cores=2, validate=True)
+    assert list(again.status) == ["skipped", "skipped"]
+    pd.testing.assert_series_equal(again.calib_NSE, summary.calib_NSE)
+
+
+def test_failed_job_run_again(tmp_path):
+    output_dir = str(tmp_path)
+    failing = (FAILING_STATION, "GR4J")
+    summary = run_calibrations([failing, ("MMH", "GR4J")], new_mmh_builder, output_dir, n_processes=2, n_cores=2)
+    row = summary.set_index("station_id").loc[FAILING_STATION]
+    assert row.status == "failed" and "unknown station" in row.error
+    assert not is_job_completed(output_dir, failing)
+    assert os.path.exists(os.path.join(job_directory(output_dir, failing), "error.txt"))
+    again = run_calibrations([failing, ("MMH", "GR4J")], new_mmh_builder, output_dir, n_processes=1, n_cores=1)
+    assert list(again.status) == ["failed", "skipped"]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+
+def test_arrays_match_data_frame(parameteriser):
+    df = parameteriser.as_dataframe()
+    assert parameteriser.parameter_names() == list(df.Name)
+    assert np.array_equal(parameteriser.values_array(), df.Value.values)
+    bounds = parameteriser.bounds_array()
+    assert bounds.shape == (len(df), 2)
+    assert np.array_equal(bounds[:, 0], df.Min.values)
+    assert np.array_equal(bounds[:, 1], df.Max.values)
+
+
+def test_set_values_array_round_trip(parameteriser):
+    bounds = parameteriser.bounds_array()
+    values = bounds[:, 0] + 0.25 * (bounds[:, 1] - bounds[:, 0])
+    parameteriser.set_values_array(values)
+    assert np.array_equal(parameteriser.values_array(), values)
+    df = parameteriser.as_dataframe().set_index("Name")
+    for name, v in zip(parameteriser.parameter_names(), values):
+        assert df.loc[name, "Value"] == v
+
+
+def test_set_values_array_checks_length(parameteriser):
+    with pytest.raises(ValueError):
+        parameteriser.set_values_array(np.zeros(len(parameteriser.parameter_names()) + 1))
+
+
+def test_names_refreshed_after_adding_parameters(parameteriser):
+    names = parameteriser.parameter_names()
+    parameteriser.add_parameter_to_hypercube("subarea.Subarea.x5", 0.5, 0.0, 1.0)
+    assert parameteriser.parameter_names() == names + ["subarea.Subarea.x5"]
+    assert len(parameteriser.values_array()) == len(names) + 1
+
+
+def test_names_refreshed_after_hiding_parameters(parameteriser):
+    filtered = parameteriser.filtered_parameters()
+    names = filtered.parameter_names()
+    filtered.hide_parameters(names[0])
+    assert filtered.parameter_names() == names[1:]
+    filtered.show_parameters(names[0])
+    assert sorted(filtered.parameter_names()) == sorted(names)
+
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import swift2.wrap.swift_wrap_custom as swc
+from swift2.internal import native_tsgeom
+from cinterop.cffi.marshal import TimeSeriesGeometry
+from conftest import PET_ID, RAIN_ID
+
+PLAYED_IDS = [RAIN_ID, PET_ID]
+
+
+def _played_values(simulation, var_id):
+    return simulation.get_played(var_id).squeeze(drop=True).values
+
+
+def _played_frame(simulation):
+    index = simulation.get_played(RAIN_ID).squeeze(drop=True).time.values
+    return pd.DataFrame(
+        {v: _played_values(simulation, v) for v in PLAYED_IDS},
+        index=pd.DatetimeIndex(index),
+    )
+
+
+def test_multivariate_data_frame_played(simulation):
+    inputs = _played_frame(simulation) * 2.0
+    simulation.play_input(inputs)
+    for v in PLAYED_IDS:
+        assert np.array_equal(_played_values(simulation, v), inputs[v].values, equal_nan=True)
+
+
+def test_block_in_row_major_order_played(simulation):
+    inputs = _played_frame(simulation)
+    block = np.ascontiguousarray(inputs.values * 0.5)
+    geom = native_tsgeom(TimeSeriesGeometry(inputs.index[0], 86400, len(inputs)))
+    swc.play_block(simulation, PLAYED_IDS, block, geom)
+    for i, v in enumerate(PLAYED_IDS):
+        assert np.array_equal(_played_values(simulation, v), block[:, i], equal_nan=True)
+
+
+def test_block_shape_checked(simulation):
+    inputs = _played_frame(simulation)
+    geom = native_tsgeom(TimeSeriesGeometry(inputs.index[0], 86400, len(inputs)))
+    with pytest.raises(ValueError):
+        swc.play_block(simulation, [RAIN_ID], inputs.values, geom)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from cinterop.cffi.marshal import TimeSeriesGeometry
+
+from conftest import PET_ID, RAIN_ID
+
+PLAYED_IDS = [RAIN_ID, PET_ID]
+
+
+def _played(simulation, var_id):
+    return simulation.get_played(var_id).squeeze(drop=True)
+
+
+@pytest.fixture
+def inputs(simulation):
+    """(variable, time) array of the played inputs, and their geometry"""
+    rain = _played(simulation, RAIN_ID)
+    values = np.stack([rain.values, _played(simulation, PET_ID).values]) * 1.5
+    return values, TimeSeriesGeometry(rain.time.values[0], 86400, len(rain))
+
+
+def test_play_transposed_array(simulation, inputs):
+    values, geom = inputs
+    simulation.play_input_array(values.T, PLAYED_IDS, geom)
+    for i, v in enumerate(PLAYED_IDS):
+        assert np.array_equal(_played(simulation, v).values, values[i], equal_nan=True)
+
+
+def test_play_univariate_array(simulation, inputs):
+    values, geom = inputs
+    simulation.play_input_array(np.ascontiguousarray(values[0]), RAIN_ID, geom)
+    assert np.array_equal(_played(simulation, RAIN_ID).values, values[0], equal_nan=True)
+
+
+def test_play_memory_mapped_npy(simulation, inputs, tmp_path):
+    values, geom = inputs
+    path = str(tmp_path / "inputs.npy")
+    np.save(path, np.asfortranarray(values.T))
+    simulation.play_input_npy(path, PLAYED_IDS, geom)
+    for i, v in enumerate(PLAYED_IDS):
+        assert np.array_equal(_played(simulation, v).values, values[i], equal_nan=True)
+
+
+def test_arrays_copied_in_python_are_refused(simulation, inputs):
+    values, geom = inputs
+    with pytest.raises(ValueError):
+        # rows, not columns, of a C-contiguous (time, variable) array are contiguous
+        simulation.play_input_array(np.ascontiguousarray(values.T), PLAYED_IDS, geom)
+    with pytest.raises(TypeError):
+        simulation.play_input_array(values.T.astype(np.float32), PLAYED_IDS, geom)
+    with pytest.raises(ValueError):
+        simulation.play_input_array(values.T, PLAYED_IDS, TimeSeriesGeometry(geom.start, 86400, geom.length - 1))
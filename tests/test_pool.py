@@ -0,0 +1,87 @@
+import threading
+
+import numpy as np
+import pytest
+
+from swift2.pool import ClonePool, SimulationPool
+from conftest import RUNOFF_ID
+
+
+def test_objects_reused_up_to_size():
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    pool = ClonePool(factory, size=2)
+    with pool.checkout() as a:
+        with pool.checkout() as b:
+            assert a is not b
+            with pytest.raises(TimeoutError):
+                pool.acquire(timeout=0.01)
+    with pool.checkout() as c:
+        assert c in (a, b)
+    stats = pool.stats()
+    assert len(created) == 2
+    assert stats["clones"] == 2 and stats["checkouts"] == 3 and stats["waits"] == 1
+    assert stats["available"] == 2
+    assert stats["reuse_rate"] == pytest.approx(1 / 3)
+
+
+def test_waiting_checkout_gets_a_released_object():
+    pool = ClonePool(object, size=1)
+    item = pool.acquire()
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.acquire(timeout=10)))
+    waiter.start()
+    pool.release(item)
+    waiter.join()
+    assert received == [item]
+
+
+def test_failed_creation_frees_its_slot():
+    calls = []
+
+    def factory():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("first creation fails")
+        return object()
+
+    pool = ClonePool(factory, size=1)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    assert pool.acquire(timeout=0.01) is not None
+    with pytest.raises(ValueError):
+        ClonePool(object, size=0)
+
+
+def test_reset_applied_on_release():
+    reset = []
+    pool = ClonePool(list, size=1, prewarm=True, reset=lambda x: reset.append(x))
+    assert pool.stats()["clones"] == 1
+    with pool.checkout() as item:
+        pass
+    assert reset == [item]
+
+
+def test_simulation_clones_configured_and_reused(simulation, parameteriser):
+    parameteriser.apply_sys_config(simulation)
+    returned = []
+    pool = SimulationPool(
+        simulation, size=2, configure=lambda s: s.record_state(RUNOFF_ID), reset=returned.append
+    )
+    assert pool.stats()["clones"] == 2
+    assert RUNOFF_ID not in simulation.get_recorded_varnames()
+    expected = simulation.clone()
+    expected.record_state(RUNOFF_ID)
+    expected.exec_simulation()
+    expected = expected.get_recorded(RUNOFF_ID).values
+    for _ in range(3):
+        with pool.checkout() as sim:
+            assert RUNOFF_ID in sim.get_recorded_varnames()
+            sim.exec_simulation()
+            assert np.array_equal(sim.get_recorded(RUNOFF_ID).values, expected, equal_nan=True)
+    assert pool.stats()["checkouts"] == 3 and pool.stats()["clones"] == 2
+    assert len(returned) == 3
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from cinterop.cffi.marshal import TimeSeriesGeometry
+from cinterop.timeseries import ENSEMBLE_DIMNAME, TIME_DIMNAME
+
+import swift2.wrap.swift_wrap_custom as swc
+from swift2.internal import VARIABLE_IDENTIFIERS_DIMNAME
+from swift2.wrap.ffi_interop import marshal
+from conftest import PET_ID, RAIN_ID, RUNOFF_ID
+
+VAR_IDS = [RUNOFF_ID, RAIN_ID, PET_ID]
+
+
+def _single(simulation, var_id, getter):
+    mtsg = marshal.new_native_tsgeom()
+    return getter(simulation, var_id, mtsg), mtsg
+
+
+def test_recorded_block_matches_single_series(simulation):
+    simulation.record_state(VAR_IDS)
+    simulation.exec_simulation()
+    recorded = simulation.get_recorded(VAR_IDS)
+    assert recorded.dims == (VARIABLE_IDENTIFIERS_DIMNAME, ENSEMBLE_DIMNAME, TIME_DIMNAME)
+    assert list(recorded.coords[VARIABLE_IDENTIFIERS_DIMNAME].values) == VAR_IDS
+    for v in VAR_IDS:
+        values, mtsg = _single(simulation, v, swc.get_recorded_data)
+        assert np.array_equal(recorded.sel({VARIABLE_IDENTIFIERS_DIMNAME: v}).squeeze(drop=True).values, values, equal_nan=True)
+    assert np.array_equal(recorded.coords[TIME_DIMNAME].values, mtsg.time_index().values)
+    everything = simulation.get_all_recorded()
+    assert sorted(everything.coords[VARIABLE_IDENTIFIERS_DIMNAME].values) == sorted(VAR_IDS)
+
+
+def test_played_block_matches_single_series(simulation):
+    played_ids = [RAIN_ID, PET_ID]
+    played = simulation.get_played(played_ids)
+    for v in played_ids:
+        values, _ = _single(simulation, v, swc.get_played_data)
+        assert np.array_equal(played.sel({VARIABLE_IDENTIFIERS_DIMNAME: v}).squeeze(drop=True).values, values, equal_nan=True)
+    mtsg = marshal.new_native_tsgeom()
+    block = swc.get_played_block(simulation, played_ids, mtsg)
+    assert block.shape == (mtsg.length, 2) and block.flags["F_CONTIGUOUS"]
+
+
+def test_played_series_of_different_geometries(simulation):
+    # a rain series shorter than the evaporation: not retrievable as a single block
+    rain = simulation.get_played(RAIN_ID).squeeze(drop=True)
+    short = rain.values[:100].copy()
+    simulation.play_input_array(short, RAIN_ID, TimeSeriesGeometry(rain.time.values[0], 86400, 100))
+    played_ids = [RAIN_ID, PET_ID]
+    assert not swc.played_geometries_match(simulation, played_ids)
+    with pytest.raises(ValueError):
+        swc.get_played_block(simulation, played_ids, marshal.new_native_tsgeom())
+    played = simulation.get_played(played_ids)
+    assert len(played.coords[VARIABLE_IDENTIFIERS_DIMNAME]) == 2
+    rain_played = played.sel({VARIABLE_IDENTIFIERS_DIMNAME: RAIN_ID}).squeeze(drop=True)
+    assert np.array_equal(rain_played.isel({TIME_DIMNAME: slice(0, 100)}).values, short, equal_nan=True)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from cinterop.cffi.marshal import TimeSeriesGeometry
+
+from swift2.internal import TimeSeriesBufferPool
+from conftest import RAIN_ID, RUNOFF_ID
+
+VAR_IDS = [RUNOFF_ID, RAIN_ID]
+
+
+@pytest.fixture
+def recorded_simulation(simulation):
+    simulation.record_state(VAR_IDS)
+    simulation.exec_simulation()
+    return simulation
+
+
+def _expected(simulation):
+    # (time, variable) values as returned by get_recorded
+    return simulation.get_recorded(VAR_IDS).squeeze(drop=True).transpose().values
+
+
+def test_values_match_get_recorded(recorded_simulation):
+    values = recorded_simulation.get_recorded_into(VAR_IDS)
+    assert values.shape == (len(recorded_simulation.get_recorded(RUNOFF_ID).time), 2)
+    assert np.array_equal(values, _expected(recorded_simulation), equal_nan=True)
+
+
+def test_values_written_into_caller_array(recorded_simulation):
+    n = len(recorded_simulation.get_recorded(RUNOFF_ID).time)
+    out = np.empty((n, 2), order="F")
+    values = recorded_simulation.get_recorded_into(VAR_IDS, out=out)
+    assert values is out
+    assert np.array_equal(out, _expected(recorded_simulation), equal_nan=True)
+
+
+def test_caller_array_is_checked(recorded_simulation):
+    n = len(recorded_simulation.get_recorded(RUNOFF_ID).time)
+    with pytest.raises(ValueError):
+        recorded_simulation.get_recorded_into(VAR_IDS, out=np.empty((n, 3), order="F"))
+    with pytest.raises(ValueError):
+        # rows of a C-ordered array are contiguous, not its columns
+        recorded_simulation.get_recorded_into(VAR_IDS, out=np.empty((n, 2), order="C"))
+    with pytest.raises(TypeError):
+        recorded_simulation.get_recorded_into(VAR_IDS, out=np.empty((n, 2), dtype=np.float32, order="F"))
+
+
+def test_pool_reuses_buffers(recorded_simulation, parameteriser):
+    pool = TimeSeriesBufferPool()
+    first = recorded_simulation.get_recorded_into(VAR_IDS, buffer_pool=pool)
+    expected = first.copy()
+    assert (pool.hits, pool.misses) == (0, 1)
+    parameteriser.set_parameter_value(parameteriser.parameter_names()[0], 100.0)
+    parameteriser.apply_sys_config(recorded_simulation)
+    recorded_simulation.exec_simulation()
+    second = recorded_simulation.get_recorded_into(VAR_IDS, buffer_pool=pool)
+    assert second is first
+    assert (pool.hits, pool.misses) == (1, 1)
+    assert np.array_equal(second, _expected(recorded_simulation), equal_nan=True)
+    assert not np.array_equal(second, expected, equal_nan=True)
+    # a different number of variables needs another buffer
+    recorded_simulation.get_recorded_into(RUNOFF_ID, buffer_pool=pool)
+    assert len(pool) == 2 and pool.misses == 2
+
+
+def test_pool_is_bounded():
+    pool = TimeSeriesBufferPool(max_buffers=1)
+    geom = TimeSeriesGeometry("2000-01-01", 86400, 10)
+    pool.get(geom, 1)
+    pool.get(geom, 2)
+    assert len(pool) == 1
+    buffer = pool.get(geom, 2)
+    assert buffer.shape == (10, 2) and buffer.flags["F_CONTIGUOUS"]
+    assert pool.hits == 1
+    with pytest.raises(ValueError):
+        TimeSeriesBufferPool(max_buffers=0)
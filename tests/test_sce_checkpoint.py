@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import swift2.wrap.swift_wrap_generated as swg
+from swift2.doc_helper import sce_parameter
+from swift2.sce_checkpoint import CheckpointedSceOptimiser
+
+
+@pytest.fixture
+def single_thread():
+    # complexes evaluated in one thread, so that a segment is reproducible from its seed
+    previous = swg.GetDefaultMaxThreadsWila_py()
+    swg.SetDefaultMaxThreadsWila_py(1)
+    yield
+    swg.SetDefaultMaxThreadsWila_py(previous)
+
+
+def _settings(**kwargs):
+    settings = dict(seed=42, score_name="NSE", iterations_per_segment=2, sce_params=sce_parameter(4, nshuffle=2))
+    settings.update(kwargs)
+    return settings
+
+
+def test_resumed_run_matches_uninterrupted_run(objective, parameteriser, tmp_path, single_thread):
+    uninterrupted = CheckpointedSceOptimiser(objective, parameteriser, str(tmp_path / "a"), **_settings(max_segments=3))
+    expected_score, expected_parameters = uninterrupted.execute_optimisation()
+
+    interrupted = CheckpointedSceOptimiser(objective, parameteriser, str(tmp_path / "b"), **_settings(max_segments=1))
+    interrupted.execute_optimisation()
+    assert interrupted.segments_completed == 1
+    resumed = CheckpointedSceOptimiser.resume(str(tmp_path / "b"), objective, parameteriser, **_settings(max_segments=3))
+    assert resumed.segments_completed == 1
+    score, parameters = resumed.execute_optimisation()
+
+    assert resumed.segments_completed == 3
+    assert score == expected_score
+    assert parameters == expected_parameters
+    columns = ["Segment", "PointNumber", "NSE"] + list(parameters.keys())
+    pd.testing.assert_frame_equal(
+        resumed.get_log_content()[columns], uninterrupted.get_log_content()[columns]
+    )
+
+
+def test_resume_checks_run_settings(objective, parameteriser, tmp_path, single_thread):
+    CheckpointedSceOptimiser(objective, parameteriser, str(tmp_path), **_settings(max_segments=1)).execute_optimisation()
+    with pytest.raises(ValueError, match="iterations_per_segment"):
+        CheckpointedSceOptimiser.resume(str(tmp_path), objective, parameteriser, **_settings(iterations_per_segment=3))
+    with pytest.raises(ValueError, match="seed"):
+        CheckpointedSceOptimiser.resume(str(tmp_path), objective, parameteriser, **_settings(seed=43))
+    with pytest.raises(FileNotFoundError):
+        CheckpointedSceOptimiser.resume(str(tmp_path / "none"), objective, parameteriser, **_settings())
+
+
+def test_stops_after_patience_segments_without_improvement(objective, parameteriser, tmp_path, single_thread):
+    # no segment can improve the best score by this much: the run stops after `patience` segments past the first
+    opt = CheckpointedSceOptimiser(
+        objective, parameteriser, str(tmp_path), **_settings(max_segments=10, tolerance=1e9, patience=2)
+    )
+    opt.execute_optimisation()
+    assert opt.is_complete
+    assert opt.segments_completed == 3
+
+
+def test_segments_keep_original_bounds(objective, parameteriser, tmp_path, single_thread):
+    bounds = parameteriser.bounds_array()
+    opt = CheckpointedSceOptimiser(objective, parameteriser, str(tmp_path), **_settings(max_segments=2))
+    opt.execute_optimisation()
+    best = opt.best_parameteriser()
+    assert np.array_equal(best.bounds_array(), bounds)
+    assert np.array_equal(parameteriser.bounds_array(), bounds)
+    values = best.values_array()
+    assert np.all(values >= bounds[:, 0]) and np.all(values <= bounds[:, 1])
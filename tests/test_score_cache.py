@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+import pytest
+
+from swift2.score_cache import ObjectiveScoreCache, parameter_vector_key
+
+
+def test_key_ignores_floating_point_noise(parameteriser):
+    key = parameter_vector_key(parameteriser)
+    values = parameteriser.values_array()
+    parameteriser.set_values_array(values * (1 + 1e-15))
+    assert parameter_vector_key(parameteriser) == key
+    parameteriser.set_values_array(values * (1 + 1e-6))
+    assert parameter_vector_key(parameteriser) != key
+    assert parameter_vector_key(parameteriser, precision_bits=10) == parameter_vector_key(
+        parameteriser.clone(), precision_bits=10
+    )
+
+
+def test_cached_scores_not_evaluated_again(objective, parameteriser):
+    expected = objective.get_scores(parameteriser)
+    cache = ObjectiveScoreCache()
+    objective.set_score_cache(cache)
+    assert objective.get_scores(parameteriser) == pytest.approx(expected)
+    assert cache.info() == {"hits": 0, "misses": 1, "size": 1, "hit_rate": 0.0}
+    # a score planted in the cache is returned as is: no simulation took place
+    cache.put(cache.key(parameteriser), {"NSE": -123.0})
+    assert objective.get_scores(parameteriser) == {"NSE": -123.0}
+    assert objective.get_score(parameteriser)["scores"] == {"NSE": -123.0}
+    assert cache.hits == 2 and cache.hit_rate == pytest.approx(2 / 3)
+    objective.set_score_cache(None)
+    assert objective.get_scores(parameteriser) == pytest.approx(expected)
+
+
+def test_least_recently_used_evicted():
+    cache = ObjectiveScoreCache(max_entries=2)
+    cache.put("a", {"NSE": 1.0})
+    cache.put("b", {"NSE": 2.0})
+    assert cache.get("a") == {"NSE": 1.0}
+    cache.put("c", {"NSE": 3.0})
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    cache.clear()
+    assert len(cache) == 0 and cache.info()["misses"] == 0
+    with pytest.raises(ValueError):
+        ObjectiveScoreCache(max_entries=0)
+
+
+def test_saved_and_loaded(tmp_path):
+    path = str(tmp_path / "scores.json")
+    cache = ObjectiveScoreCache(path=path)
+    cache.put("a", {"NSE": np.float64(0.5), "Bias": 0.1})
+    cache.save()
+    with open(path) as f:
+        assert json.load(f)["precision_bits"] == 40
+    assert ObjectiveScoreCache(path=path).get("a") == {"NSE": 0.5, "Bias": 0.1}
+    with pytest.raises(ValueError):
+        ObjectiveScoreCache(path=path, precision_bits=20)
+    with pytest.raises(ValueError):
+        ObjectiveScoreCache().save()
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from swift2.sensitivity import (
+    ObjectiveBatchEvaluator,
+    morris_analysis,
+    morris_design,
+    morris_indices,
+    saltelli_design,
+    sobol_analysis,
+    sobol_indices,
+)
+
+LOWER = np.array([0.0, -1.0, 10.0])
+UPPER = np.array([1.0, 1.0, 20.0])
+COEFFICIENTS = np.array([4.0, 2.0, 0.1])
+
+
+def _linear(parameter_sets):
+    # additive model, with variance contributions proportional to (a_i * (upper_i - lower_i))^2
+    return parameter_sets @ COEFFICIENTS
+
+
+def test_saltelli_design_layout():
+    n = 8
+    design = saltelli_design(LOWER, UPPER, n, seed=1)
+    d = len(LOWER)
+    assert design.shape == (n * (d + 2), d)
+    assert np.all(design >= LOWER) and np.all(design <= UPPER)
+    a, b = design[:n], design[n : 2 * n]
+    for i in range(d):
+        ab_i = design[(2 + i) * n : (3 + i) * n]
+        assert np.array_equal(ab_i[:, i], b[:, i])
+        others = [j for j in range(d) if j != i]
+        assert np.array_equal(ab_i[:, others], a[:, others])
+    assert np.array_equal(saltelli_design(LOWER, UPPER, n, seed=1), design)
+
+
+def test_sobol_indices_of_an_additive_model():
+    n = 20000
+    scores = _linear(saltelli_design(LOWER, UPPER, n, seed=2))
+    indices = sobol_indices(scores, n, num_resamples=50, seed=3)
+    contributions = (COEFFICIENTS * (UPPER - LOWER)) ** 2
+    expected = contributions / contributions.sum()
+    assert np.allclose(indices.S1.values, expected, atol=0.03)
+    assert np.allclose(indices.ST.values, expected, atol=0.03)
+    assert np.all(indices.S1_conf.values > 0)
+    with pytest.raises(ValueError):
+        sobol_indices(scores[:-1], n)
+
+
+def test_morris_design_trajectories():
+    r = 5
+    d = len(LOWER)
+    design = morris_design(LOWER, UPPER, r, num_levels=4, seed=4)
+    assert design.shape == (r * (d + 1), d)
+    assert np.all(design >= LOWER - 1e-12) and np.all(design <= UPPER + 1e-12)
+    steps = np.diff(design.reshape(r, d + 1, d), axis=1)
+    # one parameter changes at each step, and each parameter once per trajectory
+    assert np.all(np.count_nonzero(steps, axis=2) == 1)
+    assert np.all(np.count_nonzero(steps, axis=1) == 1)
+    with pytest.raises(ValueError):
+        morris_design(LOWER, UPPER, r, num_levels=3)
+
+
+def test_morris_effects_of_a_linear_model():
+    r = 10
+    design = morris_design(LOWER, UPPER, r, seed=5)
+    effects = morris_indices(design, _linear(design), r, LOWER, UPPER)
+    expected = COEFFICIENTS * (UPPER - LOWER)
+    assert np.allclose(effects.mu.values, expected)
+    assert np.allclose(effects.mu_star.values, np.abs(expected))
+    assert np.allclose(effects.sigma.values, 0.0)
+
+
+def test_evaluator_matches_single_evaluations(simulation, objective, parameteriser):
+    evaluator = ObjectiveBatchEvaluator(simulation, objective, parameteriser, n_workers=2)
+    assert evaluator.param_names == parameteriser.parameter_names()
+    design = saltelli_design(evaluator.lower, evaluator.upper, 2, seed=6)
+    scores = evaluator.evaluate(design)
+    for values, score in zip(design, scores):
+        p = parameteriser.clone()
+        p.set_values_array(values)
+        assert objective.get_score(p)["scores"]["NSE"] == pytest.approx(score)
+    multi, names = evaluator.evaluate_scores(design[:2])
+    assert names == ["NSE"] and np.allclose(multi[:, 0], scores[:2])
+    with pytest.raises(ValueError):
+        evaluator.evaluate(design[:, :-1])
+
+
+def test_evaluations_resumed_from_checkpoint(simulation, objective, parameteriser, tmp_path):
+    checkpoint = str(tmp_path / "sobol.npz")
+    evaluator = ObjectiveBatchEvaluator(simulation, objective, parameteriser, n_workers=2)
+    indices = sobol_analysis(evaluator, 4, seed=7, num_resamples=0, checkpoint_file=checkpoint, checkpoint_every=5)
+    assert list(indices.index) == evaluator.param_names
+    with np.load(checkpoint) as saved:
+        assert saved["done"].all()
+        scores = saved["scores"].copy()
+    # a complete checkpoint is reused without evaluating again
+    design = saltelli_design(evaluator.lower, evaluator.upper, 4, seed=7)
+    assert np.array_equal(evaluator.evaluate(design, checkpoint), scores)
+    with pytest.raises(ValueError):
+        evaluator.evaluate(design[::-1], checkpoint)
+    effects = morris_analysis(evaluator, 2, seed=8)
+    assert list(effects.columns) == ["mu", "mu_star", "sigma"]
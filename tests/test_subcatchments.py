@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from swift2.const import CATCHMENT_FLOWRATE_VARID
+from swift2.doc_helper import configure_test_simulation, create_test_catchment_structure
+from swift2.model_definitions import get_catchment_structure
+from swift2.subcatchments import REMAINDER_KEY, SubcatchmentDagExecutor, default_inflow_var_id
+from conftest import SIMUL_END, SIMUL_START
+
+SPLIT_IDS = ["node.n2", "node.n4"]
+
+
+@pytest.fixture
+def catchment():
+    """The five link test catchment, each subarea fed the MMH sample inputs"""
+    _, simulation = create_test_catchment_structure()
+    return configure_test_simulation(simulation, simul_start=SIMUL_START, simul_end=SIMUL_END)
+
+
+def _catchment_outflow(simulation):
+    simulation = simulation.clone()
+    simulation.record_state(CATCHMENT_FLOWRATE_VARID)
+    simulation.exec_simulation()
+    return simulation.get_recorded(CATCHMENT_FLOWRATE_VARID).squeeze(drop=True)
+
+
+def test_inflow_of_split_elements(catchment):
+    node_links = get_catchment_structure(catchment)["NodeLink"]
+    assert default_inflow_var_id(node_links, "node.n4") == "link.lnk3.InflowRate"
+    assert default_inflow_var_id(node_links, "link.lnk3") == "node.n2.InflowRate"
+    with pytest.raises(ValueError):
+        default_inflow_var_id(node_links, "node.n6")
+    with pytest.raises(ValueError):
+        default_inflow_var_id(node_links, "subarea.lnk3")
+
+
+def test_execution_levels_follow_dependencies(catchment):
+    dag = SubcatchmentDagExecutor(catchment, catchment.split_to_subcatchments(SPLIT_IDS), n_workers=2)
+    assert dag.outlet_key == REMAINDER_KEY
+    assert dag.execution_levels() == [["node.n4"], ["node.n2"], [REMAINDER_KEY]]
+    assert dag.outflow_var_id("node.n4") == "node.n4.OutflowRate"
+    assert dag.outflow_var_id(REMAINDER_KEY) == CATCHMENT_FLOWRATE_VARID
+
+
+def test_outlet_flow_matches_whole_catchment(catchment):
+    expected = _catchment_outflow(catchment)
+    dag = SubcatchmentDagExecutor(catchment, catchment.split_to_subcatchments(SPLIT_IDS), n_workers=2)
+    outflows = dag.execute()
+    assert sorted(outflows.keys()) == sorted(["node.n2", "node.n4", REMAINDER_KEY])
+    outlet = outflows[dag.outlet_key].squeeze(drop=True)
+    assert np.allclose(outlet.values, expected.values, equal_nan=True)
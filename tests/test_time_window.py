@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from cinterop.cffi.marshal import TimeSeriesGeometry
+from cinterop.timeseries import TIME_DIMNAME
+
+from swift2.internal import VARIABLE_IDENTIFIERS_DIMNAME
+from swift2.wrap.ffi_interop import marshal
+from swift2.wrap.swift_wrap_custom import window_indices
+from conftest import PET_ID, RAIN_ID, RUNOFF_ID
+
+
+def _daily(length=10):
+    return marshal.as_native_tsgeom(TimeSeriesGeometry("2000-01-01", 86400, length))
+
+
+def test_window_indices_inclusive_bounds():
+    mtsg = _daily()
+    assert window_indices(mtsg) == (0, 10)
+    assert window_indices(mtsg, "2000-01-03", "2000-01-05") == (2, 5)
+    assert window_indices(mtsg, start_time="2000-01-08") == (7, 10)
+    assert window_indices(mtsg, end_time="2000-01-01") == (0, 1)
+
+
+def test_window_indices_between_time_steps():
+    mtsg = _daily()
+    # bounds falling between two steps exclude the steps outside the window
+    assert window_indices(mtsg, "2000-01-02 12:00", "2000-01-04 12:00") == (2, 4)
+
+
+def test_window_indices_clipped_to_the_series():
+    mtsg = _daily()
+    assert window_indices(mtsg, "1999-01-01", "2001-01-01") == (0, 10)
+    assert window_indices(mtsg, "2001-01-01", None) == (10, 10)
+    assert window_indices(mtsg, None, "1999-01-01") == (0, 0)
+    assert window_indices(mtsg, "2000-01-05", "2000-01-03") == (4, 4)
+
+
+def test_windowed_retrieval_matches_sliced_series(simulation):
+    var_ids = [RUNOFF_ID, RAIN_ID]
+    simulation.record_state(var_ids)
+    simulation.exec_simulation()
+    start, end = pd.Timestamp("1991-02-03"), pd.Timestamp("1991-05-06")
+    full = simulation.get_recorded(var_ids)
+    window = simulation.get_recorded(var_ids, start, end)
+    expected = full.sel({TIME_DIMNAME: slice(start, end)})
+    assert np.array_equal(window.coords[TIME_DIMNAME].values, expected.coords[TIME_DIMNAME].values)
+    assert np.array_equal(window.values, expected.values, equal_nan=True)
+    assert list(window.coords[VARIABLE_IDENTIFIERS_DIMNAME].values) == var_ids
+
+    played = simulation.get_played([RAIN_ID, PET_ID], start, end)
+    expected = simulation.get_played([RAIN_ID, PET_ID]).sel({TIME_DIMNAME: slice(start, end)})
+    assert np.array_equal(played.values, expected.values, equal_nan=True)
+    assert np.array_equal(played.coords[TIME_DIMNAME].values, expected.coords[TIME_DIMNAME].values)
+    assert len(simulation.get_all_recorded(start, end).coords[TIME_DIMNAME]) == len(expected.coords[TIME_DIMNAME])
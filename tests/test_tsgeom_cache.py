@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from cinterop.cffi.marshal import TimeSeriesGeometry
+
+from swift2.internal import (
+    TS_INTEROP_GEOM_KEY,
+    TS_INTEROP_VALUES_KEY,
+    TsGeometryCache,
+    clear_tsgeom_cache,
+    native_tsgeom,
+    simplify_time_series,
+    tsgeom_cache_info,
+)
+from conftest import RAIN_ID
+
+
+def test_identical_geometries_share_a_native_geometry():
+    cache = TsGeometryCache()
+    a = cache.get(TimeSeriesGeometry("2000-01-01", 3600, 24))
+    assert cache.get(TimeSeriesGeometry("2000-01-01", 3600, 24)) is a
+    assert cache.get(TimeSeriesGeometry("2000-01-01", 3600, 25)) is not a
+    assert cache.get(TimeSeriesGeometry("2000-01-01", 86400, 24)) is not a
+    assert cache.info() == {"hits": 1, "misses": 3, "size": 3, "max_size": 128}
+    assert a.length == 24 and a.time_step_seconds == 3600
+
+
+def test_cache_is_bounded():
+    cache = TsGeometryCache(max_size=2)
+    first = cache.get(TimeSeriesGeometry("2000-01-01", 3600, 1))
+    cache.get(TimeSeriesGeometry("2000-01-01", 3600, 2))
+    cache.get(TimeSeriesGeometry("2000-01-01", 3600, 3))
+    assert cache.info()["size"] == 2
+    assert cache.get(TimeSeriesGeometry("2000-01-01", 3600, 1)) is not first
+    cache.clear()
+    assert cache.info() == {"hits": 0, "misses": 0, "size": 0, "max_size": 2}
+    with pytest.raises(ValueError):
+        TsGeometryCache(max_size=0)
+
+
+def test_played_series_reuse_cached_geometry(simulation):
+    clear_tsgeom_cache()
+    rain = simulation.get_played(RAIN_ID).squeeze(drop=True)
+    simple = simplify_time_series(rain)
+    assert np.array_equal(simple[TS_INTEROP_VALUES_KEY], rain.values, equal_nan=True)
+    geom = simple[TS_INTEROP_GEOM_KEY]
+    assert geom.length == len(rain)
+    assert tsgeom_cache_info()["misses"] == 1
+    simulation.play_input(rain * 2, RAIN_ID)
+    simulation.play_input(rain * 3, RAIN_ID)
+    assert tsgeom_cache_info()["hits"] == 2
+    assert native_tsgeom(TimeSeriesGeometry(geom.start, geom.time_step_seconds, geom.length)) is geom
+    assert np.array_equal(simulation.get_played(RAIN_ID).squeeze(drop=True).values, rain.values * 3, equal_nan=True)
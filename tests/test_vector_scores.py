@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+import swift2.wrap.swift_wrap_custom as swc
+import swift2.wrap.swift_wrap_generated as swg
+
+
+def _rows(scores):
+    # one point at a time, through the generated wrappers
+    n = swg.GetLengthSetOfScores_py(scores)
+    return pd.DataFrame([swc._scores_as_flat_dict(swg.GetScoresAtIndex_py(scores, i)) for i in range(n)])
+
+
+def test_population_read_column_wise(sce_optimiser, parameteriser):
+    scores = sce_optimiser.execute_optimisation()
+    expected = _rows(scores)
+    assert len(expected) > 0
+    df = scores.as_dataframe()
+    assert list(df.columns) == ["NSE"] + parameteriser.parameter_names()
+    pd.testing.assert_frame_equal(df, expected[df.columns], check_exact=True)
+    values, names = scores.to_numpy()
+    assert names == list(df.columns)
+    assert values.shape == df.shape
+    assert np.array_equal(values, df.values)